@@ -1,517 +1,1853 @@
-###############################################################################
-#
-# Script:       add-addresses.py
-#
-# Author:       Chris Goodwin <chrisgoodwins@gmail.com>
-#
-# Description:  Create new address objects on a firewall or Panorama device
-#               group. The user will also have the option to add the objects
-#               to an address group. There are 2 options for adding address
-#               objects - either with a comma separated list, or by passing a
-#               CSV file via command line argument. The script tests for
-#               duplicates within the list provided, as well as on the firewall
-#               or device group.
-#
-# Usage:        add-addresses.py
-#               or
-#               add-addresses.py <user-provided-list.csv>
-#
-# Requirements: requests
-#
-# Python:       Version 3
-#
-###############################################################################
-###############################################################################
-
-import sys
-import getpass
-import re
-import time
-from xml.etree import ElementTree as ET
-try:
-    import requests
-    from requests.packages.urllib3.exceptions import InsecureRequestWarning
-    requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
-except ImportError:
-    raise ValueError('requests support not available, please install module')
-
-###############################################################################
-###############################################################################
-
-addrObj_ip, addrObj_fqdn, addrObj_range, allObjNames, addrGroupName = [], [], [], [], None
-
-
-# Prompts the user to enter an address, then checks it's validity
-def getfwipfqdn():
-    while True:
-        fwipraw = input("\nPlease enter Panorama/firewall IP or FQDN: ")
-        ipr = re.match(r"^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$", fwipraw)
-        fqdnr = re.match(r"(?=^.{4,253}$)(^((?!-)[a-zA-Z0-9-]{1,63}(?<!-)\.)+[a-zA-Z]{2,63}$)", fwipraw)
-        if ipr:
-            break
-        elif fqdnr:
-            break
-        else:
-            print("\nThere was something wrong with your entry. Please try again...\n")
-    return fwipraw
-
-
-# Prompts the user to enter a username and password
-def getCreds():
-    while True:
-        username = input("Please enter your user name: ")
-        usernamer = re.match(r"^[\w-]{3,24}$", username)
-        if usernamer:
-            password = getpass.getpass("Please enter your password: ")
-            break
-        else:
-            print("\nThere was something wrong with your entry. Please try again...\n")
-    return username, password
-
-
-# Retrieves the user's api key
-def getkey(fwip):
-    while True:
-        try:
-            username, password = getCreds()
-            keycall = f"https://{fwip}/api/?type=keygen&user={username}&password={password}"
-            r = requests.get(keycall, verify=False)
-            tree = ET.fromstring(r.text)
-            if tree.get('status') == "success":
-                apikey = tree[0][0].text
-                break
-            else:
-                print("\nYou have entered an incorrect username or password. Please try again...\n")
-        except requests.exceptions.ConnectionError:
-            print("\nThere was a problem connecting to the firewall. Please check the address and try again...\n")
-            exit()
-    return apikey
-
-
-# Function to convert a csv file to a list of address object entries
-def csvToList(variables_file):
-    file = open(variables_file, 'r')
-    file_list = []
-    for line in file:
-        if line != ',\n' and line != '\n':
-            line = re.sub(r',?[\r\n]$', '', line)  # Removes comma and/or whitespace at the end of the line
-            if line[0] == ',':
-                line = re.sub(',', '', line)    # Removes the comma at the beginning of the line when there is no name entry
-            else:
-                line = re.sub(',', ':', line)   # Replaces the comma with a colon when there is a name entry present
-            file_list.append(line)
-    return file_list
-
-
-# Parses address list, checks address validity, and separates object types
-def parse_addrList(addrList, argv):
-    addrObjCheck_ip = r'^(?:(?:([A-Za-z\d])|(([A-Za-z\d])([\w \.-]){0,61}([\w\.-]))):\s*)?((?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)((\/)(3[0-2]|2[0-9]|1[0-9]|[1-9]))?)$'
-    addrObjCheck_fqdn = r'^(?:(?:([A-Za-z\d])|(([A-Za-z\d])([\w \.-]){0,61}([\w\.-]))):\s*)?([a-z0-9]+(-[a-z0-9]+)*\.)+[a-z]{2,}$'
-    addrObjCheck_range = r'^(?:(?:([A-Za-z\d])|(([A-Za-z\d])([\w \.-]){0,61}([\w\.-]))):\s*)?(?:(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?))-(?:(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?))$'
-
-    addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObject_errors = [], [], [], []
-    for addr in addrList:
-        ip_r = re.match(addrObjCheck_ip, addr)
-        fqdn_r = re.match(addrObjCheck_fqdn, addr)
-        range_r = re.match(addrObjCheck_range, addr)
-        if ip_r:
-            addrObj_ip_raw.append(addr)
-        elif fqdn_r:
-            addrObj_fqdn_raw.append(addr)
-        elif range_r:
-            addrObj_range_raw.append(addr)
-        else:
-            addrObject_errors.append(addr)
-    if addrObject_errors != []:
-        time.sleep(.75)
-        print('\n')
-        for item in addrObject_errors:
-            print(f'There was something wrong with your entry -- {item}')
-        print('\n\nPalo Alto Networks Naming Convention:\nThe name cannot contain more than 63 characters, and it must start with an alphanumeric character,\nwhile the remainder can contain underscores, hypens, periods, or spaces. Also, the last character cannot be a space.\n\n\nPlease fix the issue, then try again...\n\n')
-        if len(argv) > 1:
-            exit()
-        time.sleep(2)
-        return False
-    return addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw
-
-
-# Presents user with instructions and takes user input
-def user_input(argv):
-    while True:
-        if len(argv) < 2:
-            user_instructions = '\n\n' + ('*' * 125) + '\n' + ('*' * 125) + "\nThis script will allow you to provide a list of addresses, then create address objects for them (if they don't already exist)\nand add them to an address group (which it will create if it doesn't already exist)\n\nYou can enter info in the following format for any combination of IP/Netmask, FQDN, or IP Range  -- 'name:address'\nThe script will automagically detect what type of address object it is\n\nFor Example -- mailServer:10.42.42.42 or ldapServer:10.42.42.5/32 or dmzNet:10.42.42.0/24\n   or someFQDN:somthing.domain.com or someRange:192.168.42.10-192.168.42.42\n\n...Also, the name is OPTIONAL. If you provide only the address field, the script will automatically name FQDN/Range objects\nthe same as the address, or if it is an IP address, it will name it with the address along with a prefix of 'N-' or 'H-'\n\nLastly, as another option, you can also pass a CSV file as command argument, which would contain the name and address in the\nleft and right columns respectively. There is no need to use the colon-separated format when using this option.\n" + ('*' * 125) + '\n' + ('*' * 125)
-            print(user_instructions)
-            addrList_string = input('\n\nEnter your comma-separated list of address objects...\n\n')
-            addrList = re.sub(r',\s+', ',', addrList_string).split(',')
-        else:
-            addrList = csvToList(argv[1])
-            while True:
-                seeList = input("\n\nI see you've entered your list through command argument, would you like to see a printout of the list? [y/N]  ")
-                if seeList.lower() == 'y':
-                    print('')
-                    [print(addr) for addr in addrList]
-                    break
-                elif seeList.lower() == 'n' or seeList == '':
-                    break
-                else:
-                    time.sleep(.75)
-                    print("\n\nThat wasn't an option, please try again with a 'y' or 'n'...")
-        rawObjs = parse_addrList(addrList, argv)
-        if rawObjs is not False:
-            return rawObjs
-
-
-# Checks for duplicate name values in the list that was provided by the user
-def checkListDups():
-    global allObjNames
-    allObjNames = [obj[0] for obj in addrObj_ip] + [obj[0] for obj in addrObj_fqdn] + [obj[0] for obj in addrObj_range]
-    allObjNames_unique = set(allObjNames)
-    allObjNames_dup_indices = {value: [i for i, v in enumerate(allObjNames) if v == value] for value in allObjNames_unique}
-    name_dup_dict = {}
-    name_dupBool = False
-    for key in allObjNames_dup_indices:
-        if len(allObjNames_dup_indices[key]) > 1:
-            name_dup_dict[key] = allObjNames_dup_indices[key]
-            name_dupBool = True
-    if name_dupBool is True:
-        time.sleep(.75)
-        print("\nThere are duplicates in the list you provided...\n")
-        for key in name_dup_dict:
-            print(f'{key} -- used {str(len(name_dup_dict[key]))} times')
-        print('\n\nPlease fix the duplicate object issue, the re-run the script\n\n\n')
-        exit()
-
-
-# Builds the address object lists into a more usable format for use in API calls
-def addrObjBuilder(addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw):
-    global addrObj_ip, addrObj_fqdn, addrObj_range
-    for obj in addrObj_ip_raw:
-        if ':' in obj:
-            addrObj_ip.append(obj.split(':'))  # If the ip object has a name, then split it off
-        else:
-            if '/' not in obj or '/32' in obj:
-                ip_pattern = re.compile(r'^((\d{1,3}\.){3}\d{1,3})')
-                ip = ip_pattern.findall(obj)
-                addrObj_ip.append([(f'H-{ip[0][0]}'), obj])  # If the ip object has no mask or /32 mask, then make name the same as the address, with a 'H-' prefix
-            else:
-                mask_pattern = re.compile(r'\d?\d$')
-                ip_pattern = re.compile(r'^((\d{1,3}\.){3}\d{1,3})')
-                mask = mask_pattern.findall(obj)
-                ip = ip_pattern.findall(obj)
-                addrObj_ip.append([(f'N-{ip[0][0]}-{mask[0]}'), obj])  # Create the name of the ip object with the 'N-' prefix, address, and -<mask> suffix
-    for obj in addrObj_fqdn_raw:
-        if ':' in obj:
-            addrObj_fqdn.append(obj.split(':'))
-        else:
-            addrObj_fqdn.append([obj, obj])  # If no name is given for the fqdn object, then the name will be the same as the address
-    for obj in addrObj_range_raw:
-        if ':' in obj:
-            addrObj_range.append(obj.split(':'))
-        else:
-            addrObj_range.append([f'range_{obj}', obj])  # If no name is given for the range object, then the name will be the same as the address
-
-
-# Determine whether the device is Panorama or firewall
-def getDevType(fwip, mainkey):
-    devURL = f"https://{fwip}/api/?type=config&action=get&xpath=/config/devices/entry/device-group&key={mainkey}"
-    r = requests.get(devURL, verify=False)
-    devTree = ET.fromstring(r.text)
-    if devTree.find('./result/device-group/entry') is None:
-        devType = 'fw'
-        print('\n\n...Auto-detected device type to be a firewall...\n')
-    else:
-        devType = 'pano'
-        print('\n\n...Auto-detected device type to be Panorama...\n')
-    return devType
-
-
-# Presents the user with a choice of device-groups
-def getDG(fwip, mainkey):
-    dgXmlUrl = f"https://{fwip}/api/?type=config&action=get&xpath=/config/devices/entry/device-group&key={mainkey}"
-    r = requests.get(dgXmlUrl, verify=False)
-    dgfwTree = ET.fromstring(r.text)
-    dgList = []
-    for entry in dgfwTree.findall('./result/device-group/entry'):
-        dgList.append(entry.get('name'))
-    dgList.append('Shared')
-    while True:
-        try:
-            print("\n\nHere's a list of device groups found in Panorama...\n")
-            for index, dgName in enumerate(dgList):
-                print(f'{index + 1}) {dgName}')
-            dgChoice = int(input('\nChoose a number for the device-group:\n\nAnswer: '))
-            reportDG = dgList[dgChoice - 1]
-            break
-        except:
-            print("\n\nThat's not a number in the list, try again...\n")
-            time.sleep(.75)
-    return reportDG
-
-
-# Checks for parent device groups, and returns a list of them
-def getParentDGs(fwip, mainkey, panoDG):
-    pDGs = []
-    dgHierarchyURL = f'https://{fwip}/api/?type=op&cmd=<show><dg-hierarchy></dg-hierarchy></show>&key={mainkey}'
-    r = requests.get(dgHierarchyURL, verify=False)
-    dgHierarychyTree = ET.fromstring(r.text)
-    while True:
-        dg = dgHierarychyTree.find(f".//*/[@name='{panoDG}']...")
-        if dg.get('name') is None:
-            break
-        else:
-            pDGs.append(dg.get('name'))
-            panoDG = dg.get('name')
-    return pDGs
-
-
-# Check for multi-vsys, if so, prompt user to choose vsys number or shared context
-def check_vsys(fwip, mainkey):
-    multi_vsys_check = f'https://{fwip}/api/?type=op&cmd=<show><system><setting><multi-vsys></multi-vsys></setting></system></show>&key={mainkey}'
-    r = requests.get(multi_vsys_check, verify=False)
-    tree = ET.fromstring(r.text)
-    if tree.find('./result').text == 'off':
-        return 'vsys1'
-    else:
-        print('\n\nLooks like your firewall is running in multi-vsys mode...')
-        while True:
-            vsys = input('\nEnter the vsys number, or hit leave blank for the shared context: ')
-            if vsys == '':
-                return 'shared'
-            try:
-                return f'vsys{str(int(vsys))}'
-            except ValueError:
-                print("\nThat wasn't a number, try again...\n")
-
-
-# Checks Panorama device group or firewall for address duplicates
-def checkPanDups(fwip, mainkey, panoDG, fw_vsys):
-    global addrObj_ip, addrObj_fqdn, addrObj_range
-    if panoDG is not None:
-        sharedAddrObjURL = f'https://{fwip}/api/?type=config&action=get&xpath=/config/shared/address&key={mainkey}'
-        r = requests.get(sharedAddrObjURL, verify=False)
-        tree = ET.fromstring(r.text)
-        addrObjs = [entry.get('name') for entry in tree.findall('./result/address/entry')]  # Add all addresses from the shared context to the address list ##
-        if panoDG != 'Shared':
-            allDGs = [panoDG] + getParentDGs(fwip, mainkey, panoDG)
-            for dg in allDGs:
-                addrObjURL = f"https://{fwip}/api/?type=config&action=get&xpath=/config/devices/entry/device-group/entry[@name='{dg}']/address&key={mainkey}"
-                r = requests.get(addrObjURL, verify=False)
-                tree = ET.fromstring(r.text)
-                for entry in tree.findall('./result/address/entry'):
-                    addrObjs.append(entry.get('name'))  # Add all addresses from the from all parent device groups to the address list ##
-    else:
-        if fw_vsys == 'shared':
-            fwAddrObjURL = f'https://{fwip}/api/?type=config&action=get&xpath=/config/shared/address/address&key={mainkey}'
-        else:
-            fwAddrObjURL = f"https://{fwip}/api/?type=config&action=get&xpath=/config/devices/entry/vsys/entry[@name='{fw_vsys}']/address&key={mainkey}"
-        r = requests.get(fwAddrObjURL, verify=False)
-        tree = ET.fromstring(r.text)
-        addrObjs = [entry.get('name') for entry in tree.findall('./result/address/entry')]  # Add all addresses from the firewall to the address list ##
-    duplicateBool = False
-    duplicateList = []
-    for obj in allObjNames:  # Loops through the list of all object names to be created ##
-        for dev_ojb in addrObjs:  # Loops through the list of all objects that already exist on the Panorama ##
-            if obj == dev_ojb:
-                duplicateBool = True
-                duplicateList.append(obj)
-    if duplicateBool is True:
-        print(f'\n\nDuplicates were found: {str(len(duplicateList))} of your address objects that you provided already exists on the PAN device...\n')
-        print(*duplicateList, sep='\n')
-        print('\n\nPlease make note of these addresses, as you will need to make adjustments to the names for these entries,\nthen manually enter them, or re-run this script. These duplicate entries will automatically be removed in order to proceed.\n\n')
-        time.sleep(.75)
-        for dupObj in duplicateList:
-            [addrObj_ip.remove(addrObj) for addrObj in addrObj_ip if dupObj in addrObj]
-            [addrObj_fqdn.remove(addrObj) for addrObj in addrObj_fqdn if dupObj in addrObj]
-            [addrObj_range.remove(addrObj) for addrObj in addrObj_range if dupObj in addrObj]
-
-
-# Presents user with option to add an address group
-def addGroupOption():
-    global addrGroupName
-    run = True
-    while run:
-        addrGroup_answer = input("\n\nOnce the address objects are added, would you like to add them to a group? [Y/n]  ")
-        if addrGroup_answer.lower() == 'y' or addrGroup_answer == '':
-            while True:
-                addrGroupName = input('\nEnter the name the group: ')
-                addrGroupName_r = re.match(r'^(?:([A-Za-z\d])|(([A-Za-z\d])([\w \.-]){0,61}([\w\.-])))$', addrGroupName)
-                if addrGroupName_r:
-                    run = False
-                    break
-                else:
-                    time.sleep(.75)
-                    print("\n\nYour address group name does not comply with Palo Alto Networks name convention format\n\nThe name cannot contain more than 63 characters, and it must start with an alphanumeric character,\nwhile the remainder can contain underscores, hypens, periods, or spaces.\nAlso, the last character cannot be a space.\n\nPlease try again...\n")
-        elif addrGroup_answer.lower() == 'n':
-            print('\nOk, the address objects will be added without a group')
-            time.sleep(.75)
-            break
-        else:
-            time.sleep(.75)
-            print("\n\nThat wasn't an option, please try again with a 'y' or 'n'...")
-
-
-# Builds a string of elements to add the xpath in the API call for adding addresses to a group,
-# and checks the length of the requests API call to make sure it doesn't go over the 6K character limit, splitting if needed
-def addrGroupBuilder(apiCall_piece):
-    elements_list = []
-    elements_all = f"<entry name='{addrGroupName}'><static>"
-    for name in allObjNames:
-        if len(elements_all) + len(apiCall_piece) + 23 + len(f'<member>{name}</member>') <= 5000:  # 23 is '</static></entry>' + '-group' in the URL
-            elements_all += f'<member>{name}</member>'
-        else:
-            elements_all += '</static></entry>'
-            elements_list.append(elements_all)
-            elements_all = f"<entry name='{addrGroupName}'><static><member>{name}</member>"
-    elements_all += '</static></entry>'
-    elements_list.append(elements_all)
-    return elements_list
-
-
-# Builds a string of elements to add the xpath in the API call for adding addresses to Panorama/FW,
-# and checks the length of the requests API call to make sure it doesn't go over the 6K character limit, splitting if needed
-def elementBuilder(apiCall_piece):
-    elements_list = []
-    elements_all = ''
-    for obj_ip in addrObj_ip:
-        if len(elements_all) + len(apiCall_piece) + len(f"<entry name='{obj_ip[0]}'><ip-netmask>{obj_ip[1]}</ip-netmask></entry>") <= 5000:
-            elements_all += f"<entry name='{obj_ip[0]}'><ip-netmask>{obj_ip[1]}</ip-netmask></entry>"
-        else:
-            elements_list.append(elements_all)
-            elements_all = f"<entry name='{obj_ip[0]}'><ip-netmask>{obj_ip[1]}</ip-netmask></entry>"
-    for obj_fqdn in addrObj_fqdn:
-        if len(elements_all) + len(apiCall_piece) + len(f"<entry name='{obj_fqdn[0]}'><fqdn>{obj_fqdn[1]}</fqdn></entry>") <= 5000:
-            elements_all += f"<entry name='{obj_fqdn[0]}'><fqdn>{obj_fqdn[1]}</fqdn></entry>"
-        else:
-            elements_list.append(elements_all)
-            elements_all = f"<entry name='{obj_fqdn[0]}'><fqdn>{obj_fqdn[1]}</fqdn></entry>"
-    for obj_range in addrObj_range:
-        if len(elements_all) + len(apiCall_piece) + len(f"<entry name='{obj_range[0]}'><ip-range>{obj_range[1]}</ip-range></entry>") <= 5000:
-            elements_all += f"<entry name='{obj_range[0]}'><ip-range>{obj_range[1]}</ip-range></entry>"
-        else:
-            elements_list.append(elements_all)
-            elements_all = f"<entry name='{obj_range[0]}'><ip-range>{obj_range[1]}</ip-range></entry>"
-    elements_list.append(elements_all)
-    return elements_list
-
-
-# Pushes API calls for address object and group creation
-def apiPush(fwip, mainkey, devType, panoDG, fw_vsys):
-    print('\n\nTime to push the address objects...')
-    time.sleep(.75)
-    if devType == 'pano':
-        input('\nPress Enter to push API calls to Panorama (or CTRL+C to kill the script)... ')
-        if panoDG == 'Shared':
-            apiCall_piece = f"https://{fwip}/api/?type=config&action=set&xpath=/config/shared/address&element=&key={mainkey}"
-            addrApiCall_part = f"https://{fwip}/api/?type=config&action=set&xpath=/config/shared/address&element="
-            addrGroupApiCall_part = f"https://{fwip}/api/?type=config&action=set&xpath=/config/shared/address-group&element="
-        else:
-            apiCall_piece = f"https://{fwip}/api/?type=config&action=set&xpath=/config/devices/entry/device-group/entry[@name='{panoDG}']/address&element=&key={mainkey}"
-            addrApiCall_part = f"https://{fwip}/api/?type=config&action=set&xpath=/config/devices/entry/device-group/entry[@name='{panoDG}']/address&element="
-            addrGroupApiCall_part = f"https://{fwip}/api/?type=config&action=set&xpath=/config/devices/entry/device-group/entry[@name='{panoDG}']/address-group&element="
-        addrObjElements_list = elementBuilder(apiCall_piece)
-        if addrGroupName:
-            addrGroupElements_list = addrGroupBuilder(apiCall_piece)
-    else:
-        input('\nPress Enter to push API calls to the firewall (or CTRL+C to kill the script)... ')
-        if fw_vsys == 'shared':
-            apiCall_piece = f'https://{fwip}/api/?type=config&action=set&xpath=/config/shared/address&element=&key={mainkey}'
-            addrApiCall_part = f'https://{fwip}/api/?type=config&action=set&xpath=/config/shared/address&element='
-            addrGroupApiCall_part = f'https://{fwip}/api/?type=config&action=set&xpath=/config/shared/address-group&element='
-        else:
-            apiCall_piece = f"https://{fwip}/api/?type=config&action=set&xpath=/config/devices/entry/vsys/entry[@name='{fw_vsys}']/address&element=&key={mainkey}"
-            addrApiCall_part = f"https://{fwip}/api/?type=config&action=set&xpath=/config/devices/entry/vsys/entry[@name='{fw_vsys}']/address&element="
-            addrGroupApiCall_part = f"https://{fwip}/api/?type=config&action=set&xpath=/config/devices/entry/vsys/entry[@name='{fw_vsys}']/address-group&element="
-        addrObjElements_list = elementBuilder(apiCall_piece)
-        if addrGroupName:
-            addrGroupElements_list = addrGroupBuilder(apiCall_piece)
-    for addrObjElements in addrObjElements_list:
-        addrApiCall = f'{addrApiCall_part}{addrObjElements}&key={mainkey}'
-        r = requests.get(addrApiCall, verify=False)
-        tree = ET.fromstring(r.text)
-        if tree.get('status') != 'success':
-            time.sleep(.75)
-            print(f'\n\nSorry, something went wrong while attempting create your address objects. Below is the faulty API call...\n\n{addrApiCall}\n\n\nTry and fix the issue and give it another shot!\n\nBye for now!\n\n\n')
-            exit()
-    if addrGroupName:
-        time.sleep(.5)
-        print(f"\n\n\nCongrats! All your address objects were successfully created\n\n\n\nNow it's time to add the address objects to the {addrGroupName} address group...")
-        time.sleep(.5)
-        input('\nPress Enter to push API calls to Panorama/firewall (or CTRL+C to kill the script)... ')
-        for addrGroupElements in addrGroupElements_list:
-            addrGroupApiCall = f'{addrGroupApiCall_part}{addrGroupElements}&key={mainkey}'
-            r = requests.get(addrGroupApiCall, verify=False)
-            tree = ET.fromstring(r.text)
-            if tree.get('status') != 'success':
-                time.sleep(.75)
-                print(f'\n\nSorry, something went wrong while attempting to add your address objects to the address group. Below is the faulty API call...\n\n{addrGroupApiCall}\n\n\nTry and fix the issue and give it another shot!\n\nBye for now!\n\n\n')
-                exit()
-            elif addrGroupElements == addrGroupElements_list[-1]:
-                time.sleep(.5)
-                print(f'\n\n\nCongrats! You successfully added all of your address objects to the {addrGroupName} address group')
-    else:
-        print('\n\n\nCongrats! You successfully created all of your address objects')
-
-
-def main():
-    global addrObj_ip, addrObj_fqdn, addrObj_range, allObjNames, addrGroupName
-    authenticated = False
-    while True:
-
-        # If no argument is passed with the command, then the user will be prompted to enter a list of objects
-        addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw = user_input(sys.argv)
-
-        # Calls the functions to build the 3 lists with name and address for each element in each list
-        addrObjBuilder(addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw)
-
-        # Search the user provided list for duplicates
-        checkListDups()
-
-        # Calls the functions to prompt user for Panorama/FW address, and retrieve the API key
-        if not authenticated:
-            fwip = getfwipfqdn()
-            mainkey = getkey(fwip)
-            authenticated = True
-
-        # Determine whether the device is Panorama or firewall
-        devType = getDevType(fwip, mainkey)
-
-        # If Panorama is the device type, prompt user to choose device group
-        panoDG = None
-        if devType == 'pano':
-            panoDG = getDG(fwip, mainkey)
-
-        # Check to see if firewall is multi-vsys, return vsys number, or shared
-        fw_vsys = None
-        if devType == 'fw':
-            fw_vsys = check_vsys(fwip, mainkey)
-
-        # Check for duplicates between list provided and pano/fw, and remove from list if they exist
-        checkPanDups(fwip, mainkey, panoDG, fw_vsys)
-
-        # Option for adding address object group
-        addGroupOption()
-
-        # Push API calls
-        apiPush(fwip, mainkey, devType, panoDG, fw_vsys)
-
-        # Prompt to run again if CSV was used (the same Pano/FW and credentials will be used)
-        if len(sys.argv) == 2:
-            while True:
-                another_run = input('\n\nWould you like run the script against another CSV file? [Y/n]  ')
-                if another_run.lower() == 'y' or another_run == '':
-                    sys.argv[1] = input('\nEnter the name of your CSV file: ')
-                    addrObj_ip, addrObj_fqdn, addrObj_range, allObjNames, addrGroupName = [], [], [], [], None
-                    break
-                elif another_run.lower() == 'n':
-                    print('\n\n\nHave a fantastic day!!!\n\n\n')
-                    exit()
-                else:
-                    time.sleep(.75)
-                    print("\n\nThat wasn't an option, please try again with a 'y' or 'n'...")
-        else:
-            break
-    print('\n\n\nHave a fantastic day!!!\n\n\n')
-
-
-if __name__ == '__main__':
-    main()
+###############################################################################
+#
+# Script:       add-addresses.py
+#
+# Author:       Chris Goodwin <chrisgoodwins@gmail.com>
+#
+# Description:  Create new address objects on a firewall or Panorama device
+#               group. The user will also have the option to add the objects
+#               to an address group. There are 2 options for adding address
+#               objects - either with a comma separated list, or by passing a
+#               CSV file via command line argument. The script tests for
+#               duplicates within the list provided, as well as on the firewall
+#               or device group.
+#
+# Usage:        add-addresses.py [options]
+#               or
+#               add-addresses.py [options] <user-provided-list.csv>
+#               or
+#               add-addresses.py [options] --manifest <targets.json>
+#
+# Options:      --timeout <seconds>   Timeout for each API call (default 30)
+#               --retries <count>     Retries for failed API connections (default 3)
+#               --workers <count>     Concurrent API calls for independent reads (default 4)
+#               --post                Send the elements of set calls in a POST body instead of the URL
+#               --batch-size <bytes>  Size limit of each set call (default 5000 for the URL, or 512000 with --post)
+#               --in-flight <count>   Set calls sent at the same time while pushing (default 4)
+#               --asyncio             Run the push pipeline on asyncio rather than a thread pool
+#               --refresh             Download the device inventory again, rather than using the cached copy
+#               --cache-dir <path>    Where the inventory cache is kept (default ~/.cache/add-addresses)
+#               --lookup-threshold <count>
+#                                     Below this many objects, query the device for just those names and addresses, rather than
+#                                     downloading every address object (by default, chosen from measured latency and inventory size)
+#               --manifest <path>     Run headless against every target in the JSON manifest, without prompting
+#               --keyfile <path>      File holding the API key for --manifest runs (default: the PANOS_API_KEY environment variable)
+#               --parallel <count>    Manifest targets processed at the same time (default 8)
+#               --sync                Only push the objects added or changed since the last sync of the device group or vsys
+#               --sync-delete         With --sync, also delete the objects removed from the list since the last sync
+#               --max-members <count> Most static members in an address group, beyond which overflow groups are nested in it
+#                                     (default 2500, or 0 for no limit)
+#               --dry-run             Plan the import offline against a saved config export, and print the plan as JSON
+#               --config <path>       Config export to check against with --dry-run (a saved running config, or a show config response)
+#               --device <address>    Device address used to size the planned GET calls with --dry-run (default localhost)
+#               --device-group <name> Device group to plan for with --dry-run, for a Panorama config
+#               --vsys <name>         Vsys to plan for with --dry-run, for a multi-vsys firewall config
+#               --group <name>        Address group to plan for with --dry-run
+#               --value-dups <answer> Objects whose address exists under another name with --dry-run -- skip, reuse, or create (default skip)
+#               --report <path>       Record the time of each phase and API call, and write them as a JSON report (or CSV, for a .csv path)
+#               --profile <path>      Profile the run with cProfile, saving the stats to the path (one file per target with --manifest)
+#               --resume              Continue an unfinished push from its journal, sending only the batches that weren't confirmed
+#               --aggregate <mode>    Merge the unnamed ip-netmask and ip-range entries that overlap or are adjacent into the fewest
+#                                     objects -- cidr for CIDR blocks, or range for ranges
+#               --aggregate-report <path>
+#                                     With --aggregate, write a CSV file of each merged object and the entries it covers
+#
+# Requirements: requests, and pan_addresses.py in the same directory (numpy is optional, and speeds up the checks of large IP
+#               wildcard lists)
+#
+# Python:       Version 3
+#
+###############################################################################
+###############################################################################
+
+import io
+import os
+import sys
+import csv
+import json
+import zlib
+import atexit
+import pstats
+import asyncio
+import cProfile
+import sqlite3
+import getpass
+import re
+import time
+import threading
+from urllib.parse import urlencode, urlsplit, parse_qsl
+from contextlib import closing, redirect_stdout, contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from xml.etree import ElementTree as ET
+try:
+    import requests
+except ImportError:
+    raise ValueError('requests support not available, please install module')
+from pan_addresses import (AddrObject, ADDR_TYPES, AGGREGATE_MODES, VALUE_DUP_CHOICES, addrName_re, csvRows, csvRecords,
+                           classifyAddr, recordEntry, checkRecords, addrObjName, aggregateAddrRecords, normalizeAddr,
+                           indexAddrEntries, addrEntryTuple, readAddrEntries, findNameDups, findPanDups, findValueDups,
+                           batchPredicates, buildElements, buildMembers, addrGroupMembers, expandGroup, scopeXpath, makeSession,
+                           retryConfigCall, sendBatches)
+
+###############################################################################
+###############################################################################
+
+addrObj_ip, addrObj_fqdn, addrObj_range, addrObj_wildcard, allObjNames, addrGroupName = [], [], [], [], [], None
+
+# Command line options, along with the type used to convert each option's value
+options = {'timeout': 30.0, 'retries': 3, 'workers': 4, 'post': False, 'batch-size': 0, 'in-flight': 4, 'asyncio': False,
+           'refresh': False, 'cache-dir': os.path.join(os.path.expanduser('~'), '.cache', 'add-addresses'), 'lookup-threshold': 0,
+           'manifest': None, 'keyfile': None, 'parallel': 8, 'sync': False, 'sync-delete': False,
+           'max-members': 2500, 'dry-run': False, 'config': None, 'device': None, 'device-group': None, 'vsys': None, 'group': None,
+           'value-dups': 'skip', 'report': None, 'profile': None, 'resume': False, 'aggregate': None, 'aggregate-report': None}
+optionTypes = {'timeout': float, 'retries': int, 'workers': int, 'post': bool, 'batch-size': int, 'in-flight': int, 'asyncio': bool,
+               'refresh': bool, 'cache-dir': str, 'lookup-threshold': int, 'manifest': str, 'keyfile': str, 'parallel': int,
+               'sync': bool, 'sync-delete': bool, 'max-members': int, 'dry-run': bool, 'config': str, 'device': str, 'device-group': str,
+               'vsys': str, 'group': str, 'value-dups': str, 'report': str, 'profile': str, 'resume': bool, 'aggregate': str,
+               'aggregate-report': str}
+
+# Whether the script is running headless from a manifest, where nothing is prompted for and there are no pauses
+headless = False
+
+# Environment variable holding the API key for manifest runs
+API_KEY_ENV = 'PANOS_API_KEY'
+
+# The objects made by the last aggregation, each with the entries it covers
+addrCoverage = []
+
+# Stand-in API key for dry runs, which only sizes the planned GET calls (so it's as long as a long real key)
+DRY_RUN_KEY = 'X' * 128
+
+# Shared keep-alive session for all API calls, created on first use by getSession()
+apiSession = None
+
+# Config version of the device for this run, used to key the inventory cache (None when the cache can't be used),
+# and the inventory already read during this run, keyed by (device, scope)
+configVersion = None
+runCache = {}
+
+# Run instrumentation, enabled by --report or --profile -- the wall time of each phase of the run, and a record of each API
+# call. It's None when disabled, so the only cost then is checking it
+runStats = None
+statsLock = threading.Lock()
+
+# Running average of the API call latency in seconds (None until the first call), and the object count under which
+# targeted lookups are used when there are no measurements of the inventory download to compare against
+apiLatency = None
+LOOKUP_THRESHOLD = 250
+
+# The device's FQDN folded to lower case in a lookup predicate, as XPath 1.0 has no lower-case()
+FQDN_LOWER = "translate(fqdn,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz')"
+
+# Most entries printed by each of the IP wildcard checks, as an ACL migration can have hundreds of thousands of them
+WILDCARD_REPORT_LIMIT = 20
+
+
+# Removes the '--option value' arguments from argv and stores them in options, leaving the positional arguments in place
+def parseOptions(argv):
+    i = 1
+    while i < len(argv):
+        if argv[i].startswith('--'):
+            option = argv[i][2:]
+            try:
+                if optionTypes[option] is bool:
+                    options[option] = True
+                    del argv[i]
+                else:
+                    options[option] = optionTypes[option](argv[i + 1])
+                    del argv[i:i + 2]
+            except (KeyError, IndexError, ValueError):
+                print(f'\n\nThere was something wrong with the {argv[i]} option, please check the usage and try again...\n\n')
+                exit()
+        else:
+            i += 1
+
+
+# Pauses so the user can read the output, unless running headless
+def pause(seconds):
+    if not headless:
+        time.sleep(seconds)
+
+
+# Waits for the user to press Enter, unless running headless
+def confirm(prompt):
+    if not headless:
+        input(prompt)
+
+
+# Returns the shared session, creating it with a connection pool and retry with backoff on first use
+def getSession():
+    global apiSession
+    if apiSession is None:
+        apiSession = makeSession(options['retries'], max(options['workers'], options['in-flight']))
+    return apiSession
+
+
+# Sends an API call over the shared session, reusing its open connection to the device, and records it when the run is
+# instrumented (with stream=True, the response body is read as it's consumed, rather than all at once)
+def apiRequest(method, url, data=None, stream=False):
+    start = time.perf_counter()
+    try:
+        r = getSession().request(method, url, data=data, verify=False, timeout=options['timeout'], stream=stream)
+    except requests.exceptions.RequestException as e:
+        if runStats is not None:
+            recordRequest(method, url, data, start, None, stream, e)
+        raise
+    if runStats is not None:
+        recordRequest(method, url, data, start, r, stream)
+    return r
+
+
+# Sends a GET API call over the shared session
+def apiGet(url, stream=False):
+    global apiLatency
+    start = time.perf_counter()
+    r = apiRequest('GET', url, stream=stream)
+    elapsed = time.perf_counter() - start  # Time to the response headers, so it's the latency even for streamed responses
+    apiLatency = elapsed if apiLatency is None else apiLatency * .8 + elapsed * .2
+    return r
+
+
+# Sends a POST API call over the shared session, with the parameters form-encoded in the body
+def apiPost(url, data):
+    return apiRequest('POST', url, data=data)
+
+
+# Starts recording the phases and API calls of the run, and profiling it with --profile
+def startStats():
+    global runStats
+    runStats = {'start': time.perf_counter(), 'phases': {}, 'requests': [], 'profiler': None}
+    if options['profile']:
+        runStats['profiler'] = cProfile.Profile()
+        runStats['profiler'].enable()
+
+
+# Times the block as a phase of the run, adding to the phase's total if it runs more than once
+@contextmanager
+def timedPhase(name):
+    if runStats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        addPhaseTime(name, time.perf_counter() - start)
+
+
+# Adds the seconds to the phase's total (phases can be timed on the worker threads too)
+def addPhaseTime(name, seconds):
+    with statsLock:
+        runStats['phases'][name] = runStats['phases'].get(name, 0.0) + seconds
+
+
+# Records an API call for the run report -- what it was (without the key, credentials, or element), when it started, how
+# long it took, the bytes sent and received, the retries, and whether it failed. The bytes received of a streamed call are
+# only known once its body has been read, so they're filled in by stopStats
+def recordRequest(method, url, data, start, r, stream, error=None):
+    params = dict(parse_qsl(urlsplit(url).query, keep_blank_values=True))
+    params.update(data or {})
+    call = params.get('type', '')
+    if params.get('cmd'):
+        call += ' ' + ' '.join(re.findall(r'<([\w-]+)>', params['cmd']))
+    elif params.get('action'):
+        call += ' ' + params['action']
+    record = {'start': round(start - runStats['start'], 4), 'seconds': round(time.perf_counter() - start, 4), 'method': method, 'call': call,
+              'xpath': params.get('xpath', ''), 'status': None, 'bytes sent': len(url), 'bytes received': 0, 'retries': 0, 'error': ''}
+    if data:
+        record['bytes sent'] += len(r.request.body) if r is not None else len(urlencode(data))  # The sent body is already encoded, so it's only encoded again for a failed call
+    if error is not None:
+        record['error'] = str(error) or type(error).__name__
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.RetryError)):
+            record['retries'] = options['retries']  # The call only fails this way once its retries have run out
+        for secret in (params.get('key'), params.get('password')):
+            if secret:
+                record['error'] = record['error'].replace(secret, '*****')
+    else:
+        record['status'] = r.status_code
+        record['retries'] = len(r.raw.retries.history) if r.raw.retries else 0
+        if stream:
+            record['raw'] = r.raw
+        else:
+            record['bytes received'] = r.raw.tell()
+        if r.status_code >= 400:
+            record['error'] = f'HTTP {r.status_code}'
+        elif not stream and b'status="error"' in r.content[:200]:
+            record['error'] = 'error response'
+    runStats['requests'].append(record)
+
+
+# Stops the run instrumentation, saving the profile to the path with --profile, and returns the run's phases, the totals
+# of each type of API call, and the record of each call
+def stopStats(profilePath=None):
+    global runStats
+    stats, runStats = runStats, None
+    if stats['profiler'] is not None:
+        stats['profiler'].disable()
+        stats['profiler'].dump_stats(profilePath)
+    for record in stats['requests']:
+        raw = record.pop('raw', None)
+        if raw is not None:
+            record['bytes received'] = raw.tell()
+    return {'seconds': round(time.perf_counter() - stats['start'], 3), 'phases': {name: round(seconds, 4) for name, seconds in stats['phases'].items()},
+            'calls': callTotals(stats['requests']), 'requests': stats['requests']}
+
+
+# Totals the API call records by type of call -- the number of calls, the seconds spent in them, the bytes sent and
+# received, the retries, and the calls that failed
+def callTotals(records):
+    totals = {}
+    for record in records:
+        total = totals.setdefault(record['call'], {'calls': 0, 'seconds': 0.0, 'bytes sent': 0, 'bytes received': 0, 'retries': 0, 'failed': 0})
+        total['calls'] += 1
+        total['seconds'] = round(total['seconds'] + record['seconds'], 4)
+        total['bytes sent'] += record['bytes sent']
+        total['bytes received'] += record['bytes received']
+        total['retries'] += record['retries']
+        total['failed'] += bool(record['error'])
+    return totals
+
+
+# Prints the rows as a table under the headers
+def printTable(headers, rows, file=None):
+    rows = [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(cell) for cell in column) for column in zip(headers, *rows)]
+    print('  '.join(header.ljust(width) for header, width in zip(headers, widths)).rstrip(), file=file)
+    print('  '.join('-' * width for width in widths), file=file)
+    for row in rows:
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip(), file=file)
+
+
+# Prints the summary of the run's phases and API calls
+def printStats(stats, file=None):
+    print(f"\n\nThe run took {stats['seconds']}s\n", file=file)
+    printTable(['phase', 'seconds'], [[name, f'{seconds:.3f}'] for name, seconds in stats['phases'].items()], file)
+    if not stats['calls']:
+        return
+    calls = sorted(stats['calls'].items(), key=lambda item: -item[1]['seconds'])
+    print('', file=file)
+    printTable(['API call', 'calls', 'seconds', 'KiB sent', 'KiB received', 'retries', 'failed'],
+               [[call, total['calls'], f"{total['seconds']:.3f}", f"{total['bytes sent'] / 1024:.1f}", f"{total['bytes received'] / 1024:.1f}",
+                 total['retries'], total['failed']] for call, total in calls], file)
+
+
+# Writes the run report as JSON, or as CSV (a row for each phase and API call) when the path ends in .csv. The report of a
+# manifest run has the stats of each target under 'targets'
+def writeReport(path, report):
+    if not path.lower().endswith('.csv'):
+        with open(path, 'w') as file:
+            json.dump(report, file, indent=2)
+        return
+    fields = ['start', 'seconds', 'method', 'xpath', 'status', 'bytes sent', 'bytes received', 'retries', 'error']
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['device', 'scope', 'kind', 'name'] + fields)
+        for target in report.get('targets', [report]):
+            device, scope = target.get('device', ''), target.get('scope', '')
+            for name, seconds in target['phases'].items():
+                writer.writerow([device, scope, 'phase', name, '', seconds] + [''] * (len(fields) - 2))
+            for record in target['requests']:
+                writer.writerow([device, scope, 'request', record['call']] + [record[field] for field in fields])
+
+
+# Ends the instrumentation of an interactive run or dry run, printing its summary, and writing the report with --report
+def finishStats():
+    file = sys.stderr if options['dry-run'] else sys.stdout  # A dry run only prints its plan to stdout
+    stats = stopStats(options['profile'])
+    printStats(stats, file)
+    if options['profile']:
+        print('', file=file)
+        pstats.Stats(options['profile'], stream=file).sort_stats('cumulative').print_stats(15)
+    if options['report']:
+        try:
+            writeReport(options['report'], stats)
+            print(f"\nThe run report was written to {options['report']}\n", file=file)
+        except OSError as e:
+            print(f'\nThe run report could not be written -- {e}\n', file=file)
+
+
+# Returns a token for the device's config version -- the latest config audit version, or None if there are uncommitted
+# changes (the candidate config may not match the cached inventory) or the version can't be read
+def getConfigVersion(fwip, mainkey):
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pending = executor.submit(apiGet, f'https://{fwip}/api/?type=op&cmd=<check><pending-changes></pending-changes></check>&key={mainkey}')
+            audit = executor.submit(apiGet, f'https://{fwip}/api/?type=op&cmd=<show><config><audit><info></info></audit></config></show>&key={mainkey}')
+            if ET.fromstring(pending.result().text).findtext('./result') != 'no':
+                return None
+            versions = [int(v.text) for v in ET.fromstring(audit.result().text).iter('version') if v.text and v.text.strip().isdigit()]
+    except (requests.exceptions.RequestException, ET.ParseError):
+        return None
+    return str(max(versions)) if versions else None
+
+
+# Opens the inventory cache database, creating it if needed
+def openCache():
+    os.makedirs(options['cache-dir'], exist_ok=True)
+    db = sqlite3.connect(os.path.join(options['cache-dir'], 'inventory.sqlite'), timeout=30)
+    db.execute('CREATE TABLE IF NOT EXISTS inventory (device TEXT, scope TEXT, version TEXT, data BLOB, PRIMARY KEY (device, scope))')
+    db.execute('CREATE TABLE IF NOT EXISTS download_stats (device TEXT, scope TEXT, entries INTEGER, seconds REAL, PRIMARY KEY (device, scope))')
+    return db
+
+
+# Returns whether the scope's data can be read from the run cache or on-disk cache, without calling the device
+def isCached(fwip, scope):
+    if (fwip, scope) in runCache:
+        return True
+    if configVersion is None or options['refresh']:
+        return False
+    try:
+        with closing(openCache()) as db:
+            return db.execute('SELECT 1 FROM inventory WHERE device = ? AND scope = ? AND version = ?', (fwip, scope, configVersion)).fetchone() is not None
+    except (sqlite3.Error, OSError):
+        return False
+
+
+# Returns the (entries, seconds) measured for the last full download of the scope, or None if it hasn't been downloaded before
+def getDownloadStats(fwip, scope):
+    try:
+        with closing(openCache()) as db:
+            return db.execute('SELECT entries, seconds FROM download_stats WHERE device = ? AND scope = ?', (fwip, scope)).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+
+
+# Records the size of a full download of the scope and how long it took, for choosing between targeted lookups and full downloads
+def putDownloadStats(fwip, scope, entries, seconds):
+    try:
+        with closing(openCache()) as db, db:
+            db.execute('REPLACE INTO download_stats VALUES (?, ?, ?, ?)', (fwip, scope, entries, seconds))
+    except (sqlite3.Error, OSError):
+        pass
+
+
+# Returns the result of fetch() for the scope, reading it from the run cache or the on-disk cache when the config version matches,
+# otherwise calling fetch() and storing its result (which must be JSON serializable)
+def cachedFetch(fwip, scope, fetch):
+    if (fwip, scope) in runCache:
+        return runCache[(fwip, scope)]
+    data = None
+    if configVersion is not None and not options['refresh']:
+        try:
+            with closing(openCache()) as db:
+                row = db.execute('SELECT data FROM inventory WHERE device = ? AND scope = ? AND version = ?', (fwip, scope, configVersion)).fetchone()
+            if row:
+                data = json.loads(zlib.decompress(row[0]))
+        except (sqlite3.Error, OSError, ValueError, zlib.error):
+            data = None  # A missing or unreadable cache just means downloading the inventory
+    if data is None:
+        data = fetch()
+        if configVersion is not None:
+            try:
+                with closing(openCache()) as db, db:
+                    db.execute('REPLACE INTO inventory VALUES (?, ?, ?, ?)', (fwip, scope, configVersion, zlib.compress(json.dumps(data).encode())))
+            except (sqlite3.Error, OSError):
+                pass
+    runCache[(fwip, scope)] = data
+    return data
+
+
+# Drops the cached inventory of the device, after objects have been pushed to it
+def clearCache(fwip):
+    for key in [key for key in runCache if key[0] == fwip]:
+        del runCache[key]
+    try:
+        with closing(openCache()) as db, db:
+            db.execute('DELETE FROM inventory WHERE device = ?', (fwip,))
+    except (sqlite3.Error, OSError):
+        pass
+
+
+# Prompts the user to enter an address, then checks it's validity
+def getfwipfqdn():
+    while True:
+        fwipraw = input("\nPlease enter Panorama/firewall IP or FQDN: ")
+        ipr = re.match(r"^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$", fwipraw)
+        fqdnr = re.match(r"(?=^.{4,253}$)(^((?!-)[a-zA-Z0-9-]{1,63}(?<!-)\.)+[a-zA-Z]{2,63}$)", fwipraw)
+        if ipr:
+            break
+        elif fqdnr:
+            break
+        else:
+            print("\nThere was something wrong with your entry. Please try again...\n")
+    return fwipraw
+
+
+# Prompts the user to enter a username and password
+def getCreds():
+    while True:
+        username = input("Please enter your user name: ")
+        usernamer = re.match(r"^[\w-]{3,24}$", username)
+        if usernamer:
+            password = getpass.getpass("Please enter your password: ")
+            break
+        else:
+            print("\nThere was something wrong with your entry. Please try again...\n")
+    return username, password
+
+
+# Retrieves the user's api key
+def getkey(fwip):
+    while True:
+        try:
+            username, password = getCreds()
+            keycall = f"https://{fwip}/api/?type=keygen&user={username}&password={password}"
+            r = apiGet(keycall)
+            tree = ET.fromstring(r.text)
+            if tree.get('status') == "success":
+                apikey = tree[0][0].text
+                break
+            else:
+                print("\nYou have entered an incorrect username or password. Please try again...\n")
+        except requests.exceptions.ConnectionError:
+            print("\nThere was a problem connecting to the firewall. Please check the address and try again...\n")
+            exit()
+    return apikey
+
+
+# Parses address list, checks address validity, and separates object types
+def parse_addrList(addrList, argv):
+    return sortAddrRecords(((addr, classifyAddr(addr)) for addr in addrList), argv)
+
+
+# Separates the classified (entry, record) pairs by object type, and reports the entries that are invalid. The IP wildcard
+# entries are checked together once they've all been read
+def sortAddrRecords(classified, argv):
+    records, addrObject_errors, hostBits, overlaps = checkRecords(classified)
+    if addrObject_errors != []:
+        pause(.75)
+        print('\n')
+        for item in addrObject_errors:
+            print(f'There was something wrong with your entry -- {item}')
+        print('\n\nPalo Alto Networks Naming Convention:\nThe name cannot contain more than 63 characters, and it must start with an alphanumeric character,\nwhile the remainder can contain underscores, hypens, periods, or spaces. Also, the last character cannot be a space.\n\n\nPlease fix the issue, then try again...\n\n')
+        if len(argv) > 1:
+            exit()
+        pause(2)
+        return False
+    reportWildcards(hostBits, overlaps)
+    addrObj_raw = {addrType: [] for addrType in ADDR_TYPES}
+    for record in records:
+        addrObj_raw[record.kind].append(record)
+    return tuple(addrObj_raw[addrType] for addrType in ADDR_TYPES)
+
+
+# Prints the IP wildcard entries with address bits set under the wildcard bits, and the ones that overlap another entry.
+# Neither stops the import, as the device accepts them
+def reportWildcards(hostBits, overlaps):
+    if hostBits:
+        pause(.75)
+        print(f'\n\n{len(hostBits)} of your IP wildcard entries have address bits set under the wildcard mask, which the device ignores...\n')
+        for record in hostBits[:WILDCARD_REPORT_LIMIT]:
+            print(recordEntry(record))
+        if len(hostBits) > WILDCARD_REPORT_LIMIT:
+            print(f'...and {len(hostBits) - WILDCARD_REPORT_LIMIT} more')
+    if overlaps:
+        pause(.75)
+        print(f'\n\n{len(overlaps)} of your IP wildcard entries match some of the same addresses as another entry in the list...\n')
+        for record, other in overlaps[:WILDCARD_REPORT_LIMIT]:
+            print(f'{recordEntry(record)} -- overlaps {recordEntry(other)}')
+        if len(overlaps) > WILDCARD_REPORT_LIMIT:
+            print(f'...and {len(overlaps) - WILDCARD_REPORT_LIMIT} more')
+
+
+# Presents user with instructions and takes user input
+def user_input(argv):
+    while True:
+        if len(argv) < 2:
+            user_instructions = '\n\n' + ('*' * 125) + '\n' + ('*' * 125) + "\nThis script will allow you to provide a list of addresses, then create address objects for them (if they don't already exist)\nand add them to an address group (which it will create if it doesn't already exist)\n\nYou can enter info in the following format for any combination of IP/Netmask, FQDN, IP Range, or IP Wildcard  -- 'name:address'\nThe script will automagically detect what type of address object it is\n\nFor Example -- mailServer:10.42.42.42 or ldapServer:10.42.42.5/32 or dmzNet:10.42.42.0/24\n   or someFQDN:somthing.domain.com or someRange:192.168.42.10-192.168.42.42 or someWildcard:10.42.0.5/0.0.255.0\n\n...Also, the name is OPTIONAL. If you provide only the address field, the script will automatically name FQDN/Range objects\nthe same as the address, or if it is an IP address, it will name it with the address along with a prefix of 'N-' or 'H-'\n(or 'W-' for an IP wildcard)\n\nLastly, as another option, you can also pass a CSV file as command argument, which would contain the name and address in the\nleft and right columns respectively. There is no need to use the colon-separated format when using this option.\n" + ('*' * 125) + '\n' + ('*' * 125)
+            print(user_instructions)
+            addrList_string = input('\n\nEnter your comma-separated list of address objects...\n\n')
+            addrList = re.sub(r',\s+', ',', addrList_string).split(',')
+            rawObjs = parse_addrList(addrList, argv)
+        else:
+            while True:
+                seeList = input("\n\nI see you've entered your list through command argument, would you like to see a printout of the list? [y/N]  ")
+                if seeList.lower() == 'y':
+                    print('')
+                    for line_num, row in csvRows(argv[1]):
+                        print(':'.join(row).lstrip(':'))  # Printed in the same 'name:address' format as terminal input
+                    break
+                elif seeList.lower() == 'n' or seeList == '':
+                    break
+                else:
+                    pause(.75)
+                    print("\n\nThat wasn't an option, please try again with a 'y' or 'n'...")
+            rawObjs = sortAddrRecords(csvRecords(argv[1]), argv)
+        if rawObjs is not False:
+            return rawObjs
+
+
+# Checks for duplicate name values in the list that was provided by the user
+def checkListDups():
+    global allObjNames
+    allObjNames = [obj[0] for addrType, addrObjs in addrObjLists() for obj in addrObjs]
+    name_dup_dict = findNameDups(allObjNames)
+    if name_dup_dict:
+        pause(.75)
+        print("\nThere are duplicates in the list you provided...\n")
+        for key in name_dup_dict:
+            print(f'{key} -- used {str(name_dup_dict[key])} times')
+        print('\n\nPlease fix the duplicate object issue, the re-run the script\n\n\n')
+        exit()
+
+
+# Builds the address object lists into a more usable format for use in API calls
+def addrObjBuilder(addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw):
+    for (_, addrObjs), records in zip(addrObjLists(), (addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw)):
+        addrObjs.extend([addrObjName(record), record.value] for record in records)
+
+
+# Returns the (type, object list) of each address type, in the order the objects are pushed
+def addrObjLists():
+    return (('ip-netmask', addrObj_ip), ('fqdn', addrObj_fqdn), ('ip-range', addrObj_range), ('ip-wildcard', addrObj_wildcard))
+
+
+# Returns the objects in the lists as the library's AddrObject, in the order they're pushed
+def addrObjects():
+    return (AddrObject(addrObj[0], addrType, addrObj[1]) for addrType, addrObjs in addrObjLists() for addrObj in addrObjs)
+
+
+# With --aggregate, merges the address entries before the objects are built, then reports the objects that were merged, with the
+# entries each one covers. Returns the 4 lists of records, which are passed through unchanged without --aggregate (IP wildcards
+# are never merged, as they aren't a single interval of addresses)
+def aggregateAddrs(addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw):
+    global addrCoverage
+    addrCoverage = []
+    if not options['aggregate']:
+        return addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw
+    addrObj_ip_raw, addrObj_range_raw, addrCoverage = aggregateAddrRecords(addrObj_ip_raw, addrObj_range_raw, options['aggregate'])
+    if not addrCoverage:
+        print('\n\nNone of the addresses overlap or are adjacent, so there was nothing to aggregate')
+        return addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw
+    print(f'\n\n{mergedEntries()} addresses were aggregated into {len(addrCoverage)} {"CIDR block" if options["aggregate"] == "cidr" else "range"} objects')
+    if options['aggregate-report']:
+        try:
+            with open(options['aggregate-report'], 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['name', 'address', 'entries'])
+                for record, entries in addrCoverage:
+                    writer.writerow([addrObjName(record), record.value, ' '.join(entries)])
+            print(f"The objects and the entries they cover were written to {options['aggregate-report']}")
+        except OSError as e:
+            print(f'The aggregation report could not be written -- {e}')
+    elif not headless:
+        while True:
+            seeCoverage = input('\nWould you like to see the entries that each aggregated object covers? [y/N]  ')
+            if seeCoverage.lower() == 'y':
+                print('')
+                for record, entries in addrCoverage:
+                    print(f"{addrObjName(record)} ({record.value}) -- {', '.join(entries)}")
+                break
+            elif seeCoverage.lower() == 'n' or seeCoverage == '':
+                break
+            else:
+                pause(.75)
+                print("\n\nThat wasn't an option, please try again with a 'y' or 'n'...")
+    return addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw
+
+
+# Returns the number of distinct addresses that the last aggregation merged into new objects
+def mergedEntries():
+    return len({entry for record, entries in addrCoverage for entry in entries})
+
+
+# Retrieves the list of Panorama device groups (empty for a firewall)
+def getDGList(fwip, mainkey):
+    def fetch():
+        dgXmlUrl = f"https://{fwip}/api/?type=config&action=get&xpath=/config/devices/entry/device-group&key={mainkey}"
+        r = apiGet(dgXmlUrl)
+        dgfwTree = ET.fromstring(r.text)
+        return [entry.get('name') for entry in dgfwTree.findall('./result/device-group/entry')]
+    return cachedFetch(fwip, 'device-groups', fetch)
+
+
+# Determine whether the device is Panorama or firewall
+def getDevType(fwip, mainkey):
+    if getDGList(fwip, mainkey) == []:
+        devType = 'fw'
+        print('\n\n...Auto-detected device type to be a firewall...\n')
+    else:
+        devType = 'pano'
+        print('\n\n...Auto-detected device type to be Panorama...\n')
+    return devType
+
+
+# Presents the user with a choice of device-groups, or checks the device group that was given when running headless
+def getDG(fwip, mainkey, dgName=None):
+    dgList = getDGList(fwip, mainkey) + ['Shared']
+    if headless:
+        if dgName not in dgList:
+            raise ValueError(f'the device group {dgName} was not found in Panorama' if dgName else 'no device group was given for Panorama')
+        return dgName
+    while True:
+        try:
+            print("\n\nHere's a list of device groups found in Panorama...\n")
+            for index, dgName in enumerate(dgList):
+                print(f'{index + 1}) {dgName}')
+            dgChoice = int(input('\nChoose a number for the device-group:\n\nAnswer: '))
+            reportDG = dgList[dgChoice - 1]
+            break
+        except:
+            print("\n\nThat's not a number in the list, try again...\n")
+            pause(.75)
+    return reportDG
+
+
+# Checks for parent device groups, and returns a list of them
+def getParentDGs(fwip, mainkey, panoDG):
+    def fetch():
+        pDGs = []
+        dgName = panoDG
+        dgHierarchyURL = f'https://{fwip}/api/?type=op&cmd=<show><dg-hierarchy></dg-hierarchy></show>&key={mainkey}'
+        r = apiGet(dgHierarchyURL)
+        dgHierarychyTree = ET.fromstring(r.text)
+        while True:
+            dg = dgHierarychyTree.find(f".//*/[@name='{dgName}']...")
+            if dg.get('name') is None:
+                break
+            else:
+                pDGs.append(dg.get('name'))
+                dgName = dg.get('name')
+        return pDGs
+    return cachedFetch(fwip, f'parents:{panoDG}', fetch)
+
+
+# Check for multi-vsys, if so, prompt user to choose vsys number or shared context (or use the vsys given when running headless)
+def check_vsys(fwip, mainkey, vsys=None):
+    def fetch():
+        multi_vsys_check = f'https://{fwip}/api/?type=op&cmd=<show><system><setting><multi-vsys></multi-vsys></setting></system></show>&key={mainkey}'
+        r = apiGet(multi_vsys_check)
+        tree = ET.fromstring(r.text)
+        return tree.find('./result').text
+    if cachedFetch(fwip, 'multi-vsys', fetch) == 'off':
+        return 'vsys1'
+    elif headless:
+        if vsys is None:
+            raise ValueError('the firewall is running in multi-vsys mode, but no vsys was given')
+        return vsys
+    else:
+        print('\n\nLooks like your firewall is running in multi-vsys mode...')
+        while True:
+            vsys = input('\nEnter the vsys number, or hit leave blank for the shared context: ')
+            if vsys == '':
+                return 'shared'
+            try:
+                return f'vsys{str(int(vsys))}'
+            except ValueError:
+                print("\nThat wasn't a number, try again...\n")
+
+
+# Parses the address entries out of the XML response chunks as they arrive, returning compact (name, type, value) tuples, and
+# records the time spent parsing when the run is instrumented. Raises ValueError with the device's message if the API call failed
+def parseAddrEntries(chunks):
+    entries, parseSeconds = readAddrEntries(chunks)
+    if runStats is not None:
+        addPhaseTime('xml parse (streamed)', parseSeconds)
+    return entries
+
+
+# Retrieves the address entries found at the xpath as compact (name, type, value) tuples, using the inventory cache
+def getAddrEntries(fwip, mainkey, xpath):
+    def fetch():
+        start = time.perf_counter()
+        with apiGet(f'https://{fwip}/api/?type=config&action=get&xpath={xpath}&key={mainkey}', stream=True) as r:
+            entries = parseAddrEntries(r.iter_content(chunk_size=65536))
+        putDownloadStats(fwip, xpath, len(entries), time.perf_counter() - start)
+        return entries
+    return cachedFetch(fwip, xpath, fetch)
+
+
+# Returns the XPath predicates that match the objects pending creation on the device, by name or by address value. XPath
+# compares text exactly, so the device's FQDN is folded to lower case first (the entered FQDN already is), to find it in any
+# case (such as Example.COM for example.com), as a full download does
+def lookupPredicates():
+    predicates = [f"@name='{name}'" for name in allObjNames]
+    for addrType, addrObjs in addrObjLists():
+        for addrObj in addrObjs:
+            values, field = [addrObj[1]], addrType
+            if addrType == 'ip-netmask':
+                host = normalizeAddr(addrType, addrObj[1])[1]
+                if '/' not in host:
+                    values = [host, f'{host}/32']  # A host address can be stored on the device with or without the /32 mask
+            elif addrType == 'ip-wildcard':
+                wildcard = '/'.join(normalizeAddr(addrType, addrObj[1])[1:])
+                if wildcard != addrObj[1]:
+                    values.append(wildcard)  # The address bits under the wildcard are ignored, so the device may have it without them
+            elif addrType == 'fqdn':
+                field = FQDN_LOWER
+            predicates += [f"{field}='{value}'" for value in values]
+    return predicates
+
+
+# Returns whether the scope should be checked with targeted lookups, rather than a full download of its address objects.
+# A full download is used when it's already cached (or there's nothing to look up), otherwise the lookup calls are compared
+# with the last measured download time (or the list size with --lookup-threshold)
+def useTargetedLookup(fwip, xpath, lookupBatches):
+    if not lookupBatches or isCached(fwip, xpath):
+        return False
+    if options['lookup-threshold']:
+        return len(allObjNames) < options['lookup-threshold']
+    stats = getDownloadStats(fwip, xpath)
+    if stats is None or apiLatency is None:
+        return len(allObjNames) < LOOKUP_THRESHOLD
+    return len(lookupBatches) * apiLatency < stats[1]
+
+
+# Retrieves only the address entries in the scope that match the lookup batches, falling back to a full download if the
+# device rejects the lookup
+def lookupAddrEntries(fwip, mainkey, xpath, lookupBatches):
+    entries = []
+    try:
+        for lookupBatch in lookupBatches:
+            with apiGet(f'https://{fwip}/api/?type=config&action=get&xpath={xpath}/entry[{lookupBatch}]&key={mainkey}', stream=True) as r:
+                entries += parseAddrEntries(r.iter_content(chunk_size=65536))
+    except ValueError:
+        return getAddrEntries(fwip, mainkey, xpath)
+    return entries
+
+
+# Retrieves the address entries in the scope that matter for the duplicate checks, with targeted lookups or a full download
+def getScopeAddrEntries(fwip, mainkey, xpath, lookupBatches):
+    if useTargetedLookup(fwip, xpath, lookupBatches):
+        return lookupAddrEntries(fwip, mainkey, xpath, lookupBatches)
+    return getAddrEntries(fwip, mainkey, xpath)
+
+
+# Returns the predicate batches for targeted lookups of the objects pending creation
+def getLookupBatches(fwip, mainkey, panoDG):
+    lookupCall_piece = f"https://{fwip}/api/?type=config&action=get&xpath=/config/devices/entry/device-group/entry[@name='{panoDG}']/address/entry[]&key={mainkey}"
+    return batchPredicates(lookupPredicates(), 5000 - len(lookupCall_piece) - 64)  # 64 leaves room for a longer parent device group name
+
+
+# Retrieves the names of all address objects visible to the Panorama device group or firewall that matter for the duplicate checks,
+# along with an index of their normalized values
+def getPanAddrObjs(fwip, mainkey, panoDG, fw_vsys):
+    addrObjs, addrValues = [], {}
+    lookupBatches = getLookupBatches(fwip, mainkey, panoDG)
+    if panoDG is not None:
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:  # The shared context, hierarchy, and each device group are independent reads, so they're fetched concurrently
+            sharedEntries = executor.submit(getScopeAddrEntries, fwip, mainkey, '/config/shared/address', lookupBatches)
+            dgEntries = []
+            if panoDG != 'Shared':
+                allDGs = [panoDG] + getParentDGs(fwip, mainkey, panoDG)
+                dgEntries = [executor.submit(getScopeAddrEntries, fwip, mainkey, f"/config/devices/entry/device-group/entry[@name='{dg}']/address", lookupBatches) for dg in allDGs]
+            indexAddrEntries(sharedEntries.result(), addrObjs, addrValues)  # Add all addresses from the shared context to the address list ##
+            for entries in dgEntries:
+                indexAddrEntries(entries.result(), addrObjs, addrValues)  # Add all addresses from the from all parent device groups to the address list ##
+    else:
+        if fw_vsys == 'shared':
+            fwAddrObjXpath = '/config/shared/address'
+        else:
+            fwAddrObjXpath = f"/config/devices/entry/vsys/entry[@name='{fw_vsys}']/address"
+        indexAddrEntries(getScopeAddrEntries(fwip, mainkey, fwAddrObjXpath, lookupBatches), addrObjs, addrValues)  # Add all addresses from the firewall to the address list ##
+    return addrObjs, addrValues
+
+
+# Removes the named objects from the object lists that are pending creation
+def removeAddrObjs(names):
+    global addrObj_ip, addrObj_fqdn, addrObj_range, addrObj_wildcard
+    names = set(names)
+    addrObj_ip = [addrObj for addrObj in addrObj_ip if addrObj[0] not in names]
+    addrObj_fqdn = [addrObj for addrObj in addrObj_fqdn if addrObj[0] not in names]
+    addrObj_range = [addrObj for addrObj in addrObj_range if addrObj[0] not in names]
+    addrObj_wildcard = [addrObj for addrObj in addrObj_wildcard if addrObj[0] not in names]
+
+
+# Returns the (type, address) of each object pending creation, keyed by name
+def pendingObjs():
+    return {addrObj[0]: (addrType, addrObj[1]) for addrType, addrObjs in addrObjLists() for addrObj in addrObjs}
+
+
+# Returns [name, address, existing name] for each object in the list whose address already exists on the PAN device under another name
+def objValueDups(addrValues):
+    return [[obj.name, obj.value, existingName] for obj, existingName in findValueDups(addrObjects(), addrValues)]
+
+
+# Prompts the user on how to handle objects whose address already exists under another name (unless an answer is given), then applies the choice
+def resolveValueDups(valueDups, answer=None):
+    global allObjNames
+    print(f'\n\nDuplicate addresses were found: {str(len(valueDups))} of your address objects have an address that already exists on the PAN device under another name...\n')
+    for name, addr, existingName in valueDups:
+        print(f'{name} ({addr}) -- already exists as {existingName}')
+    while True:
+        if answer is None:
+            answer = input('\n\nWould you like to [s]kip these objects, [r]euse the existing objects for group membership, or [c]reate them anyway? [S/r/c]  ')
+        if answer.lower() == 's' or answer == '':
+            removeAddrObjs([name for name, _, _ in valueDups])
+            skipped = set(name for name, _, _ in valueDups)
+            allObjNames = [name for name in allObjNames if name not in skipped]
+            break
+        elif answer.lower() == 'r':
+            removeAddrObjs([name for name, _, _ in valueDups])
+            existingNames = {name: existingName for name, _, existingName in valueDups}
+            reusedNames, seen = [], set()
+            for name in allObjNames:
+                name = existingNames.get(name, name)  # Swap in the existing name, keeping only the first use of each name
+                if name not in seen:
+                    seen.add(name)
+                    reusedNames.append(name)
+            allObjNames = reusedNames
+            break
+        elif answer.lower() == 'c':
+            print('\nOk, these address objects will be created anyway')
+            break
+        else:
+            answer = None
+            pause(.75)
+            print("\n\nThat wasn't an option, please try again with an 's', 'r', or 'c'...")
+    pause(.75)
+
+
+# Checks Panorama device group or firewall for address duplicates, by name and by address value, returning the lists of each
+# that were found, along with the name duplicates that already have the same address (with --sync, these are reported as
+# already in sync, rather than as duplicates). Objects in ignoreNames aren't counted as existing addresses
+def checkPanDups(fwip, mainkey, panoDG, fw_vsys, valueDupAnswer=None, ignoreNames=()):
+    addrObjs, addrValues = getPanAddrObjs(fwip, mainkey, panoDG, fw_vsys)
+    if ignoreNames:
+        ignoreNames = set(ignoreNames)
+        addrValues = {value: name for value, name in addrValues.items() if name not in ignoreNames}
+    duplicateList = findPanDups(allObjNames, addrObjs)
+    inSync = []
+    if options['sync'] and duplicateList:
+        pendingValues = {name: normalizeAddr(addrType, value) for name, (addrType, value) in pendingObjs().items()}
+        inSync = [name for name in duplicateList if addrValues.get(pendingValues.get(name)) == name]
+        if inSync:
+            print(f'\n\n{str(len(inSync))} of your address objects already exist on the PAN device with the same address, and are now in sync')
+            inSyncSet = set(inSync)
+            removeAddrObjs(inSync)
+            duplicateList = [name for name in duplicateList if name not in inSyncSet]
+    if duplicateList:
+        print(f'\n\nDuplicates were found: {str(len(duplicateList))} of your address objects that you provided already exists on the PAN device...\n')
+        print(*duplicateList, sep='\n')
+        print('\n\nPlease make note of these addresses, as you will need to make adjustments to the names for these entries,\nthen manually enter them, or re-run this script. These duplicate entries will automatically be removed in order to proceed.\n\n')
+        pause(.75)
+        removeAddrObjs(duplicateList)
+    valueDups = objValueDups(addrValues)
+    if valueDups:
+        resolveValueDups(valueDups, valueDupAnswer)
+    return duplicateList, valueDups, inSync
+
+
+# Presents user with option to add an address group
+def addGroupOption():
+    global addrGroupName
+    run = True
+    while run:
+        addrGroup_answer = input("\n\nOnce the address objects are added, would you like to add them to a group? [Y/n]  ")
+        if addrGroup_answer.lower() == 'y' or addrGroup_answer == '':
+            while True:
+                addrGroupName = input('\nEnter the name the group: ')
+                addrGroupName_r = re.match(r'^(?:([A-Za-z\d])|(([A-Za-z\d])([\w \.-]){0,61}([\w\.-])))$', addrGroupName)
+                if addrGroupName_r:
+                    run = False
+                    break
+                else:
+                    pause(.75)
+                    print("\n\nYour address group name does not comply with Palo Alto Networks name convention format\n\nThe name cannot contain more than 63 characters, and it must start with an alphanumeric character,\nwhile the remainder can contain underscores, hypens, periods, or spaces.\nAlso, the last character cannot be a space.\n\nPlease try again...\n")
+        elif addrGroup_answer.lower() == 'n':
+            print('\nOk, the address objects will be added without a group')
+            pause(.75)
+            break
+        else:
+            pause(.75)
+            print("\n\nThat wasn't an option, please try again with a 'y' or 'n'...")
+
+
+# Builds a string of elements to add the xpath in the API call for adding addresses to a group (by default, every object
+# name to the address group), and checks the length of the API call against the limit (the URL length for GET calls,
+# or the batch size for POST calls), yielding each batch as soon as it's full (a push builds them all up front, for its journal)
+def addrGroupBuilder(apiCall_piece, limit=5000, groupName=None, names=None):
+    budget = limit - len(apiCall_piece) - 6  # 6 is '-group' in the URL
+    return buildMembers(groupName or addrGroupName, allObjNames if names is None else names, budget)
+
+
+# Retrieves the address groups found at the xpath as {name: static members}, where dynamic groups have None, using the inventory cache
+def getAddrGroups(fwip, mainkey, xpath):
+    def fetch():
+        r = apiGet(f'https://{fwip}/api/?type=config&action=get&xpath={xpath}&key={mainkey}')
+        return addrGroupMembers(ET.fromstring(r.text).iterfind('./result/address-group/entry'))
+    return cachedFetch(fwip, xpath, fetch)
+
+
+# Reads the address group's current members once, including nested groups, and works out which names still need to be added.
+# When a group would go over --max-members, the rest of the names go into overflow groups ({group}-2, {group}-3, ...), which
+# are nested in the group so rules that use it still match every address. Returns the [(group name, members to add)] in push
+# order (overflow groups first, so they exist before they're nested), the number of names to add, the number already in the
+# group (and how many of those only through nested groups), the new overflow groups, and any that can't be nested as the group is full
+def planGroupMembers(fwip, mainkey, devType, panoDG, fw_vsys):
+    groupXpaths = [f'{getScopeXpath(devType, panoDG, fw_vsys)}/address-group']  # The target scope first, so its groups take precedence
+    if devType == 'pano' and panoDG != 'Shared':
+        groupXpaths += [f"/config/devices/entry/device-group/entry[@name='{dg}']/address-group" for dg in getParentDGs(fwip, mainkey, panoDG)]
+        groupXpaths.append('/config/shared/address-group')
+    with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+        scopeGroups = list(executor.map(lambda xpath: getAddrGroups(fwip, mainkey, xpath), groupXpaths))
+    groups = {}
+    for scope in scopeGroups:
+        for name, members in scope.items():
+            groups.setdefault(name, members)
+    targetGroups = scopeGroups[0]
+    if addrGroupName in targetGroups and targetGroups[addrGroupName] is None:
+        print(f'\n\nSorry, the {addrGroupName} address group is a dynamic group, so your address objects cannot be added to it as static members.\nNothing was pushed, please choose a static group and try again\n\nBye for now!\n\n\n')
+        exit()
+    family = [addrGroupName]
+    while f'{addrGroupName}-{len(family) + 1}' in targetGroups:
+        family.append(f'{addrGroupName}-{len(family) + 1}')
+    # A group of the same name in a parent device group or Shared isn't this group -- setting it here makes a new group that
+    # overrides the other one, so none of the other one's members are present (the parent scopes only expand nested groups)
+    present = set().union(*(expandGroup(group, groups) for group in family if group in targetGroups))
+    direct = set().union(*(targetGroups.get(group) or () for group in family))
+    names = list(dict.fromkeys(allObjNames))
+    missing = [name for name in names if name not in present]
+    presentCount = len(names) - len(missing)
+    nestedCount = len([name for name in names if name in present and name not in direct])
+    maxMembers = options['max-members'] or len(missing) + max((len(targetGroups.get(group) or ()) for group in family), default=0)
+    room = {group: max(maxMembers - len(targetGroups.get(group) or ()), 0) for group in family}
+    otherRoom = sum(room[group] for group in family[1:])
+    newCount = 0
+    while len(missing) > max(room[addrGroupName] - newCount, 0) + otherRoom + newCount * maxMembers:
+        newCount += 1  # Each new overflow group takes a slot in the main group, where it's nested
+    newGroups = [f'{addrGroupName}-{len(family) + i}' for i in range(1, newCount + 1)]
+    linked = newGroups[:room[addrGroupName]]
+    room[addrGroupName] -= len(linked)
+    room.update({group: maxMembers for group in newGroups})
+    plan, start = {}, 0
+    for group in family + newGroups:
+        plan[group], start = missing[start:start + room[group]], start + room[group]
+    plan[addrGroupName] += linked
+    order = newGroups + family[:0:-1] + [addrGroupName]
+    return {'plan': [(group, plan[group]) for group in order if plan[group]], 'added': len(missing), 'present': presentCount,
+            'nested': nestedCount, 'overflow': [group for group in family[1:] + newGroups if plan[group]], 'unlinked': newGroups[len(linked):]}
+
+
+# Builds a string of elements to add the xpath in the API call for adding addresses to Panorama/FW,
+# and checks the length of the API call against the limit (the URL length for GET calls, or the batch size for POST calls),
+# yielding each batch as soon as it's full (a push builds them all up front, for its journal)
+def elementBuilder(apiCall_piece, limit=5000):
+    return buildElements(addrObjects(), limit - len(apiCall_piece))
+
+
+# Returns the xpath of the Panorama device group, or firewall vsys, that the objects are added to
+def getScopeXpath(devType, panoDG, fw_vsys):
+    if devType == 'pano':
+        return scopeXpath(panoDG)
+    return scopeXpath(vsys=fw_vsys)
+
+
+# Returns the leading part of the API call that the elements are added to, and the length limit for the API call,
+# which is the URL length for GET calls, or the size of the element for POST calls
+def getBatchLimit(fwip, mainkey, xpath):
+    if options['post']:
+        return '', options['batch-size'] or 512000
+    return f"https://{fwip}/api/?type=config&action=set&xpath={xpath}&element=&key={mainkey}", options['batch-size'] or 5000
+
+
+# Sends a config API call with the action (set, edit, or delete), in the POST body when --post is used, or in the URL otherwise
+def apiConfig(fwip, mainkey, action, xpath, element=None):
+    params = {'type': 'config', 'action': action, 'xpath': xpath}
+    if element is not None:
+        params['element'] = element
+    params['key'] = mainkey
+    if options['post']:
+        return apiPost(f'https://{fwip}/api/', params)
+    return apiGet(f"https://{fwip}/api/?{'&'.join(f'{param}={value}' for param, value in params.items())}")
+
+
+# Returns the set API call as text, for showing the user which call failed, with the API key masked and a long element cut short
+def apiSetCall(fwip, xpath, element):
+    if len(element) > 2000:
+        element = f'{element[:2000]}... ({len(element) - 2000} more characters)'
+    if options['post']:
+        return f'POST https://{fwip}/api/ with type=config&action=set&xpath={xpath}&element={element}&key=*****'
+    return f'https://{fwip}/api/?type=config&action=set&xpath={xpath}&element={element}&key=*****'
+
+
+# Sends the set API call for one batch and checks the response, returning the error message if it failed, or None. Once
+# the batch is confirmed, onSent is called with its number (this runs on the worker threads, so responses are checked while
+# the next batches are being sent)
+def pushBatch(fwip, mainkey, xpath, batchNum, batch, onSent=None):
+    message = configCall(fwip, mainkey, 'set', xpath, batch)
+    if message is None and onSent is not None:
+        onSent(batchNum)
+    return message
+
+
+# Sends a config API call and checks the response, returning the error message if it failed, or None. Transient failures
+# (a garbled response, or a PAN-OS internal error or session timeout) are retried --retries times (see retryConfigCall)
+def configCall(fwip, mainkey, action, xpath, element=None):
+    return retryConfigCall(lambda: apiConfig(fwip, mainkey, action, xpath, element), options['retries'], mainkey)
+
+
+# Sends the (batch number, batch) pairs as they're produced, with at most --in-flight calls outstanding at once. On the first
+# failure, no more batches are produced or sent, and (batch number, batch, error message) is returned, otherwise None
+def pushBatches(fwip, mainkey, xpath, batches, onSent=None):
+    return sendBatches(lambda batchNum, batch: pushBatch(fwip, mainkey, xpath, batchNum, batch, onSent), batches, options['in-flight'])
+
+
+# The asyncio version of pushBatches, used with --asyncio, where a semaphore bounds the calls in flight
+async def pushBatchesAsync(fwip, mainkey, xpath, batches, onSent=None):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(options['in-flight'])
+    failures, tasks = [], []
+
+    async def send(batchNum, batch):
+        try:
+            message = await loop.run_in_executor(executor, pushBatch, fwip, mainkey, xpath, batchNum, batch, onSent)
+        finally:
+            semaphore.release()
+        if message is not None:
+            failures.append((batchNum, batch, message))
+
+    with ThreadPoolExecutor(max_workers=options['in-flight']) as executor:
+        for batchNum, batch in batches:
+            await semaphore.acquire()
+            if failures:
+                semaphore.release()
+                break
+            tasks.append(loop.create_task(send(batchNum, batch)))
+        await asyncio.gather(*tasks)
+    return min(failures) if failures else None
+
+
+# Pushes the (batch number, batch) pairs with the threaded or asyncio pipeline
+def runPush(fwip, mainkey, xpath, batches, onSent=None):
+    if options['asyncio']:
+        return asyncio.run(pushBatchesAsync(fwip, mainkey, xpath, batches, onSent))
+    return pushBatches(fwip, mainkey, xpath, batches, onSent)
+
+
+# Plans the API calls for address object and group creation, and records them in a new journal before any are sent,
+# then pushes them, returning the number of names added to the group and already in it
+def apiPush(fwip, mainkey, devType, panoDG, fw_vsys):
+    print('\n\nTime to push the address objects...')
+    pause(.75)
+    if devType == 'pano':
+        confirm('\nPress Enter to push API calls to Panorama (or CTRL+C to kill the script)... ')
+    else:
+        confirm('\nPress Enter to push API calls to the firewall (or CTRL+C to kill the script)... ')
+    addrXpath = f'{getScopeXpath(devType, panoDG, fw_vsys)}/address'
+    apiCall_piece, limit = getBatchLimit(fwip, mainkey, addrXpath)
+    groupPlan = planGroupMembers(fwip, mainkey, devType, panoDG, fw_vsys) if addrGroupName else None
+    journal = startJournal(fwip, devType, panoDG, fw_vsys)
+    addJournalStage(journal, 'objects', addrXpath, elementBuilder(apiCall_piece, limit))
+    if groupPlan is not None:
+        journal['group plan'] = {key: value for key, value in groupPlan.items() if key != 'plan'}
+        writeJournal(journal, {'group plan': journal['group plan']})
+        for groupName, members in groupPlan['plan']:
+            addJournalStage(journal, groupName, f'{addrXpath}-group', addrGroupBuilder(apiCall_piece, limit, groupName, members))
+    writeJournal(journal, {'planned': len(journal['stages'])})
+    return pushJournal(fwip, mainkey, journal)
+
+
+# Sends the batches in the journal that haven't been confirmed, stage by stage -- the address objects, then the members
+# of each group, where the overflow groups come before the group they're nested in. Returns the number of names added
+# to the group and already in it
+def pushJournal(fwip, mainkey, journal):
+    pushStage(fwip, mainkey, journal, 0, 'create your address objects')
+    groupName, groupPlan = journal['header']['group'], journal['group plan']
+    if groupPlan is None:
+        finishJournal(journal)
+        print('\n\n\nCongrats! You successfully created all of your address objects')
+        return 0, 0
+    pause(.5)
+    print(f"\n\n\nCongrats! All your address objects were successfully created\n\n\n\nNow it's time to add the address objects to the {groupName} address group...")
+    if groupPlan['present']:
+        nested = f" ({str(groupPlan['nested'])} through nested groups)" if groupPlan['nested'] else ''
+        print(f"\n{str(groupPlan['present'])} of your address objects are already in the {groupName} address group{nested}, so they will not be sent again")
+    if groupPlan['overflow']:
+        print(f"\nAddress groups can hold {str(options['max-members'])} members, so some objects will go in these overflow groups -- {', '.join(groupPlan['overflow'])}")
+    if groupPlan['unlinked']:
+        print(f"\nThe {groupName} address group is full, so these overflow groups cannot be nested in it, and will need to be added to your rules as well -- {', '.join(groupPlan['unlinked'])}")
+    if len(journal['stages']) > 1:
+        pause(.5)
+        confirm('\nPress Enter to push API calls to Panorama/firewall (or CTRL+C to kill the script)... ')
+    for stageNum in range(1, len(journal['stages'])):
+        pushStage(fwip, mainkey, journal, stageNum, f"add your address objects to the {journal['stages'][stageNum]['name']} address group")
+    finishJournal(journal)
+    pause(.5)
+    print(f"\n\n\nCongrats! You successfully added {str(groupPlan['added'])} address objects to the {groupName} address group, and {str(groupPlan['present'])} were already in it")
+    return groupPlan['added'], groupPlan['present']
+
+
+# Sends the batches of the journal stage that haven't been confirmed. If a batch fails, the journal is kept, so the push can
+# be resumed from that batch with --resume once the issue is fixed, and the script stops after showing the failed call
+def pushStage(fwip, mainkey, journal, stageNum, action):
+    stage = journal['stages'][stageNum]
+    batches = ((batchNum, batch) for batchNum, batch in enumerate(stage['batches'], 1) if (stageNum, batchNum) not in journal['acked'])
+    failure = runPush(fwip, mainkey, stage['xpath'], batches, lambda batchNum: writeJournal(journal, {'ack': [stageNum, batchNum]}))
+    if failure:
+        batchNum, element, message = failure
+        journal['file'].close()
+        pause(.75)
+        print(f"\n\nSorry, something went wrong while attempting to {action}. Batch {batchNum} of {len(stage['batches'])} failed with -- {message}\n\nBelow is the faulty API call...\n\n{apiSetCall(fwip, stage['xpath'], element)}\n\n\nThe batches that were confirmed are recorded in {journal['path']}, so once you fix the issue, run the script with --resume to pick up where it stopped\n\nBye for now!\n\n\n")
+        exit()
+
+
+# Returns the path of the push journal for the device group or vsys on the device
+def journalPath(fwip, scopeXpath):
+    return os.path.join(options['cache-dir'], 'journal', re.sub(r'[^\w.-]+', '_', f'{fwip}{scopeXpath}').strip('_') + '.jsonl')
+
+
+# Starts a new push journal for the device group or vsys, replacing any unfinished journal of an earlier push to it. The journal
+# is a JSON line file -- a header, a line for each stage with its xpath and batches, the group plan, a line once every stage
+# is planned, then a line for each batch as it's confirmed
+def startJournal(fwip, devType, panoDG, fw_vsys):
+    scopeXpath = getScopeXpath(devType, panoDG, fw_vsys)
+    path = journalPath(fwip, scopeXpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        print(f'\nAn unfinished push to {panoDG or fw_vsys} was found, and will be replaced by this one')
+    journal = {'path': path, 'file': open(path, 'w'), 'lock': threading.Lock(), 'stages': [], 'acked': set(), 'group plan': None,
+               'header': {'device': fwip, 'device type': devType, 'scope': panoDG or fw_vsys, 'xpath': scopeXpath, 'group': addrGroupName,
+                          'started': time.strftime('%Y-%m-%d %H:%M:%S')}}
+    writeJournal(journal, {'journal': journal['header']})
+    return journal
+
+
+# Appends the record to the journal as a JSON line, flushing it so it survives the script being stopped
+def writeJournal(journal, record):
+    with journal['lock']:
+        journal['file'].write(json.dumps(record) + '\n')
+        journal['file'].flush()
+
+
+# Builds every batch of a stage of the push, and records them in the journal
+def addJournalStage(journal, name, xpath, batches):
+    stage = {'name': name, 'xpath': xpath, 'batches': list(batches)}
+    journal['stages'].append(stage)
+    writeJournal(journal, {'stage': stage})
+
+
+# Reads a push journal, returning None if it can't be read, or if it was stopped before every stage was planned
+# (a line cut short by the script being stopped is ignored)
+def loadJournal(path):
+    journal = {'path': path, 'lock': threading.Lock(), 'stages': [], 'acked': set(), 'group plan': None, 'header': None}
+    planned = False
+    try:
+        with open(path) as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if 'journal' in record:
+                    journal['header'] = record['journal']
+                elif 'stage' in record:
+                    journal['stages'].append(record['stage'])
+                elif 'group plan' in record:
+                    journal['group plan'] = record['group plan']
+                elif 'planned' in record:
+                    planned = True
+                elif 'ack' in record:
+                    journal['acked'].add(tuple(record['ack']))
+    except OSError:
+        return None
+    return journal if planned and journal['header'] else None
+
+
+# Returns the unfinished push journals in the cache directory, for the device if one is given
+def findJournals(fwip=None):
+    journalDir = os.path.join(options['cache-dir'], 'journal')
+    journals = [loadJournal(os.path.join(journalDir, name)) for name in sorted(os.listdir(journalDir))] if os.path.isdir(journalDir) else []
+    return [journal for journal in journals if journal is not None and fwip in (None, journal['header']['device'])]
+
+
+# Opens the loaded journal to record the batches confirmed as the push resumes
+def reopenJournal(journal):
+    journal['file'] = open(journal['path'], 'a')
+    return journal
+
+
+# Closes the journal of a push that finished, and removes it, as there's nothing left to resume
+def finishJournal(journal):
+    journal['file'].close()
+    try:
+        os.remove(journal['path'])
+    except OSError:
+        pass
+
+
+# Returns the number of batches in the journal, and how many of them were confirmed
+def journalProgress(journal):
+    return sum(len(stage['batches']) for stage in journal['stages']), len(journal['acked'])
+
+
+# Lets the user choose which unfinished push to resume, then logs in to its device and sends the batches that weren't
+# confirmed, without reading the inventory again
+def resumeInteractive():
+    journals = findJournals()
+    if not journals:
+        print(f"\n\nThere is no unfinished push to resume in {os.path.join(options['cache-dir'], 'journal')}\n\n")
+        exit()
+    journal = journals[0]
+    if len(journals) > 1:
+        print('\n\nThese pushes were not finished:\n')
+        for i, candidate in enumerate(journals, 1):
+            total, acked = journalProgress(candidate)
+            header = candidate['header']
+            print(f"{i}) {header['device']} {header['scope']} -- {acked} of {total} batches sent, started {header['started']}")
+        while True:
+            choice = input('\nEnter the number of the push to resume: ')
+            if choice.isdigit() and 1 <= int(choice) <= len(journals):
+                journal = journals[int(choice) - 1]
+                break
+            print("\nThat wasn't an option, please try again...")
+    header = journal['header']
+    total, acked = journalProgress(journal)
+    print(f"\n\nResuming the push to {header['device']} {header['scope']}, where {acked} of {total} batches were already sent...\n")
+    mainkey = getkey(header['device'])
+    pushJournal(header['device'], mainkey, reopenJournal(journal))
+    clearCache(header['device'])
+    print('\n\n\nHave a fantastic day!!!\n\n\n')
+    exit()
+
+
+# Returns the path of the sync state file for the device group or vsys on the device
+def syncStatePath(fwip, scopeXpath):
+    return os.path.join(options['cache-dir'], 'sync', re.sub(r'[^\w.-]+', '_', f'{fwip}{scopeXpath}').strip('_') + '.json')
+
+
+# Reads the sync state of a device group or vsys -- the group the objects were added to, and the fingerprint (the normalized
+# type and address) of each object synced so far, keyed by name
+def loadSyncState(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {'group': None, 'objects': {}}
+
+
+# Writes the sync state, replacing the old file only once the new one is complete
+def saveSyncState(path, state):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as file:
+        json.dump(state, file)
+    os.replace(f'{path}.tmp', path)
+
+
+# Compares the list with the last sync of the device group or vsys, and narrows the objects pending creation down to the ones that
+# were added or changed since then. Objects whose type changed are taken out as well, as a set call can't replace the type,
+# so they're edited once the push is done. Returns the sync details that are needed to finish the sync
+def startSync(fwip, devType, panoDG, fw_vsys):
+    global allObjNames, addrGroupName
+    path = syncStatePath(fwip, getScopeXpath(devType, panoDG, fw_vsys))
+    state = loadSyncState(path)
+    synced = state['objects']
+    pending = pendingObjs()
+    fingerprints = {name: list(normalizeAddr(addrType, value)) for name, (addrType, value) in pending.items()}
+    added = [name for name in fingerprints if name not in synced]
+    changed = [name for name in fingerprints if name in synced and fingerprints[name] != synced[name]]
+    retyped = [[name, *pending[name]] for name in changed if fingerprints[name][0] != synced[name][0]]
+    removed = [name for name in synced if name not in fingerprints]
+    unchanged = set(fingerprints) - set(added) - set(changed)
+    removeAddrObjs(unchanged.union(name for name, _, _ in retyped))
+    allObjNames = added
+    if addrGroupName is None and not headless:
+        addrGroupName = state['group']  # Interactive syncs keep adding to the group from the last sync
+    print(f'\n\n...Compared with the last sync: {str(len(added))} added, {str(len(changed))} changed, {str(len(removed))} removed, and {str(len(unchanged))} unchanged...\n')
+    if removed and not options['sync-delete']:
+        print(f'The {str(len(removed))} removed objects will be left on the PAN device, use --sync-delete to delete them')
+    return {'path': path, 'state': state, 'fingerprints': fingerprints, 'added': added, 'changed': changed, 'retyped': retyped,
+            'removed': removed, 'pushed': [], 'inSync': [], 'deleted': []}
+
+
+# Returns whether the sync has anything to change on the device
+def syncPending(sync):
+    return bool(sync['added'] or sync['changed'] or (sync['removed'] and options['sync-delete']) or
+                (addrGroupName is not None and addrGroupName != sync['state']['group']))
+
+
+# Records the objects about to be pushed, and when the objects are going into a different group than the last sync,
+# adds every object that was already synced to the group as well
+def prepareSyncPush(sync, inSync):
+    global allObjNames
+    sync['inSync'] = inSync
+    sync['pushed'] = list(pendingObjs())
+    if addrGroupName and addrGroupName != sync['state']['group']:
+        members = [name for name in sync['fingerprints'] if name in sync['state']['objects']] + inSync + allObjNames
+        allObjNames = list(dict.fromkeys(members))  # Keeps the first use of each name, in order
+
+
+# Removes the objects from the address group (and its overflow groups), then deletes them, in batches of "or" predicates
+# that fit in the API call URL, returning the names that were deleted
+def deleteAddrObjs(fwip, mainkey, addrXpath, groupName, names):
+    pause(.75)
+    confirm(f'\nPress Enter to delete the {str(len(names))} address objects that were removed from the list (or CTRL+C to kill the script)... ')
+    if groupName:
+        groups = getAddrGroups(fwip, mainkey, f'{addrXpath}-group')
+        family = [groupName]
+        while f'{groupName}-{len(family) + 1}' in groups:
+            family.append(f'{groupName}-{len(family) + 1}')
+        for group in family:
+            members = set(groups.get(group) or ())
+            memberXpath = f"{addrXpath}-group/entry[@name='{group}']/static/member"
+            budget = 5000 - len(f'https://{fwip}/api/?type=config&action=delete&xpath={memberXpath}[]&key={mainkey}')
+            for batch in batchPredicates([f"text()='{name}'" for name in names if name in members], budget):
+                message = configCall(fwip, mainkey, 'delete', f'{memberXpath}[{batch}]')
+                if message is not None:
+                    print(f'\n\nThe removed objects could not be taken out of the {group} address group, so they were not deleted -- {message}')
+                    return []
+    deleted = []
+    budget = 5000 - len(f'https://{fwip}/api/?type=config&action=delete&xpath={addrXpath}/entry[]&key={mainkey}')
+    for batch in batchPredicates([f"@name='{name}'" for name in names], budget):
+        message = configCall(fwip, mainkey, 'delete', f'{addrXpath}/entry[{batch}]')
+        if message is None:
+            deleted += re.findall(r"@name='([^']*)'", batch)
+        else:
+            print(f'\n\nSome of the removed objects could not be deleted (they may still be in use) -- {message}')
+    print(f'\n\n{str(len(deleted))} of the {str(len(names))} removed address objects were deleted')
+    return deleted
+
+
+# Edits the objects whose type changed, deletes the removed objects with --sync-delete, then saves the new sync state.
+# Only objects known to be on the PAN device with their current address are recorded as synced
+def finishSync(fwip, mainkey, devType, panoDG, fw_vsys, sync):
+    addrXpath = f'{getScopeXpath(devType, panoDG, fw_vsys)}/address'
+    state = sync['state']
+    synced = state['objects']
+    for name in sync['pushed'] + sync['inSync']:
+        synced[name] = sync['fingerprints'][name]
+    for name, addrType, value in sync['retyped']:
+        message = configCall(fwip, mainkey, 'edit', f"{addrXpath}/entry[@name='{name}']", f"<entry name='{name}'><{addrType}>{value}</{addrType}></entry>")
+        if message is None:
+            synced[name] = sync['fingerprints'][name]
+        else:
+            print(f'\n\nThe type of {name} could not be changed to {addrType} -- {message}')
+    if sync['removed'] and options['sync-delete']:
+        sync['deleted'] = deleteAddrObjs(fwip, mainkey, addrXpath, state['group'], sync['removed'])
+        for name in sync['deleted']:
+            del synced[name]
+    state['group'] = addrGroupName or state['group']
+    saveSyncState(sync['path'], state)
+
+
+# Reads the list of targets from the JSON manifest, either a list of targets or {"defaults": {...}, "targets": [...]}, where each
+# target has a "device" and a CSV "file", along with a "device-group" for Panorama, or a "vsys" for a multi-vsys firewall, and
+# optionally a "group", "value-dups" (skip, reuse, or create), and "keyfile". Relative paths are read from the manifest's directory
+def loadManifest(manifestFile):
+    with open(manifestFile, 'r', encoding='utf-8') as file:
+        manifest = json.load(file)
+    defaults, targets = ({}, manifest) if isinstance(manifest, list) else (manifest.get('defaults', {}), manifest.get('targets'))
+    if not isinstance(targets, list) or not targets:
+        raise ValueError('the manifest has no targets')
+    manifestDir = os.path.dirname(os.path.abspath(manifestFile))
+    loaded = []
+    for index, target in enumerate(targets, 1):
+        target = {**defaults, **target}
+        if not target.get('device') or not target.get('file'):
+            raise ValueError(f'target {index} needs both a "device" and a "file"')
+        if target.get('group') and not addrName_re.match(target['group']):
+            raise ValueError(f'target {index} has a group name that does not comply with the Palo Alto Networks naming convention')
+        if target.setdefault('value-dups', 'skip') not in VALUE_DUP_CHOICES:
+            raise ValueError(f'target {index} has a "value-dups" that is not one of {", ".join(VALUE_DUP_CHOICES)}')
+        for key in ('file', 'keyfile'):
+            if target.get(key):
+                target[key] = os.path.join(manifestDir, os.path.expanduser(target[key]))
+        loaded.append(target)
+    return loaded
+
+
+# Returns the API key for a manifest run, read from the keyfile, or else the PANOS_API_KEY environment variable
+def getManifestKey(keyfile=None):
+    if keyfile:
+        with open(keyfile, 'r', encoding='utf-8') as file:
+            return file.read().strip()
+    return os.environ.get(API_KEY_ENV, '').strip()
+
+
+# Checks that the device accepts the API key, with a small op call
+def checkKey(fwip, mainkey):
+    r = apiGet(f'https://{fwip}/api/?type=op&cmd=<check><pending-changes></pending-changes></check>&key={mainkey}')
+    try:
+        return ET.fromstring(r.text).get('status') == 'success'
+    except ET.ParseError:
+        return False
+
+
+# Runs the whole import for one manifest target without prompting, returning its result summary and captured output.
+# Each target runs in its own worker process, so the module's globals belong to that target alone
+def runTarget(target, targetOptions, mainkey):
+    global addrObj_ip, addrObj_fqdn, addrObj_range, addrObj_wildcard, allObjNames, addrGroupName, headless
+    options.update(targetOptions)
+    headless = True
+    addrObj_ip, addrObj_fqdn, addrObj_range, addrObj_wildcard, allObjNames, addrGroupName = [], [], [], [], [], target.get('group')
+    runCache.clear()  # Worker processes are reused, and an earlier target that stopped part way may have left its inventory behind
+    fwip = target['device']
+    summary = {'device': fwip, 'scope': target.get('device-group') or target.get('vsys') or '', 'status': 'failed', 'created': 0,
+               'changed': 0, 'deleted': 0, 'name dups': 0, 'value dups': 0, 'group members': 0, 'already members': 0, 'seconds': 0.0,
+               'error': ''}
+    output = io.StringIO()
+    start = time.perf_counter()
+    if options['report'] or options['profile']:
+        startStats()
+    with redirect_stdout(output):
+        try:
+            journal = findTargetJournal(fwip, target) if options['resume'] else None
+            if journal is not None:
+                resumeTarget(fwip, mainkey, journal, summary)
+            else:
+                importTarget(fwip, mainkey, target, summary)
+            summary['status'] = 'ok'
+        except SystemExit:
+            summary['error'] = 'stopped, see the output above'
+        except Exception as e:  # Any failure stops only this target, and is reported in its summary
+            summary['error'] = str(e) or type(e).__name__
+    summary['seconds'] = round(time.perf_counter() - start, 2)
+    if runStats is not None:
+        targetName = re.sub(r'[^\w.-]+', '_', f"{fwip}_{summary['scope'] or ''}")
+        summary['stats'] = stopStats(f"{options['profile']}.{targetName}" if options['profile'] else None)
+    summary['error'] = summary['error'].replace(mainkey, '*****')  # Request errors include the URL, which has the key in it
+    return summary, output.getvalue().replace(mainkey, '*****')
+
+
+# Imports the target's CSV file headless, filling in the target's summary as it goes
+def importTarget(fwip, mainkey, target, summary):
+    global configVersion
+    with timedPhase('input'):
+        addrObjBuilder(*aggregateAddrs(*sortAddrRecords(csvRecords(target['file']), [sys.argv[0], target['file']])))
+        checkListDups()
+    with timedPhase('login'):
+        if not checkKey(fwip, mainkey):
+            raise ValueError('the device did not accept the API key')
+    with timedPhase('device info'):
+        configVersion = getConfigVersion(fwip, mainkey)
+        devType = getDevType(fwip, mainkey)
+        panoDG, fw_vsys = None, None
+        if devType == 'pano':
+            panoDG = getDG(fwip, mainkey, target.get('device-group'))
+        else:
+            fw_vsys = check_vsys(fwip, mainkey, target.get('vsys'))
+    summary['scope'] = panoDG or fw_vsys
+    with timedPhase('sync state'):
+        sync = startSync(fwip, devType, panoDG, fw_vsys) if options['sync'] else None
+    if sync is None or syncPending(sync):
+        ignoreNames = sync['removed'] if sync is not None and options['sync-delete'] else ()
+        with timedPhase('duplicate checks'):
+            duplicateList, valueDups, inSync = checkPanDups(fwip, mainkey, panoDG, fw_vsys, target['value-dups'][0], ignoreNames)
+        summary['name dups'], summary['value dups'] = len(duplicateList), len(valueDups)
+        if sync is not None:
+            prepareSyncPush(sync, inSync)
+        pending = pendingObjs()
+        with timedPhase('push'):
+            summary['group members'], summary['already members'] = apiPush(fwip, mainkey, devType, panoDG, fw_vsys)
+        if sync is not None:
+            with timedPhase('sync finish'):
+                finishSync(fwip, mainkey, devType, panoDG, fw_vsys, sync)
+            summary['changed'], summary['deleted'] = len(sync['changed']), len(sync['deleted'])
+        clearCache(fwip)
+        summary['created'] = len(set(pending).difference(sync['changed'] if sync is not None else ()))
+
+
+# Resumes the target's unfinished push from its journal, without reading the inventory again
+def resumeTarget(fwip, mainkey, journal, summary):
+    summary['scope'] = journal['header']['scope']
+    summary['created'] = sum(batch.count('<entry ') for batchNum, batch in enumerate(journal['stages'][0]['batches'], 1) if (0, batchNum) not in journal['acked'])
+    with timedPhase('login'):
+        if not checkKey(fwip, mainkey):
+            raise ValueError('the device did not accept the API key')
+    with timedPhase('push'):
+        summary['group members'], summary['already members'] = pushJournal(fwip, mainkey, reopenJournal(journal))
+    clearCache(fwip)
+
+
+# Returns the unfinished push journal for the manifest target, or None if there isn't exactly one for its device and scope
+def findTargetJournal(fwip, target):
+    scope = target.get('device-group') or target.get('vsys')
+    journals = [journal for journal in findJournals(fwip) if scope in (None, journal['header']['scope'])]
+    return journals[0] if len(journals) == 1 else None
+
+
+# Runs every target in the manifest, --parallel targets at a time, then prints the result summary of each target.
+# The output of a target is only printed when it fails
+def runManifest(manifestFile):
+    try:
+        targets = loadManifest(manifestFile)
+        mainkey = getManifestKey(options['keyfile'])
+        targetKeys = [getManifestKey(target['keyfile']) if target.get('keyfile') else mainkey for target in targets]
+    except (OSError, ValueError) as e:
+        print(f'\n\nThere was a problem reading the manifest -- {e}\n\n')
+        exit(1)
+    if not all(targetKeys):
+        print(f'\n\nNo API key was found, please set the {API_KEY_ENV} environment variable, or use the --keyfile option\n\n')
+        exit(1)
+    print(f'\n\nRunning {len(targets)} targets, {options["parallel"]} at a time...\n')
+    start = time.perf_counter()
+    summaries = [None] * len(targets)
+    with ProcessPoolExecutor(max_workers=options['parallel']) as executor:
+        futures = {executor.submit(runTarget, target, options, targetKey): index for index, (target, targetKey) in enumerate(zip(targets, targetKeys))}
+        for future in as_completed(futures):
+            summary, output = future.result()
+            summaries[futures[future]] = summary  # Kept in manifest order for the summary table
+            print(f"{summary['device']} {summary['scope']} -- {summary['status']} in {summary['seconds']}s")
+            if summary['status'] != 'ok':
+                print(f"\n{'-' * 125}\n{output.strip()}\n{'-' * 125}\n")
+    headers = ['device', 'scope', 'status', 'created', 'changed', 'deleted', 'name dups', 'value dups', 'group members', 'already members', 'seconds',
+               'error']
+    print('\n')
+    printTable(headers, [[summary[header] for header in headers] for summary in summaries])
+    if options['report'] or options['profile']:
+        reportManifest(summaries, time.perf_counter() - start)
+    failed = sum(summary['status'] != 'ok' for summary in summaries)
+    print(f'\n\n{len(summaries) - failed} of {len(summaries)} targets succeeded\n\n')
+    exit(1 if failed else 0)
+
+
+# Prints the summary of the phases and API calls of every manifest target, and writes the report with --report
+def reportManifest(summaries, seconds):
+    targets = [dict(summary['stats'], device=summary['device'], scope=summary['scope'], status=summary['status']) for summary in summaries if 'stats' in summary]
+    phases = {}
+    for target in targets:
+        for name, phaseSeconds in target['phases'].items():
+            phases[name] = round(phases.get(name, 0.0) + phaseSeconds, 4)
+    printStats({'seconds': round(seconds, 3), 'phases': phases, 'calls': callTotals([record for target in targets for record in target['requests']])})
+    if options['profile']:
+        print(f"\nThe profile of each target was saved to {options['profile']}.<device>_<scope>")
+    if options['report']:
+        try:
+            writeReport(options['report'], {'seconds': round(seconds, 3), 'phases': phases, 'targets': targets})
+            print(f"\nThe run report was written to {options['report']}")
+        except OSError as e:
+            print(f'\nThe run report could not be written -- {e}')
+
+
+# Loads the device group hierarchy, address objects, and address groups from a saved config export into the run cache, in the
+# same form they're read from the device, so the device checks can run offline. The export can be a saved running config,
+# or the response to a 'show config' API call. For Panorama, the hierarchy comes from the export's readonly section
+def loadConfigExport(fwip, configFile):
+    root = ET.parse(configFile).getroot()
+    config = root if root.tag == 'config' else root.find('.//config')
+    if config is None:
+        raise ValueError(f'{configFile} is not a PAN-OS config export')
+    deviceGroups = config.findall('./devices/entry/device-group/entry')
+    vsysList = config.findall('./devices/entry/vsys/entry')
+    runCache[(fwip, 'device-groups')] = [dg.get('name') for dg in deviceGroups]
+    runCache[(fwip, 'multi-vsys')] = 'on' if len(vsysList) > 1 else 'off'
+    parents = {dg.get('name'): dg.findtext('parent-dg') for dg in config.iterfind('./readonly/devices/entry/device-group/entry')}
+    scopes = [('/config/shared', config.find('shared'))]
+    scopes += [(f"/config/devices/entry/device-group/entry[@name='{dg.get('name')}']", dg) for dg in deviceGroups]
+    scopes += [(f"/config/devices/entry/vsys/entry[@name='{vsys.get('name')}']", vsys) for vsys in vsysList]
+    for xpath, scope in scopes:
+        scope = ET.Element('empty') if scope is None else scope
+        runCache[(fwip, f'{xpath}/address')] = [addrEntryTuple(entry) for entry in scope.iterfind('./address/entry')]
+        runCache[(fwip, f'{xpath}/address-group')] = addrGroupMembers(scope.iterfind('./address-group/entry'))
+    for dg in deviceGroups:
+        parentDGs, parent = [], parents.get(dg.get('name'))
+        while parent and parent not in parentDGs:
+            parentDGs.append(parent)
+            parent = parents.get(parent)
+        runCache[(fwip, f"parents:{dg.get('name')}")] = parentDGs
+
+
+# Returns the number of read calls that a live run is estimated to send before the push -- the API key, the config version,
+# the device group list, the hierarchy or multi-vsys check, the address objects of each scope (a full download, or
+# targeted lookups for small imports), and the address groups of each scope when a group is used
+def estimateReads(fwip, mainkey, devType, panoDG, lookupBatches):
+    scopes = 1 if devType == 'fw' or panoDG == 'Shared' else 2 + len(getParentDGs(fwip, mainkey, panoDG))
+    reads = 4 + (0 if panoDG == 'Shared' else 1)
+    reads += scopes * (len(lookupBatches) if len(allObjNames) < LOOKUP_THRESHOLD else 1)
+    return reads + (scopes if addrGroupName else 0)
+
+
+# Returns the size and object count of a planned set call, where the size is the URL length for GET calls, or the
+# form-encoded body for POST calls
+def batchSummary(fwip, mainkey, xpath, batch, objects):
+    if options['post']:
+        size = len(urlencode({'type': 'config', 'action': 'set', 'xpath': xpath, 'element': batch, 'key': mainkey}))
+    else:
+        size = len(f'https://{fwip}/api/?type=config&action=set&xpath={xpath}&element={batch}&key={mainkey}')
+    return {'xpath': xpath, 'objects': objects, 'element bytes': len(batch), 'call bytes': size}
+
+
+# Builds the set calls that apiPush would send, without sending them, returning the summary of each batch, and the group plan
+def planPush(fwip, mainkey, devType, panoDG, fw_vsys):
+    addrXpath = f'{getScopeXpath(devType, panoDG, fw_vsys)}/address'
+    apiCall_piece, limit = getBatchLimit(fwip, mainkey, addrXpath)
+    batches = [batchSummary(fwip, mainkey, addrXpath, batch, batch.count('<entry ')) for batch in elementBuilder(apiCall_piece, limit)]
+    groupPlan = None
+    if addrGroupName:
+        groupPlan = planGroupMembers(fwip, mainkey, devType, panoDG, fw_vsys)
+        for groupName, members in groupPlan['plan']:
+            batches += [batchSummary(fwip, mainkey, f'{addrXpath}-group', batch, batch.count('<member>'))
+                        for batch in addrGroupBuilder(apiCall_piece, limit, groupName, members)]
+        groupPlan = {key: value for key, value in groupPlan.items() if key != 'plan'}
+        groupPlan['name'] = addrGroupName
+    return batches, groupPlan
+
+
+# Plans the import of the CSV file offline, against the config export given with --config, then prints the plan as JSON --
+# the set calls in their batches, the number of calls a live run is estimated to send, and the time each stage took.
+# Messages go to stderr, so only the plan is printed to stdout. Exits with status 1 if the list has invalid entries,
+# duplicate names, or can't be planned
+def runDryRun(argv):
+    global headless, configVersion, addrGroupName
+    if len(argv) < 2 or not options['config']:
+        print('\n\nA dry run needs a CSV file and a config export (--config), please check the usage and try again...\n\n')
+        exit(1)
+    headless, configVersion, addrGroupName = True, None, options['group']
+    options['lookup-threshold'] = 0  # The inventory is in the run cache, so targeted lookups are never used
+    fwip, mainkey = options['device'] or 'localhost', DRY_RUN_KEY
+    plan = {'valid': True, 'file': argv[1], 'config': options['config'], 'device': fwip}
+    seconds = {}
+    start = time.perf_counter()
+    with redirect_stdout(sys.stderr):
+        try:
+            loadConfigExport(fwip, options['config'])
+            seconds['config export'] = time.perf_counter() - start
+            records, invalid = [], []
+            for entry, record in csvRecords(argv[1]):
+                if record is None:
+                    invalid.append(entry)
+                else:
+                    records.append(record)
+            plan['entries'], plan['invalid'], plan['invalid entries'] = len(records), len(invalid), invalid[:100]
+            plan['valid'] = not invalid
+            addrObjBuilder(*aggregateAddrs(*sortAddrRecords(((None, record) for record in records), argv)))
+            checkListDups()
+            if options['aggregate']:
+                plan['aggregated'] = {'entries': mergedEntries(), 'objects': len(addrCoverage)}
+            seconds['parse'] = time.perf_counter() - start - sum(seconds.values())
+            devType = getDevType(fwip, mainkey)
+            panoDG, fw_vsys = None, None
+            if devType == 'pano':
+                panoDG = getDG(fwip, mainkey, options['device-group'])
+            else:
+                fw_vsys = check_vsys(fwip, mainkey, options['vsys'])
+            plan['device type'], plan['scope'] = devType, getScopeXpath(devType, panoDG, fw_vsys)
+            sync = startSync(fwip, devType, panoDG, fw_vsys) if options['sync'] else None
+            if sync is not None:
+                plan['sync'] = {'added': len(sync['added']), 'changed': len(sync['changed']), 'removed': len(sync['removed'])}
+            lookupBatches = getLookupBatches(fwip, mainkey, panoDG)
+            ignoreNames = sync['removed'] if sync is not None and options['sync-delete'] else ()
+            duplicateList, valueDups, inSync = checkPanDups(fwip, mainkey, panoDG, fw_vsys, options['value-dups'][0], ignoreNames)
+            plan['name dups'], plan['value dups'], plan['in sync'] = len(duplicateList), len(valueDups), len(inSync)
+            plan['objects'] = {addrType: len(addrObjs) for addrType, addrObjs in addrObjLists()}
+            seconds['device checks'] = time.perf_counter() - start - sum(seconds.values())
+            if sync is not None:
+                prepareSyncPush(sync, inSync)
+            batches, plan['group'] = planPush(fwip, mainkey, devType, panoDG, fw_vsys)
+            plan['method'] = 'POST' if options['post'] else 'GET'
+            plan['calls'] = {'reads': estimateReads(fwip, mainkey, devType, panoDG, lookupBatches), 'sets': len(batches),
+                             'set bytes': sum(batch['call bytes'] for batch in batches), 'in flight': options['in-flight']}
+            plan['batches'] = batches
+            seconds['batching'] = time.perf_counter() - start - sum(seconds.values())
+        except SystemExit:
+            plan['valid'], plan['error'] = False, 'stopped, see the messages printed to stderr'
+        except (OSError, ValueError, ET.ParseError) as e:
+            plan['valid'], plan['error'] = False, str(e)
+    plan['seconds'] = {stage: round(elapsed, 3) for stage, elapsed in seconds.items()}
+    if runStats is not None:
+        for stage, elapsed in seconds.items():
+            addPhaseTime(stage, elapsed)
+    print(json.dumps(plan, indent=2))
+    exit(0 if plan['valid'] else 1)
+
+
+def main():
+    global addrObj_ip, addrObj_fqdn, addrObj_range, addrObj_wildcard, allObjNames, addrGroupName, configVersion
+    authenticated = False
+    parseOptions(sys.argv)
+    options['sync'] = options['sync'] or options['sync-delete']
+    if options['aggregate'] not in (None,) + AGGREGATE_MODES:
+        print(f"\n\nThe --aggregate option must be one of {', '.join(AGGREGATE_MODES)}, please check the usage and try again...\n\n")
+        exit()
+    if options['value-dups'] not in VALUE_DUP_CHOICES:
+        print(f"\n\nThe --value-dups option must be one of {', '.join(VALUE_DUP_CHOICES)}, please check the usage and try again...\n\n")
+        exit(1)
+    if options['manifest']:
+        runManifest(options['manifest'])
+    if options['report'] or options['profile']:
+        startStats()
+        atexit.register(finishStats)  # The run can end at any of the prompts, so the report is written on exit
+    if options['resume']:
+        resumeInteractive()
+    if options['dry-run']:
+        runDryRun(sys.argv)
+    while True:
+
+        # Phases are timed with --report or --profile (the ones with prompts include the time spent answering them)
+        with timedPhase('input'):
+
+            # If no argument is passed with the command, then the user will be prompted to enter a list of objects
+            addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw = user_input(sys.argv)
+
+            # With --aggregate, merges the ip and range entries that overlap or are adjacent into fewer objects
+            addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw = aggregateAddrs(addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw)
+
+            # Calls the functions to build the 4 lists with name and address for each element in each list
+            addrObjBuilder(addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw)
+
+            # Search the user provided list for duplicates
+            checkListDups()
+
+        # Calls the functions to prompt user for Panorama/FW address, and retrieve the API key
+        if not authenticated:
+            with timedPhase('login'):
+                fwip = getfwipfqdn()
+                mainkey = getkey(fwip)
+                authenticated = True
+
+        with timedPhase('device info'):
+
+            # Read the device's config version, so the inventory cache can be used if nothing has changed since the last run
+            configVersion = getConfigVersion(fwip, mainkey)
+
+            # Determine whether the device is Panorama or firewall
+            devType = getDevType(fwip, mainkey)
+
+            # If Panorama is the device type, prompt user to choose device group
+            panoDG = None
+            if devType == 'pano':
+                panoDG = getDG(fwip, mainkey)
+
+            # Check to see if firewall is multi-vsys, return vsys number, or shared
+            fw_vsys = None
+            if devType == 'fw':
+                fw_vsys = check_vsys(fwip, mainkey)
+
+        # With --sync, narrow the list down to the objects that were added or changed since the last sync
+        with timedPhase('sync state'):
+            sync = startSync(fwip, devType, panoDG, fw_vsys) if options['sync'] else None
+
+        if sync is not None and not syncPending(sync):
+            print('\nNothing has changed since the last sync, so there is nothing to push')
+        else:
+            # Check for duplicates between list provided and pano/fw, and remove from list if they exist
+            # (objects that are about to be deleted by the sync don't count as existing addresses)
+            ignoreNames = sync['removed'] if sync is not None and options['sync-delete'] else ()
+            with timedPhase('duplicate checks'):
+                inSync = checkPanDups(fwip, mainkey, panoDG, fw_vsys, ignoreNames=ignoreNames)[2]
+
+            # Option for adding address object group (a sync keeps using the group from the last sync)
+            if addrGroupName is None:
+                addGroupOption()
+
+            # Push API calls, then finish the sync, and drop the cached inventory, as it no longer matches the device
+            if sync is not None:
+                prepareSyncPush(sync, inSync)
+            with timedPhase('push'):
+                apiPush(fwip, mainkey, devType, panoDG, fw_vsys)
+            if sync is not None:
+                with timedPhase('sync finish'):
+                    finishSync(fwip, mainkey, devType, panoDG, fw_vsys, sync)
+            clearCache(fwip)
+
+        # Prompt to run again if CSV was used (the same Pano/FW and credentials will be used)
+        if len(sys.argv) == 2:
+            while True:
+                another_run = input('\n\nWould you like run the script against another CSV file? [Y/n]  ')
+                if another_run.lower() == 'y' or another_run == '':
+                    sys.argv[1] = input('\nEnter the name of your CSV file: ')
+                    addrObj_ip, addrObj_fqdn, addrObj_range, addrObj_wildcard, allObjNames, addrGroupName = [], [], [], [], [], None
+                    break
+                elif another_run.lower() == 'n':
+                    print('\n\n\nHave a fantastic day!!!\n\n\n')
+                    exit()
+                else:
+                    pause(.75)
+                    print("\n\nThat wasn't an option, please try again with a 'y' or 'n'...")
+        else:
+            break
+    print('\n\n\nHave a fantastic day!!!\n\n\n')
+
+
+if __name__ == '__main__':
+    main()
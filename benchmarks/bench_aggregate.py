@@ -0,0 +1,71 @@
+###############################################################################
+#
+# Script:       bench_aggregate.py
+#
+# Description:  Times add-addresses.py --aggregate on clustered threat feeds
+#               of growing size (runs of adjacent hosts, with networks and
+#               ranges that overlap them), in cidr and range mode, and checks
+#               that the aggregated objects cover exactly the addresses of the
+#               feed. The smaller feeds are also pushed headless to a mock
+#               firewall with and without --aggregate, to compare the objects
+#               created, API calls, and push time.
+#
+# Usage:        python benchmarks/bench_aggregate.py [objects ...] [--latency seconds] [--max-push objects]
+#
+###############################################################################
+###############################################################################
+
+import os
+import sys
+import tempfile
+from common import loadScript, timeit, printTable, pushToMock
+from generators import feedEntries, writeCsv
+import pan_addresses
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+
+# Returns the sorted, merged (first, last) intervals of the addresses that the ip-netmask and ip-range records cover
+def coveredIntervals(aa, records):
+    merged = []
+    for first, last in sorted(pan_addresses.addrInterval(record) for record in records):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return merged
+
+
+def main():
+    latency = float(sys.argv[sys.argv.index('--latency') + 1]) if '--latency' in sys.argv else 0.02
+    maxPush = int(sys.argv[sys.argv.index('--max-push') + 1]) if '--max-push' in sys.argv else 100000
+    sizes = [int(arg) for i, arg in enumerate(sys.argv[1:], 1) if arg.isdigit() and not sys.argv[i - 1].startswith('--')] or DEFAULT_SIZES
+    aa = loadScript()
+    workDir = tempfile.mkdtemp(prefix='bench_aggregate_')
+    rows = []
+    for n in sizes:
+        entries = feedEntries(n)
+        addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObj_wildcard_raw = aa.parse_addrList(entries, ['add-addresses.py'])
+        expected = coveredIntervals(aa, addrObj_ip_raw + addrObj_range_raw)
+        csvFile = writeCsv(os.path.join(workDir, f'feed-{n}.csv'), entries)
+        for mode in [None] + list(aa.AGGREGATE_MODES):
+            if mode is None:
+                aggregate_time, objects = 0.0, len(entries)
+            else:
+                aggregate_time, (ipRecords, rangeRecords, coverage) = timeit(aa.aggregateAddrRecords, addrObj_ip_raw, addrObj_range_raw, mode)
+                objects = len(ipRecords) + len(rangeRecords)
+                if coveredIntervals(aa, ipRecords + rangeRecords) != expected:
+                    print(f'WARNING: {n} entries -- the {mode} objects do not cover the same addresses as the feed\n')
+            row = [n, mode or 'off', f'{aggregate_time:.2f}', objects, f'{1 - objects / n:.1%}']
+            if n <= maxPush:
+                push_time, summary, mock = pushToMock(aa, csvFile, workDir, {'latency': latency}, options={'aggregate': mode})
+                row += [summary['created'], mock.calls, f'{push_time:.2f}']
+            else:
+                row += ['skipped', '', '']
+            rows.append(row)
+    print(f'Clustered feeds of unnamed hosts, networks, and ranges, pushed with --post, {latency}s latency per call\n')
+    printTable(['entries', 'aggregate', 'aggregate (s)', 'objects', 'fewer objects', 'created', 'API calls', 'push (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+###############################################################################
+#
+# Script:       bench_cache.py
+#
+# Description:  Runs the device-group lookup and the inventory download from
+#               checkPanDups 3 times against the local mock PAN-OS API -- a cold
+#               run, a repeat run against the unchanged config (served from the
+#               on-disk inventory cache), and a run after a commit (the config
+#               version changed, so the inventory is downloaded again).
+#
+# Usage:        python benchmarks/bench_cache.py [objects per scope] [latency seconds]
+#
+###############################################################################
+###############################################################################
+
+import sys
+import tempfile
+from common import loadScript, timeit, printTable
+from mock_panos import MockPanos, API_KEY
+
+
+# Runs the reads that main() makes before checking for duplicates, as a fresh run of the script would
+def runReads(aa, fwip, panoDG):
+    aa.runCache.clear()
+    aa.configVersion = aa.getConfigVersion(fwip, API_KEY)
+    aa.getDGList(fwip, API_KEY)
+    aa.getDGList(fwip, API_KEY)  # getDevType and getDG both need the list
+    return aa.getPanAddrObjs(fwip, API_KEY, panoDG, None)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    aa = loadScript()
+    aa.options['cache-dir'] = tempfile.mkdtemp(prefix='bench_cache_')
+    aa.allObjNames = ['bench']
+    aa.options['lookup-threshold'] = 1  # Always the full download, rather than looking up the one name being imported
+    deviceGroups = {'DG-Parent': None, 'DG-Child': 'DG-Parent'}
+    mock = MockPanos(deviceGroups=deviceGroups, latency=latency)
+    mock.addAddresses('/config/shared/address', n, prefix='shared')
+    for dg in deviceGroups:
+        mock.addAddresses(f"/config/devices/entry/device-group/entry[@name='{dg}']/address", n, prefix=dg)
+    fwip = mock.start()
+    rows = []
+    try:
+        for label in ['cold', 'unchanged config (cached)', 'after a commit']:
+            if label == 'after a commit':
+                mock.commit()
+            mock.resetCounters()
+            run_time, (addrObjs, _) = timeit(runReads, aa, fwip, 'DG-Child')
+            rows.append([label, aa.configVersion, mock.calls, f'{mock.bytesOut / 1024:.0f}', len(addrObjs), f'{run_time:.3f}'])
+    finally:
+        mock.stop()
+    print(f'{n} address objects in each of 3 scopes, {latency}s latency per call\n')
+    printTable(['run', 'config version', 'API calls', 'KiB downloaded', 'objects', 'time (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
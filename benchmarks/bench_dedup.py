@@ -0,0 +1,49 @@
+###############################################################################
+#
+# Script:       bench_dedup.py
+#
+# Description:  Measures how checkListDups and the checkPanDups name and
+#               address value duplicate searches scale with the size of the
+#               user provided list and the size of the device inventory. The
+#               device inventory is synthetic, so no PAN device is needed.
+#
+# Usage:        python benchmarks/bench_dedup.py [size ...]
+#
+###############################################################################
+###############################################################################
+
+import sys
+from common import loadScript, timeit, printTable
+from generators import hostObjects, inventoryEntries
+
+DEFAULT_SIZES = [1000, 10000, 50000, 100000, 200000]
+
+
+# Builds n unique ip objects, plus a device inventory of n names where 10% overlap the list
+def buildInputs(n):
+    addrObj_ip = hostObjects(n)
+    addrObjs = [f'existing-{i}' for i in range(n - n // 10)] + [obj[0] for obj in addrObj_ip[::10]]
+    return addrObj_ip, addrObjs
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    aa = loadScript()
+    rows = []
+    for n in sizes:
+        addrObj_ip, addrObjs = buildInputs(n)
+        aa.addrObj_ip, aa.addrObj_fqdn, aa.addrObj_range = addrObj_ip, [], []
+        listDups_time, _ = timeit(aa.checkListDups)
+        panDups_time, duplicateList = timeit(aa.findPanDups, aa.allObjNames, addrObjs)
+        remove_time, _ = timeit(aa.removeAddrObjs, duplicateList)
+        entries, addrValues = inventoryEntries(n), {}
+        index_time, _ = timeit(aa.indexAddrEntries, entries, [], addrValues)
+        valueDups_time, valueDups = timeit(aa.objValueDups, addrValues)
+        rows.append([n, len(duplicateList), f'{listDups_time:.4f}', f'{panDups_time:.4f}', f'{remove_time:.4f}',
+                     len(valueDups), f'{index_time:.4f}', f'{valueDups_time:.4f}'])
+    printTable(['objects', 'dups', 'checkListDups (s)', 'findPanDups (s)', 'removeAddrObjs (s)',
+                'value dups', 'indexAddrEntries (s)', 'objValueDups (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+###############################################################################
+#
+# Script:       bench_dryrun.py
+#
+# Description:  Exports the config of a mock Panorama (a device group with a
+#               parent, some existing objects, and a partly filled group),
+#               then runs add-addresses.py --dry-run against the export for
+#               feeds of growing size, and times each stage of the plan.
+#               The same feed is then pushed headless to the mock, and the
+#               planned set calls are checked against the calls it received.
+#
+# Usage:        python benchmarks/bench_dryrun.py [objects ...] [--latency seconds]
+#
+###############################################################################
+###############################################################################
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+from common import SCRIPT_PATH, loadScript, timeit, printTable, pushFile
+from mock_panos import MockPanos
+
+DG_XPATH = "/config/devices/entry/device-group/entry[@name='DG-Child']"
+
+
+# Writes a CSV file of n objects, mostly hosts, with some networks, FQDNs, and ranges, and a few names that already exist on the mock
+def writeFeed(path, n):
+    with open(path, 'w') as file:
+        for i in range(n):
+            octets = f'{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}'
+            if i % 50 == 0:
+                file.write(f'existing-{i},host{i}.example.com\n')
+            elif i % 10 == 1:
+                file.write(f',10.{i >> 8 & 255}.{i & 255}.0/24\n')
+            elif i % 10 == 2:
+                file.write(f'range-{i},11.{octets}-11.{octets}\n')
+            else:
+                file.write(f',10.{octets}\n')
+
+
+# Runs the script's dry run against the export, returning its exit code and plan
+def dryRun(csvFile, export, fwip):
+    result = subprocess.run([sys.executable, SCRIPT_PATH, csvFile, '--dry-run', '--config', export, '--device', fwip, '--device-group', 'DG-Child',
+                             '--group', 'Feed', '--post'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return result.returncode, json.loads(result.stdout)
+
+
+def main():
+    latency = float(sys.argv[sys.argv.index('--latency') + 1]) if '--latency' in sys.argv else 0.02
+    sizes = [int(arg) for arg in sys.argv[1:] if arg.isdigit()] or [1000, 10000, 100000]
+    aa = loadScript()
+    workDir = tempfile.mkdtemp(prefix='bench_dryrun_')
+    rows = []
+    for n in sizes:
+        mock = MockPanos(deviceGroups={'DG-Parent': None, 'DG-Child': 'DG-Parent'}, latency=latency)
+        fwip = mock.start()
+        try:
+            mock.addAddresses('/config/shared/address', 2000, prefix='shared')
+            mock.addAddresses(f'{DG_XPATH}/address', n // 10, prefix='existing')
+            mock.addGroup(f'{DG_XPATH}/address-group', 'Feed', [f'existing-{i}' for i in range(0, n // 10, 50)])
+            export, csvFile = os.path.join(workDir, f'config-{n}.xml'), os.path.join(workDir, f'feed-{n}.csv')
+            mock.exportConfig(export)
+            writeFeed(csvFile, n)
+            plan_time, (code, plan) = timeit(dryRun, csvFile, export, fwip)
+            mock.resetCounters()
+            push_time, summary = pushFile(aa, fwip, csvFile, workDir, {'device-group': 'DG-Child'}, {'lookup-threshold': 1})
+        finally:
+            mock.stop()
+        planned = plan['calls']['reads'] + plan['calls']['sets']
+        if code != 0 or planned != mock.calls or sum(plan['objects'].values()) != summary['created']:
+            print(f'WARNING: {n} objects -- {planned} calls planned, {mock.calls} sent, {sum(plan["objects"].values())} objects planned, {summary["created"]} created\n')
+        seconds = plan['seconds']
+        rows.append([n, plan['name dups'], sum(plan['objects'].values()), plan['calls']['sets'], planned, mock.calls, seconds['config export'],
+                     seconds['parse'], seconds['device checks'], seconds['batching'], f'{plan_time:.2f}', f'{push_time:.2f}'])
+    print(f'Dry runs against a config export, then a live push with --post, {latency}s latency per call\n')
+    printTable(['objects', 'name dups', 'planned objects', 'set calls', 'planned calls', 'calls sent', 'export (s)', 'parse (s)',
+                'checks (s)', 'batching (s)', 'dry run (s)', 'live push (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+###############################################################################
+#
+# Script:       bench_groups.py
+#
+# Description:  Times the group membership part of apiPush against the local
+#               mock PAN-OS API, when the group is new, when nearly every name
+#               is already a member (directly, or through a nested group), and
+#               when the names go over --max-members and spill into overflow
+#               groups. After each push, the group's members (expanded
+#               through nested groups) are checked against the names, and no
+#               group may go over the limit.
+#
+# Usage:        python benchmarks/bench_groups.py [names] [latency seconds]
+#
+###############################################################################
+###############################################################################
+
+import sys
+import tempfile
+from common import loadScript, timeit, printTable
+from mock_panos import MockPanos, API_KEY, findXpath
+
+GROUP_XPATH = "/config/devices/entry/device-group/entry[@name='DG-Bench']/address-group"
+
+
+# Returns {group name: static members} for the groups in the device group
+def deviceGroups(mock):
+    groups = findXpath(mock.config, GROUP_XPATH)
+    if groups is None:
+        return {}
+    return {entry.get('name'): [member.text for member in entry.iterfind('./static/member')] for entry in groups.iterfind('entry')}
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    aa = loadScript()
+    aa.headless = True  # Skips the prompts and pauses
+    aa.print = lambda *args, **kwargs: None
+    aa.options['cache-dir'] = tempfile.mkdtemp(prefix='bench_groups_')
+    aa.options['post'] = True
+    names = [f'H-10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}' for i in range(n)]
+    # (label, existing {group: members}, max members)
+    scenarios = [('new group', {}, 0),
+                 ('99% already members', {'Feed': names[:n * 99 // 100]}, 0),
+                 ('99% in a nested group', {'Feed': ['Feed-Old'], 'Feed-Old': names[:n * 99 // 100]}, 0),
+                 (f'new group, limit {n // 8}', {}, n // 8),
+                 (f'1% more, limit {n // 8}', None, n // 8)]
+    rows = []
+    mock = None
+    for label, existing, maxMembers in scenarios:
+        if existing is not None:  # None carries on from the previous scenario, with 1% more names
+            if mock is not None:
+                mock.stop()
+            mock = MockPanos(deviceGroups={'DG-Bench': None}, latency=latency)
+            fwip = mock.start()
+            for group, members in existing.items():
+                mock.addGroup(GROUP_XPATH, group, members)
+            pushNames = names
+        else:
+            pushNames = names + [f'H-172.16.{i >> 8 & 255}.{i & 255}' for i in range(n // 100)]
+        aa.addrObj_ip, aa.addrObj_fqdn, aa.addrObj_range = [], [], []  # Only the group members are pushed
+        aa.allObjNames, aa.addrGroupName = pushNames, 'Feed'
+        aa.options['max-members'] = maxMembers
+        aa.runCache.clear()
+        aa.apiSession = None
+        mock.resetCounters()
+        push_time, (added, present) = timeit(aa.apiPush, fwip, API_KEY, 'pano', 'DG-Bench', None)
+        groups = deviceGroups(mock)
+        expanded = aa.expandGroup('Feed', groups)
+        largest = max(len(members) for members in groups.values())
+        if not expanded >= set(pushNames) or (maxMembers and largest > maxMembers):
+            print(f'WARNING: {label} -- {len(expanded)} members after the push, the largest group has {largest}\n')
+        rows.append([label, added, present, len(groups), largest, mock.calls, f'{mock.bytesIn / 1024:.0f}', f'{push_time:.2f}'])
+    mock.stop()
+    print(f'{n} names pushed to the Feed group, {latency}s latency per call, with --post\n')
+    printTable(['scenario', 'added', 'already members', 'groups', 'largest group', 'API calls', 'KiB sent', 'time (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+###############################################################################
+#
+# Script:       bench_http.py
+#
+# Description:  Runs the device inventory download from checkPanDups against
+#               the local mock PAN-OS API, comparing a bare requests.get per
+#               call (a new TLS connection each time, one call after another)
+#               with the shared keep-alive session and concurrent reads.
+#
+# Usage:        python benchmarks/bench_http.py [latency seconds] [device group depth]
+#
+###############################################################################
+###############################################################################
+
+import sys
+import requests
+from xml.etree import ElementTree as ET
+from common import loadScript, timeit, printTable
+from mock_panos import MockPanos, API_KEY
+
+
+# The inventory download as it was before the shared session, kept here as the baseline
+def legacy_getPanAddrObjs(aa, fwip, mainkey, panoDG):
+    sharedAddrObjURL = f'https://{fwip}/api/?type=config&action=get&xpath=/config/shared/address&key={mainkey}'
+    r = requests.get(sharedAddrObjURL, verify=False)
+    addrObjs = [entry.get('name') for entry in ET.fromstring(r.text).findall('./result/address/entry')]
+    pDGs = []
+    r = requests.get(f'https://{fwip}/api/?type=op&cmd=<show><dg-hierarchy></dg-hierarchy></show>&key={mainkey}', verify=False)
+    dgHierarychyTree = ET.fromstring(r.text)
+    dgName = panoDG
+    while True:
+        dg = dgHierarychyTree.find(f".//*/[@name='{dgName}']...")
+        if dg.get('name') is None:
+            break
+        pDGs.append(dg.get('name'))
+        dgName = dg.get('name')
+    for dg in [panoDG] + pDGs:
+        addrObjURL = f"https://{fwip}/api/?type=config&action=get&xpath=/config/devices/entry/device-group/entry[@name='{dg}']/address&key={mainkey}"
+        r = requests.get(addrObjURL, verify=False)
+        addrObjs += [entry.get('name') for entry in ET.fromstring(r.text).findall('./result/address/entry')]
+    return addrObjs
+
+
+def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    aa = loadScript()
+    aa.allObjNames = ['bench']
+    aa.options['lookup-threshold'] = 1  # Always the full download, rather than looking up the one name being imported
+    deviceGroups = {f'DG-{i}': (f'DG-{i - 1}' if i else None) for i in range(depth)}
+    mock = MockPanos(deviceGroups=deviceGroups, latency=latency)
+    mock.addAddresses('/config/shared/address', 2000, prefix='shared')
+    for dg in deviceGroups:
+        mock.addAddresses(f"/config/devices/entry/device-group/entry[@name='{dg}']/address", 2000, prefix=dg)
+    fwip = mock.start()
+    panoDG = f'DG-{depth - 1}'
+    rows = []
+    try:
+        legacy_time, legacy_objs = timeit(legacy_getPanAddrObjs, aa, fwip, API_KEY, panoDG)
+        rows.append(['requests.get per call', mock.calls, mock.connections, f'{legacy_time:.3f}'])
+        mock.resetCounters()
+        pooled_time, (addrObjs, _) = timeit(aa.getPanAddrObjs, fwip, API_KEY, panoDG, None)
+        rows.append(['shared session + concurrent reads', mock.calls, mock.connections, f'{pooled_time:.3f}'])
+    finally:
+        mock.stop()
+    if sorted(legacy_objs) != sorted(addrObjs):
+        print('WARNING: the inventories do not match\n')
+    print(f'{depth} device groups deep, {len(addrObjs)} address objects, {latency}s latency per call\n')
+    printTable(['client', 'API calls', 'TCP connections', 'time (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+###############################################################################
+#
+# Script:       bench_library.py
+#
+# Description:  Measures the pan_addresses library as an orchestration service
+#               would use it -- the time to import it in a fresh interpreter
+#               (compared with loading add-addresses.py, which imports requests
+#               up front), and many imports to a mock firewall from one
+#               process, through importAddresses and through the script's
+#               headless runTarget. The device is reset after each run, so
+#               every run is the same import, and the Python memory still held
+#               after each run shows whether anything builds up between runs.
+#
+# Usage:        python benchmarks/bench_library.py [objects] [runs] [--latency seconds]
+#
+###############################################################################
+###############################################################################
+
+import gc
+import os
+import sys
+import subprocess
+import tempfile
+import tracemalloc
+from common import REPO_DIR, SCRIPT_PATH, loadScript, timeit, printTable, pushFile
+from mock_panos import MockPanos, API_KEY, findXpath
+from generators import addrEntries, writeCsv
+import pan_addresses
+
+VSYS_XPATH = "/config/devices/entry/vsys/entry[@name='vsys1']"
+
+# Code run in a fresh interpreter for each import measured, printing whether requests and numpy were loaded
+IMPORT_CODE = {
+    'nothing (interpreter start)': 'import sys',
+    'import pan_addresses': 'import sys; import pan_addresses',
+    'load add-addresses.py': "import sys, importlib.util; spec = importlib.util.spec_from_file_location('addaddresses', sys.argv[1]); spec.loader.exec_module(importlib.util.module_from_spec(spec))",
+}
+
+
+# Returns the best wall time of several fresh interpreters running the code, and the modules it left loaded
+def importTime(code, tries=5):
+    check = "; print(len(sys.modules), 'requests' in sys.modules, 'numpy' in sys.modules)"
+    times = []
+    for _ in range(tries):
+        seconds, result = timeit(subprocess.run, [sys.executable, '-c', code + check, SCRIPT_PATH], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+        times.append(seconds)
+    modules, requests, numpy = result.stdout.split()
+    return min(times), int(modules), requests == 'True', numpy == 'True'
+
+
+# Removes the address objects and groups from the mock's vsys, so the next run imports into the same empty scope
+def resetDevice(mock):
+    vsys = findXpath(mock.config, VSYS_XPATH)
+    for element in list(vsys):
+        if element.tag in ('address', 'address-group'):
+            vsys.remove(element)
+    mock.commit()
+
+
+# Runs the import repeatedly, returning a row with the time of each run, and the Python memory held after the first and last runs
+def repeatRuns(label, runImport, mock, runs):
+    held, times, created = [], [], 0
+    for _ in range(runs):
+        seconds, created = timeit(runImport)
+        times.append(seconds)
+        resetDevice(mock)
+        gc.collect()
+        held.append(tracemalloc.get_traced_memory()[0])
+    return [label, runs, created, f'{times[0]:.2f}', f'{sum(times[1:]) / max(runs - 1, 1):.2f}',
+            f'{held[0] / 1024:.0f}', f'{held[-1] / 1024:.0f}', f'{(held[-1] - held[0]) / 1024:+.0f}']
+
+
+def main():
+    latency = float(sys.argv[sys.argv.index('--latency') + 1]) if '--latency' in sys.argv else 0.02
+    args = [int(arg) for i, arg in enumerate(sys.argv[1:], 1) if arg.isdigit() and not sys.argv[i - 1].startswith('--')]
+    n = args[0] if args else 5000
+    runs = args[1] if len(args) > 1 else 10
+    importRows = []
+    for label, code in IMPORT_CODE.items():
+        seconds, modules, requests, numpy = importTime(code)
+        importRows.append([label, f'{seconds * 1000:.0f}', modules, 'yes' if requests else 'no', 'yes' if numpy else 'no'])
+    print('Fresh interpreter, best of 5\n')
+    printTable(['import', 'time (ms)', 'modules', 'requests loaded', 'numpy loaded'], importRows)
+
+    aa = loadScript()
+    workDir = tempfile.mkdtemp(prefix='bench_library_')
+    entries = addrEntries(n)
+    csvFile = writeCsv(os.path.join(workDir, f'feed-{n}.csv'), entries)
+    mock = MockPanos(latency=latency)
+    fwip = mock.start()
+    rows = []
+    tracemalloc.start()
+    try:
+        def libraryRun():
+            records, errors = pan_addresses.parseEntries(entries)
+            with pan_addresses.PanClient(fwip, API_KEY) as client:
+                result = pan_addresses.importAddresses(client, records, group='Feed')
+            if result['error']:
+                print(result['error'])
+            return result['created']
+
+        def scriptRun():
+            return pushFile(aa, fwip, csvFile, workDir)[1]['created']
+
+        rows.append(repeatRuns('pan_addresses.importAddresses', libraryRun, mock, runs))
+        rows.append(repeatRuns('add-addresses.py runTarget', scriptRun, mock, runs))
+    finally:
+        tracemalloc.stop()
+        mock.stop()
+    print(f'\n{runs} imports of {n} mixed ip/fqdn/range objects from one process, with --post, {latency}s latency per call\n')
+    printTable(['path', 'runs', 'created', 'first run (s)', 'later runs (s)', 'held after first (KiB)', 'held after last (KiB)', 'growth (KiB)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+###############################################################################
+#
+# Script:       bench_lookup.py
+#
+# Description:  Compares the full inventory download with targeted lookups
+#               (only the names and addresses being imported) in
+#               getPanAddrObjs, for imports of several sizes, against the local
+#               mock PAN-OS API. The 'auto' rows let the script choose, after a
+#               full download has been measured. The on-disk cache isn't used.
+#
+# Usage:        python benchmarks/bench_lookup.py [objects per scope] [latency seconds]
+#
+###############################################################################
+###############################################################################
+
+import sys
+import tempfile
+from common import loadScript, timeit, printTable
+from mock_panos import MockPanos, API_KEY
+
+IMPORT_SIZES = [10, 100, 1000]
+
+
+# Fills the script's object lists with n hosts, where every 4th one already exists by name and every 4th one by address
+def loadObjects(aa, n):
+    aa.addrObj_ip = []
+    for i in range(n):
+        if i % 4 == 0:
+            aa.addrObj_ip.append([f'DG-Child-{i}', f'10.99.{i >> 8 & 255}.{i & 255}'])
+        elif i % 4 == 1:
+            aa.addrObj_ip.append([f'new-{i}', f'172.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}'])
+        else:
+            aa.addrObj_ip.append([f'new-{i}', f'10.98.{i >> 8 & 255}.{i & 255}'])
+    aa.addrObj_fqdn, aa.addrObj_range = [], []
+    aa.allObjNames = [obj[0] for obj in aa.addrObj_ip]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    aa = loadScript()
+    aa.options['cache-dir'] = tempfile.mkdtemp(prefix='bench_lookup_')
+    deviceGroups = {'DG-Parent': None, 'DG-Child': 'DG-Parent'}
+    mock = MockPanos(deviceGroups=deviceGroups, latency=latency)
+    mock.addAddresses('/config/shared/address', n, prefix='shared')
+    for dg in deviceGroups:
+        mock.addAddresses(f"/config/devices/entry/device-group/entry[@name='{dg}']/address", n, prefix=dg)
+    fwip = mock.start()
+    rows = []
+    try:
+        for size in IMPORT_SIZES:
+            loadObjects(aa, size)
+            results = {}
+            for label, threshold in [('full download', 1), ('targeted lookup', size + 1), ('auto', 0)]:
+                aa.runCache.clear()
+                aa.options['lookup-threshold'] = threshold
+                mock.resetCounters()
+                lookup_time, (addrObjs, addrValues) = timeit(aa.getPanAddrObjs, fwip, API_KEY, 'DG-Child', None)
+                results[label] = (len(aa.findPanDups(aa.allObjNames, addrObjs)), len(aa.objValueDups(addrValues)))
+                rows.append([size, label, mock.calls, f'{mock.bytesOut / 1024:.0f}', *results[label], f'{lookup_time:.3f}'])
+            if len(set(results.values())) != 1:
+                print(f'WARNING: the duplicates found for {size} objects do not match -- {results}\n')
+    finally:
+        mock.stop()
+    print(f'{n} address objects in each of 3 scopes, {latency}s latency per call\n')
+    printTable(['objects', 'strategy', 'API calls', 'KiB downloaded', 'name dups', 'value dups', 'time (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
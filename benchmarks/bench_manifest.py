@@ -0,0 +1,84 @@
+###############################################################################
+#
+# Script:       bench_manifest.py
+#
+# Description:  Times a headless --manifest run of add-addresses.py against
+#               several mock firewalls and one mock Panorama, with targets
+#               processed one at a time and then in parallel. The last target
+#               names a device group that doesn't exist, so the summary shows
+#               a failed target alongside the others. The mocks all run in
+#               this process, so they limit how far the speedup can go with
+#               higher parallelism.
+#
+# Usage:        python benchmarks/bench_manifest.py [firewalls] [objects per target] [latency seconds]
+#
+###############################################################################
+###############################################################################
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+from common import SCRIPT_PATH, timeit, printTable
+from mock_panos import MockPanos, API_KEY
+
+PARALLEL = [1, 4, 8]
+
+
+# Writes a CSV file of n host objects, named after the target
+def writeCsv(path, label, n):
+    with open(path, 'w') as file:
+        for i in range(n):
+            file.write(f'{label}-{i},10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}\n')
+
+
+# Runs the script headless against the manifest, returning its exit code and output
+def runScript(manifest, parallel, cacheDir):
+    env = dict(os.environ, PANOS_API_KEY=API_KEY)
+    result = subprocess.run([sys.executable, SCRIPT_PATH, '--manifest', manifest, '--parallel', str(parallel), '--cache-dir', cacheDir, '--refresh'],
+                            env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return result.returncode, result.stdout
+
+
+# Starts fresh mock firewalls and a mock Panorama, and writes the manifest and CSV files for them, returning the mocks and manifest path
+def setUp(workDir, firewalls, n, latency):
+    mocks, targets = [], []
+    for i in range(firewalls):
+        mocks.append(MockPanos(latency=latency))
+        targets.append({'device': mocks[-1].start(), 'file': f'fw{i}.csv'})
+        writeCsv(os.path.join(workDir, f'fw{i}.csv'), f'fw{i}', n)
+    mocks.append(MockPanos(deviceGroups={'DG-Parent': None, 'DG-Child': 'DG-Parent'}, latency=latency))
+    panorama = mocks[-1].start()
+    writeCsv(os.path.join(workDir, 'pano.csv'), 'pano', n)
+    targets.append({'device': panorama, 'device-group': 'DG-Child', 'file': 'pano.csv'})
+    targets.append({'device': panorama, 'device-group': 'DG-Missing', 'file': 'pano.csv'})
+    manifest = os.path.join(workDir, 'manifest.json')
+    with open(manifest, 'w') as file:
+        json.dump({'defaults': {'group': 'Bench-Group'}, 'targets': targets}, file, indent=2)
+    return mocks, manifest
+
+
+def main():
+    firewalls = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    workDir = tempfile.mkdtemp(prefix='bench_manifest_')
+    rows = []
+    for parallel in PARALLEL:
+        mocks, manifest = setUp(workDir, firewalls, n, latency)
+        try:
+            run_time, (code, output) = timeit(runScript, manifest, parallel, os.path.join(workDir, 'cache'))
+        finally:
+            for mock in mocks:
+                mock.stop()
+        rows.append([parallel, firewalls + 2, code, f'{run_time:.2f}'])
+    lines = output.splitlines()
+    summaryStart = max(i for i, line in enumerate(lines) if line.startswith('device ') and 'status' in line)
+    print('\n'.join(lines[summaryStart:]).strip() + '\n')  # The summary table of the last run
+    print(f'{firewalls + 2} targets of {n} objects each, {latency}s latency per call\n')
+    printTable(['parallel', 'targets', 'exit code', 'time (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+###############################################################################
+#
+# Script:       bench_parse.py
+#
+# Description:  Compares the single-pass classifier (parse_addrList and
+#               addrObjBuilder) against the previous implementation, which
+#               matched 3 separate regexes per entry and then re-parsed the
+#               addresses to build the 'H-'/'N-' names. Both paths are run on
+#               the same synthetic input and their output is compared.
+#
+# Usage:        python benchmarks/bench_parse.py [lines]
+#
+###############################################################################
+###############################################################################
+
+import re
+import sys
+from common import loadScript, timeit, printTable
+from generators import addrEntries
+
+DEFAULT_LINES = 1000000
+
+
+# The 3-regex parse_addrList that the classifier replaced, kept here as the baseline
+def legacy_parse_addrList(addrList):
+    addrObjCheck_ip = r'^(?:(?:([A-Za-z\d])|(([A-Za-z\d])([\w \.-]){0,61}([\w\.-]))):\s*)?((?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)((\/)(3[0-2]|2[0-9]|1[0-9]|[1-9]))?)$'
+    addrObjCheck_fqdn = r'^(?:(?:([A-Za-z\d])|(([A-Za-z\d])([\w \.-]){0,61}([\w\.-]))):\s*)?([a-z0-9]+(-[a-z0-9]+)*\.)+[a-z]{2,}$'
+    addrObjCheck_range = r'^(?:(?:([A-Za-z\d])|(([A-Za-z\d])([\w \.-]){0,61}([\w\.-]))):\s*)?(?:(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?))-(?:(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?))$'
+    addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw, addrObject_errors = [], [], [], []
+    for addr in addrList:
+        ip_r = re.match(addrObjCheck_ip, addr)
+        fqdn_r = re.match(addrObjCheck_fqdn, addr)
+        range_r = re.match(addrObjCheck_range, addr)
+        if ip_r:
+            addrObj_ip_raw.append(addr)
+        elif fqdn_r:
+            addrObj_fqdn_raw.append(addr)
+        elif range_r:
+            addrObj_range_raw.append(addr)
+        else:
+            addrObject_errors.append(addr)
+    return addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw
+
+
+# The addrObjBuilder that the classifier replaced, kept here as the baseline
+def legacy_addrObjBuilder(addrObj_ip_raw, addrObj_fqdn_raw, addrObj_range_raw):
+    addrObj_ip, addrObj_fqdn, addrObj_range = [], [], []
+    for obj in addrObj_ip_raw:
+        if ':' in obj:
+            addrObj_ip.append(obj.split(':'))
+        else:
+            if '/' not in obj or '/32' in obj:
+                ip_pattern = re.compile(r'^((\d{1,3}\.){3}\d{1,3})')
+                ip = ip_pattern.findall(obj)
+                addrObj_ip.append([(f'H-{ip[0][0]}'), obj])
+            else:
+                mask_pattern = re.compile(r'\d?\d$')
+                ip_pattern = re.compile(r'^((\d{1,3}\.){3}\d{1,3})')
+                mask = mask_pattern.findall(obj)
+                ip = ip_pattern.findall(obj)
+                addrObj_ip.append([(f'N-{ip[0][0]}-{mask[0]}'), obj])
+    for obj in addrObj_fqdn_raw:
+        if ':' in obj:
+            addrObj_fqdn.append(obj.split(':'))
+        else:
+            addrObj_fqdn.append([obj, obj])
+    for obj in addrObj_range_raw:
+        if ':' in obj:
+            addrObj_range.append(obj.split(':'))
+        else:
+            addrObj_range.append([f'range_{obj}', obj])
+    return addrObj_ip, addrObj_fqdn, addrObj_range
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    aa = loadScript()
+    lines = addrEntries(n)
+
+    legacy_parse_time, legacy_raw = timeit(legacy_parse_addrList, lines)
+    legacy_build_time, legacy_objs = timeit(legacy_addrObjBuilder, *legacy_raw)
+
+    parse_time, raw = timeit(aa.parse_addrList, lines, ['add-addresses.py'])
+    build_time, _ = timeit(aa.addrObjBuilder, *raw)
+    objs = (aa.addrObj_ip, aa.addrObj_fqdn, aa.addrObj_range)
+
+    if [list(map(list, objList)) for objList in legacy_objs] != [list(map(list, objList)) for objList in objs]:
+        print('WARNING: the classifier output does not match the legacy output\n')
+    rows = [['legacy (3 regexes + re-parse)', f'{legacy_parse_time:.3f}', f'{legacy_build_time:.3f}', f'{legacy_parse_time + legacy_build_time:.3f}'],
+            ['single-pass classifier', f'{parse_time:.3f}', f'{build_time:.3f}', f'{parse_time + build_time:.3f}']]
+    print(f'{n} entries\n')
+    printTable(['path', 'parse (s)', 'build (s)', 'total (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
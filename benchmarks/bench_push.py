@@ -0,0 +1,61 @@
+###############################################################################
+#
+# Script:       bench_push.py
+#
+# Description:  Pushes a synthetic import (address objects plus a group) with
+#               apiPush against the local mock PAN-OS API, comparing GET calls
+#               limited by URL length with POST calls at several batch sizes,
+#               and the number of calls in flight at once, with the threaded
+#               and asyncio pipelines. Prompts and pauses in apiPush are skipped.
+#
+# Usage:        python benchmarks/bench_push.py [objects] [latency seconds]
+#
+###############################################################################
+###############################################################################
+
+import sys
+from common import loadScript, timeit, printTable
+from mock_panos import MockPanos, API_KEY
+from generators import hostObjects
+
+# (method, batch size, calls in flight, use asyncio)
+SETTINGS = [('GET', 5000, 1, False), ('GET', 5000, 4, False), ('GET', 5000, 8, False), ('GET', 5000, 8, True),
+            ('POST', 64000, 1, False), ('POST', 64000, 4, False), ('POST', 512000, 1, False), ('POST', 512000, 4, False), ('POST', 2000000, 1, False)]
+
+
+# Fills the script's object lists with n unique host objects, and sets the group name
+def loadObjects(aa, n):
+    aa.addrObj_ip = hostObjects(n)
+    aa.addrObj_fqdn, aa.addrObj_range = [], []
+    aa.allObjNames = [obj[0] for obj in aa.addrObj_ip]
+    aa.addrGroupName = 'bench-group'
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    aa = loadScript()
+    aa.headless = True  # Skips the prompts and pauses
+    aa.print = lambda *args, **kwargs: None
+    aa.options['max-members'] = 0  # A single group, so only the push settings differ
+    rows = []
+    for method, batchSize, inFlight, useAsyncio in SETTINGS:
+        mock = MockPanos(deviceGroups={'DG-Bench': None}, latency=latency)
+        fwip = mock.start()
+        try:
+            loadObjects(aa, n)
+            aa.options['post'], aa.options['batch-size'] = method == 'POST', batchSize
+            aa.options['in-flight'], aa.options['asyncio'] = inFlight, useAsyncio
+            aa.apiSession = None
+            push_time, _ = timeit(aa.apiPush, fwip, API_KEY, 'pano', 'DG-Bench', None)
+            created = len(mock.config.findall("./devices/entry/device-group/entry/address/entry"))
+            members = len(mock.config.findall("./devices/entry/device-group/entry/address-group/entry/static/member"))
+            rows.append([method, batchSize, inFlight, 'asyncio' if useAsyncio else 'threads', mock.calls, f'{mock.bytesIn / mock.calls / 1024:.1f}', created, members, f'{push_time:.2f}'])
+        finally:
+            mock.stop()
+    print(f'{n} address objects and group members, {latency}s latency per call\n')
+    printTable(['method', 'batch size', 'in flight', 'pipeline', 'API calls', 'KiB per call', 'objects created', 'group members', 'time (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+###############################################################################
+#
+# Script:       bench_report.py
+#
+# Description:  Measures the cost of the --report and --profile run
+#               instrumentation of add-addresses.py. The same import is pushed
+#               headless to a mock firewall (with GET calls, so there are many
+#               small API calls) with the instrumentation off, with --report,
+#               and with --profile, and the extra time is divided by the API
+#               calls made. The cost of recording a single API call is also
+#               timed on its own, against a real response from the mock.
+#
+# Usage:        python benchmarks/bench_report.py [objects] [repeats] [--latency seconds]
+#
+###############################################################################
+###############################################################################
+
+import os
+import sys
+import tempfile
+from common import loadScript, timeit, printTable, pushToMock
+from mock_panos import MockPanos, API_KEY
+from generators import addrEntries, writeCsv
+
+# Calls timed for the cost of recording a GET call, and a POST call with a full default --post batch (512000 bytes)
+RECORD_CALLS = {'GET': 20000, 'POST': 200}
+
+
+# Returns the microseconds taken to record one API call, timed over many calls against a real response, for a GET call and
+# a POST call with a full batch in its body
+def recordCost(aa):
+    aa.options.update({'report': None, 'profile': None})  # Left over from the last push, and startStats would start the profiler
+    mock = MockPanos()
+    fwip = mock.start()
+    try:
+        url = f"https://{fwip}/api/?type=config&action=get&xpath=/config/devices/entry/vsys/entry[@name='vsys1']/address&key={API_KEY}"
+        data = {'type': 'config', 'action': 'set', 'xpath': '/config/shared/address',
+                'element': "<entry name='host'><fqdn>host.example.com</fqdn></entry>" * 9000}
+        costs = []
+        for method, callUrl, callData in [('GET', url, None), ('POST', f'https://{fwip}/api/', {**data, 'key': API_KEY})]:
+            r = aa.getSession().request(method, callUrl, data=callData, verify=False)
+            aa.startStats()
+            seconds, _ = timeit(lambda: [aa.recordRequest(method, callUrl, callData, 0.0, r, False) for _ in range(RECORD_CALLS[method])])
+            aa.stopStats()
+            costs.append(seconds / RECORD_CALLS[method] * 1e6)
+    finally:
+        mock.stop()
+        aa.apiSession = None
+    return costs
+
+
+def main():
+    latency = float(sys.argv[sys.argv.index('--latency') + 1]) if '--latency' in sys.argv else 0.0
+    args = [int(arg) for i, arg in enumerate(sys.argv[1:], 1) if arg.isdigit() and not sys.argv[i - 1].startswith('--')]
+    n = args[0] if args else 20000
+    repeats = args[1] if len(args) > 1 else 3
+    aa = loadScript()
+    workDir = tempfile.mkdtemp(prefix='bench_report_')
+    csvFile = writeCsv(os.path.join(workDir, f'feed-{n}.csv'), addrEntries(n))
+    modes = [('off', {}), ('--report', {'report': os.path.join(workDir, 'report.json')}), ('--profile', {'profile': os.path.join(workDir, 'run.prof')})]
+    times, results = {label: [] for label, _ in modes}, {}
+    for _ in range(repeats):
+        for label, instrumentation in modes:  # The modes take turns, so a slow spell on the machine doesn't land on one of them
+            seconds, summary, mock = pushToMock(aa, csvFile, workDir, {'latency': latency},
+                                                options={'post': False, 'report': None, 'profile': None, **instrumentation})
+            results[label] = (summary, mock.calls)
+            times[label].append(seconds)
+    rows, baseline = [], min(times['off'])
+    for label, _ in modes:
+        summary, calls = results[label]
+        best = min(times[label])
+        recorded = sum(total['calls'] for total in summary['stats']['calls'].values()) if 'stats' in summary else 0
+        rows.append([label, summary['status'], calls, recorded, f'{best:.2f}', f'{best - baseline:+.2f}', f'{(best - baseline) / calls * 1e6:+.0f}'])
+    print(f'{n} objects pushed with GET calls, {latency}s latency per call, best of {repeats}\n')
+    printTable(['instrumentation', 'status', 'API calls', 'calls recorded', 'time (s)', 'overhead (s)', 'overhead per call (us)'], rows)
+    getCost, postCost = recordCost(aa)
+    print(f'\nRecording one API call takes {getCost:.1f}us for a GET call, and {postCost:.1f}us for a POST call with a 512 KB batch')
+
+
+if __name__ == '__main__':
+    main()
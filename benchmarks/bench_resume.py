@@ -0,0 +1,76 @@
+###############################################################################
+#
+# Script:       bench_resume.py
+#
+# Description:  Pushes a large import to a mock Panorama whose set calls
+#               fail now and then, the way they can over a flaky WAN link.
+#               Failures that aren't transient stop the push, and it's either
+#               started over (the inventory is downloaded and checked again
+#               each time) or continued with --resume (only the batches that
+#               weren't confirmed are sent). Transient failures (session
+#               timeouts) are retried with backoff within a single run. Each
+#               strategy runs headless through runTarget until it finishes,
+#               then the device's objects and group are checked.
+#
+# Usage:        python benchmarks/bench_resume.py [objects] [failure rate] [latency seconds]
+#
+###############################################################################
+###############################################################################
+
+import os
+import sys
+import tempfile
+from common import loadScript, printTable, pushFile
+from mock_panos import MockPanos, findXpath
+from generators import addrEntries, writeCsv
+import pan_addresses
+
+DG_XPATH = "/config/devices/entry/device-group/entry[@name='DG-Bench']"
+MAX_RUNS = 25
+
+
+# Pushes the CSV file until it succeeds (or MAX_RUNS is reached), with the inventory cache kept between runs, returning the
+# runs, failed calls, API calls, KiB downloaded, and seconds in total
+def runUntilDone(aa, mock, fwip, csvFile, cacheDir, resume):
+    runs, errors, calls, bytesOut, seconds = 0, 0, 0, 0, 0.0
+    while runs < MAX_RUNS:
+        mock.resetCounters()
+        runOptions = {'cache-dir': cacheDir, 'refresh': False, 'batch-size': 64000, 'max-members': 0, 'resume': resume and runs > 0}
+        run_time, summary = pushFile(aa, fwip, csvFile, cacheDir, {'device-group': 'DG-Bench', 'value-dups': 'create'}, runOptions, printFailure=False)
+        runs, errors, calls, bytesOut, seconds = runs + 1, errors + mock.errors, calls + mock.calls, bytesOut + mock.bytesOut, seconds + run_time
+        mock.commit()
+        if summary['status'] == 'ok':
+            break
+    return runs, errors, calls, bytesOut / 1024, seconds
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.02
+    aa = loadScript()
+    pan_addresses.RETRY_BACKOFF = 0.05  # Shorter than a real backoff, so the transient failures don't dominate the timing
+    workDir = tempfile.mkdtemp(prefix='bench_resume_')
+    entries = addrEntries(n)
+    csvFile = writeCsv(os.path.join(workDir, 'feed.csv'), entries)
+    rows = []
+    # (label, PAN-OS error code of the failures, resume)
+    for label, errorCode, resume in [('start over', 13, False), ('--resume', 13, True), ('transient, retried', 22, False)]:
+        mock = MockPanos(deviceGroups={'DG-Bench': None}, latency=latency, errorRate=rate, errorStatus=200, errorCode=errorCode, errorActions=('set',))
+        mock.addAddresses(f'{DG_XPATH}/address', 20000)
+        fwip = mock.start()
+        try:
+            runs, errors, calls, kib, seconds = runUntilDone(aa, mock, fwip, csvFile, os.path.join(workDir, label), resume)
+        finally:
+            mock.stop()
+        objects = len(findXpath(mock.config, f'{DG_XPATH}/address')) - 20000
+        members = len(findXpath(mock.config, f'{DG_XPATH}/address-group').find("entry[@name='Feed']/static"))
+        if objects != n or members != n:
+            print(f'WARNING: {label} -- {objects} objects and {members} group members on the device, {n} expected\n')
+        rows.append([label, runs, errors, calls, f'{kib:.0f}', objects, members, f'{seconds:.2f}'])
+    print(f'{n} objects and group members pushed with --post, {rate:.1%} of set calls failing, {latency}s latency per call\n')
+    printTable(['strategy', 'runs', 'failed calls', 'API calls', 'KiB downloaded', 'objects', 'group members', 'time (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
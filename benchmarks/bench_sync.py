@@ -0,0 +1,102 @@
+###############################################################################
+#
+# Script:       bench_sync.py
+#
+# Description:  Imports a feed to a mock firewall, then imports the next day's
+#               feed (with 1% of the objects added, changed, or removed), both
+#               as a plain import and with --sync / --sync-delete. Each target
+#               runs headless through runTarget, against the local mock PAN-OS
+#               API. After --sync-delete, the device's objects and group
+#               members are checked against the feed.
+#
+# Usage:        python benchmarks/bench_sync.py [objects] [latency seconds]
+#
+###############################################################################
+###############################################################################
+
+import os
+import sys
+import tempfile
+from common import loadScript, printTable, pushFile
+from mock_panos import MockPanos, findXpath
+
+VSYS_XPATH = "/config/devices/entry/vsys/entry[@name='vsys1']"
+
+
+# Returns the feed of n objects as {name: address} -- mostly hosts, with some FQDNs and ranges
+def dayOneFeed(n):
+    feed = {}
+    for i in range(n):
+        if i % 10 == 0:
+            feed[f'fqdn-{i}'] = f'host{i}.example.com'
+        elif i % 10 == 1:
+            feed[f'range-{i}'] = f'10.{i >> 16 & 255}.{i >> 8 & 255}.1-10.{i >> 16 & 255}.{i >> 8 & 255}.9'
+        else:
+            feed[f'host-{i}'] = f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}'
+    return feed
+
+
+# Returns the next day's feed, with 0.5% of the objects added, 0.25% given a new address (a few of them a new type), and 0.25% removed
+def dayTwoFeed(feed):
+    names = list(feed)
+    changes = max(len(names) // 400, 1)
+    nextFeed = dict(feed)
+    for name in names[:changes]:
+        del nextFeed[name]
+    for i, name in enumerate(names[changes:changes * 2]):
+        nextFeed[name] = f'changed{i}.example.com' if i % 10 == 0 else f'192.168.{i >> 8 & 255}.{i & 255}'
+    for i in range(changes * 2):
+        nextFeed[f'new-{i}'] = f'172.16.{i >> 8 & 255}.{i & 255}'
+    return nextFeed
+
+
+# Writes the feed as a CSV file, returning its path
+def writeFeed(workDir, label, feed):
+    path = os.path.join(workDir, f'{label}.csv')
+    with open(path, 'w') as file:
+        for name, value in feed.items():
+            file.write(f'{name},{value}\n')
+    return path
+
+
+# Returns the {name: address} of the objects in the vsys, and the members of the group, expanded through its nested overflow groups
+def deviceState(aa, mock):
+    objects = {}
+    for entry in findXpath(mock.config, f'{VSYS_XPATH}/address').iterfind('entry'):
+        objects[entry.get('name')] = entry[0].text
+    groups = {entry.get('name'): [member.text for member in entry.iterfind('./static/member')] for entry in findXpath(mock.config, f'{VSYS_XPATH}/address-group')}
+    return objects, aa.expandGroup('Feed', groups)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    aa = loadScript()
+    workDir = tempfile.mkdtemp(prefix='bench_sync_')
+    feed = dayOneFeed(n)
+    nextFeed = dayTwoFeed(feed)
+    files = [writeFeed(workDir, 'day1', feed), writeFeed(workDir, 'day2', nextFeed)]
+    rows = []
+    for label, syncOptions in [('plain import', {}), ('--sync', {'sync': True}), ('--sync-delete', {'sync': True, 'sync-delete': True})]:
+        mock = MockPanos(latency=latency)
+        fwip = mock.start()
+        runOptions = {'cache-dir': os.path.join(workDir, label.strip('-')), 'post': False, 'sync': False, 'sync-delete': False, **syncOptions}
+        try:
+            for day, file in enumerate(files, 1):
+                mock.resetCounters()
+                run_time, summary = pushFile(aa, fwip, file, workDir, {'value-dups': 'create'}, runOptions)
+                rows.append([label, day, summary['status'], summary['created'], summary['changed'], summary['deleted'], summary['name dups'],
+                             mock.calls, f'{mock.bytesOut / 1024:.0f}', f'{run_time:.2f}'])
+                mock.commit()
+            if 'sync-delete' in syncOptions:
+                objects, members = deviceState(aa, mock)
+                if objects != nextFeed or members != set(nextFeed):
+                    print(f'WARNING: the device does not match the feed after --sync-delete ({len(objects)} objects, {len(members)} members, {len(nextFeed)} expected)\n')
+        finally:
+            mock.stop()
+    print(f'{n} objects on day 1, {len(nextFeed)} on day 2, {latency}s latency per call\n')
+    printTable(['mode', 'day', 'status', 'created', 'changed', 'deleted', 'name dups', 'API calls', 'KiB downloaded', 'time (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
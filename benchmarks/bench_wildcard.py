@@ -0,0 +1,64 @@
+###############################################################################
+#
+# Script:       bench_wildcard.py
+#
+# Description:  Times the IP wildcard support of add-addresses.py on ACL
+#               style wildcard lists of growing size -- classifying the
+#               entries, and the batch checks of the masks, address bits, and
+#               overlaps, with numpy and with the pure Python fallback (which
+#               must find the same entries). The smaller lists are also pushed
+#               headless to a mock firewall with --post.
+#
+# Usage:        python benchmarks/bench_wildcard.py [objects ...] [--latency seconds] [--max-push objects]
+#
+###############################################################################
+###############################################################################
+
+import os
+import sys
+import tempfile
+from common import loadScript, timeit, printTable, pushToMock
+import pan_addresses
+from generators import wildcardEntries, writeCsv
+
+DEFAULT_SIZES = [10000, 100000, 500000]
+
+
+def main():
+    latency = float(sys.argv[sys.argv.index('--latency') + 1]) if '--latency' in sys.argv else 0.02
+    maxPush = int(sys.argv[sys.argv.index('--max-push') + 1]) if '--max-push' in sys.argv else 100000
+    sizes = [int(arg) for i, arg in enumerate(sys.argv[1:], 1) if arg.isdigit() and not sys.argv[i - 1].startswith('--')] or DEFAULT_SIZES
+    aa = loadScript()
+    numpy = pan_addresses.loadNumpy()
+    workDir = tempfile.mkdtemp(prefix='bench_wildcard_')
+    rows = []
+    for n in sizes:
+        entries = wildcardEntries(n)
+        classify_time, records = timeit(lambda: [aa.classifyAddr(entry) for entry in entries])
+        checks = {}
+        for label, module in [('numpy', numpy), ('python', None)]:
+            if label == 'numpy' and numpy is None:
+                continue
+            pan_addresses.numpy = module
+            checks[label] = timeit(pan_addresses.checkWildcards, records)
+        pan_addresses.numpy = numpy
+        results = [result for check_time, result in checks.values()]
+        if any(result != results[0] for result in results):
+            print(f'WARNING: {n} entries -- the numpy and pure Python checks found different entries\n')
+        badMasks, hostBits, overlaps = results[0]
+        row = [n, f'{classify_time:.2f}', f"{checks['numpy'][0]:.2f}" if 'numpy' in checks else 'not installed', f"{checks['python'][0]:.2f}",
+               len(badMasks), len(hostBits), len(overlaps)]
+        if n <= maxPush:
+            csvFile = writeCsv(os.path.join(workDir, f'acl-{n}.csv'), entries)
+            push_time, summary, mock = pushToMock(aa, csvFile, workDir, {'latency': latency}, target={'group': 'ACL'})
+            row += [summary['status'], summary['created'], mock.calls, f'{push_time:.2f}']
+        else:
+            row += ['skipped', '', '', '']
+        rows.append(row)
+    print(f'ACL style IP wildcard lists, pushed with --post, {latency}s latency per call\n')
+    printTable(['entries', 'classify (s)', 'checks, numpy (s)', 'checks, python (s)', 'bad masks', 'address bits', 'overlaps',
+                'push', 'created', 'API calls', 'push (s)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+###############################################################################
+#
+# Script:       bench_xml.py
+#
+# Description:  Compares parsing a synthetic /address config response the way
+#               checkPanDups used to (the whole response decoded to text, then
+#               ET.fromstring and findall) with the streaming parseAddrEntries,
+#               which reads the response in 64 KiB chunks. Each method runs in
+#               its own process, so the peak RSS reported is its own.
+#
+# Usage:        python benchmarks/bench_xml.py [entries]
+#
+###############################################################################
+###############################################################################
+
+import sys
+import time
+import resource
+import subprocess
+from xml.etree import ElementTree as ET
+from common import loadScript, printTable
+from generators import addrResponseChunks
+
+# The parse that streaming replaced -- the full text, the full tree, and the list of names are all held at once
+def legacyParse(chunks):
+    text = b''.join(chunks).decode()
+    tree = ET.fromstring(text)
+    return [entry.get('name') for entry in tree.findall('./result/address/entry')]
+
+
+# Runs one method in this process, and prints its entry count, parse time, and peak RSS
+def runMethod(method, n):
+    aa = loadScript()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    entries = legacyParse(addrResponseChunks(n)) if method == 'legacy' else aa.parseAddrEntries(addrResponseChunks(n))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(len(entries), f'{elapsed:.3f}', (peak - baseline) // 1024, peak // 1024)
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--method':
+        runMethod(sys.argv[2], int(sys.argv[3]))
+        return
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rows = []
+    for method, label in [('legacy', 'ET.fromstring(r.text)'), ('stream', 'parseAddrEntries (streaming)')]:
+        output = subprocess.run([sys.executable, __file__, '--method', method, str(n)], check=True, capture_output=True, text=True).stdout.split()
+        rows.append([label] + output)
+    print(f'{n} address entries\n')
+    printTable(['parser', 'entries', 'time (s)', 'RSS growth (MiB)', 'peak RSS (MiB)'], rows)
+
+
+if __name__ == '__main__':
+    main()
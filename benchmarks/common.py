@@ -0,0 +1,72 @@
+###############################################################################
+#
+# Script:       common.py
+#
+# Description:  Shared helpers for the add-addresses.py benchmarks. Loads the
+#               script as a module (its file name isn't importable directly),
+#               puts the repo on the path for pan_addresses, and provides
+#               simple timing/table helpers, and the headless push to a mock
+#               device that the end-to-end benchmarks share.
+#
+###############################################################################
+###############################################################################
+
+import os
+import sys
+import time
+import importlib.util
+from mock_panos import MockPanos, API_KEY
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SCRIPT_PATH = os.path.join(REPO_DIR, 'add-addresses.py')
+sys.path.insert(0, REPO_DIR)  # The script imports pan_addresses from its own directory
+
+
+# Loads add-addresses.py as a module named 'addaddresses'
+def loadScript():
+    spec = importlib.util.spec_from_file_location('addaddresses', SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Runs the function and returns the wall time in seconds, along with its return value
+def timeit(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+# Prints rows as a left-aligned table under the given headers
+def printTable(headers, rows):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    print('  '.join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in rows:
+        print('  '.join(str(cell).ljust(w) for cell, w in zip(row, widths)).rstrip())
+
+
+# Pushes the CSV file headless to the device, into the Feed group with --post (the target and options given are applied over
+# these, and the script's own options), with the inventory cache in workDir. Prints the output of a run that didn't finish
+# unless printFailure is False, and returns the seconds the run took and the run summary
+def pushFile(aa, fwip, csvFile, workDir, target=None, options=None, printFailure=True):
+    target = {'device': fwip, 'file': csvFile, 'group': 'Feed', 'value-dups': 'skip', **(target or {})}
+    targetOptions = {**aa.options, 'cache-dir': os.path.join(workDir, 'cache'), 'refresh': True, 'post': True, **(options or {})}
+    seconds, (summary, output) = timeit(aa.runTarget, target, targetOptions, API_KEY)
+    if printFailure and summary['status'] != 'ok':
+        print(output)
+    return seconds, summary
+
+
+# Pushes the CSV file as pushFile does, to a fresh mock device made with the mock options (and set up by setup(mock) before
+# it starts), returning the seconds the run took (without starting the mock), the run summary, and the stopped mock
+def pushToMock(aa, csvFile, workDir, mockOptions=None, setup=None, target=None, options=None, printFailure=True):
+    mock = MockPanos(**(mockOptions or {}))
+    if setup is not None:
+        setup(mock)
+    fwip = mock.start()
+    try:
+        seconds, summary = pushFile(aa, fwip, csvFile, workDir, target, options, printFailure)
+    finally:
+        mock.stop()
+    return seconds, summary, mock
@@ -0,0 +1,130 @@
+###############################################################################
+#
+# Script:       generators.py
+#
+# Description:  Synthetic data generators shared by the add-addresses.py
+#               benchmarks -- mixed ip/fqdn/range input entries and CSV
+#               files, host object lists, device inventory entries, large
+#               address config responses, clustered threat feeds, and ACL
+#               wildcard entries. Every generator is deterministic, so runs
+#               can be compared with each other.
+#
+###############################################################################
+###############################################################################
+
+import random
+
+CHUNK_SIZE = 65536
+
+
+# Returns the 3 low octets of i, so up to 16.7M unique addresses can be made under one first octet
+def octets(i):
+    return f'{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}'
+
+
+# Returns n 'name:address' or 'address' entries, cycling through named and unnamed hosts, networks, FQDNs and ranges
+def addrEntries(n):
+    entries = []
+    for i in range(n):
+        kind = i % 6
+        if kind == 0:
+            entries.append(f'10.{octets(i)}')
+        elif kind == 1:
+            entries.append(f'host-{i}:10.{octets(i)}/32')
+        elif kind == 2:
+            entries.append(f'10.{octets(i)}/24')
+        elif kind == 3:
+            entries.append(f'host{i}.example.com')
+        elif kind == 4:
+            entries.append(f'fqdn-{i}:host{i}.example.com')
+        else:
+            entries.append(f'10.{octets(i)}-11.{octets(i)}')
+    return entries
+
+
+# Writes the entries as a CSV file of name,address rows (the name column is left empty for unnamed entries), returning its path
+def writeCsv(path, entries):
+    with open(path, 'w') as file:
+        for entry in entries:
+            name, _, value = entry.rpartition(':')
+            file.write(f'{name},{value}\n')
+    return path
+
+
+# Returns n unique [name, address] host objects, in the form the script keeps its object lists
+def hostObjects(n, network=10):
+    return [[f'H-{network}.{octets(i)}', f'{network}.{octets(i)}'] for i in range(n)]
+
+
+# Returns n device [name, type, value] inventory entries, where every 20th one shares its address with a host from hostObjects
+def inventoryEntries(n):
+    entries = []
+    for i in range(n):
+        entries.append([f'existing-{i}', 'ip-netmask', f'10.{octets(i)}/32' if i % 20 == 5 else f'172.{octets(i)}'])
+    return entries
+
+
+# Yields a synthetic address config response with n entries (hosts with a description and tag, FQDNs, and ranges), in
+# chunks, the way iter_content would
+def addrResponseChunks(n, chunkSize=CHUNK_SIZE):
+    buffer = '<response status="success" code="19"><result total-count="1" count="1"><address>'
+    for i in range(n):
+        if i % 3 == 0:
+            buffer += f'<entry name="host-{i}"><ip-netmask>10.{octets(i)}</ip-netmask><description>synthetic host {i}</description><tag><member>bench</member></tag></entry>'
+        elif i % 3 == 1:
+            buffer += f'<entry name="fqdn-{i}"><fqdn>host{i}.example.com</fqdn><description>synthetic fqdn {i}</description></entry>'
+        else:
+            buffer += f'<entry name="range-{i}"><ip-range>10.{octets(i)}-11.{octets(i)}</ip-range></entry>'
+        if len(buffer) >= chunkSize:
+            yield buffer.encode()
+            buffer = ''
+    yield (buffer + '</address></result></response>').encode()
+
+
+# Returns n unnamed entries the way threat feeds and IPAM exports list them, shuffled -- mostly runs of adjacent hosts of
+# varying length, with some networks and ranges that overlap or touch them
+def feedEntries(n, seed=1):
+    rng = random.Random(seed)
+    entries, address = [], 0
+    while len(entries) < n:
+        address += rng.randint(2, 300)
+        kind = rng.random()
+        if kind < .85:
+            length = rng.randint(1, 64)
+            entries.extend(f'10.{octets(address + i)}' for i in range(length))
+        elif kind < .95:
+            length = 256
+            entries.append(f'10.{octets(address >> 8 << 8)}/24')
+        else:
+            length = rng.randint(2, 100)
+            entries.append(f'10.{octets(address)}-10.{octets(address + length - 1)}')
+        address += length
+    rng.shuffle(entries)
+    return entries[:n]
+
+
+# Returns n IP wildcard entries the way an ACL migration lists them -- mostly hosts and /24 style masks, with some larger and
+# non-contiguous masks. Each mask has its own first octet, so only the entries moved under another mask's first octet (about
+# 1 in 50) can overlap, and about 1 in 100 entries has an address bit set under its mask
+def wildcardEntries(n, seed=1):
+    rng = random.Random(seed)
+    masks = ['0.0.0.0'] * 8 + ['0.0.0.255'] * 6 + ['0.0.0.3'] * 4 + ['0.0.3.255', '0.0.255.0']
+    counters = {}
+    entries = []
+    for i in range(n):
+        mask = masks[i % len(masks)]
+        maskBits = int.from_bytes(bytes(map(int, mask.split('.'))), 'big')
+        count = counters[mask] = counters.get(mask, -1) + 1
+        address, bit = 0, 0
+        for position in range(24):  # Spreads the mask's entry count over the bits its mask doesn't ignore
+            if not maskBits >> position & 1:
+                address |= (count >> bit & 1) << position
+                bit += 1
+        firstOctet = 10 + sorted(set(masks)).index(mask)
+        if rng.random() < .02:
+            firstOctet = 10 + rng.randrange(len(set(masks)))
+        address |= firstOctet << 24
+        if maskBits and rng.random() < .01:
+            address |= maskBits & -maskBits  # Sets the lowest bit under the wildcard
+        entries.append(f'{address >> 24}.{address >> 16 & 255}.{address >> 8 & 255}.{address & 255}/{mask}')
+    return entries
@@ -0,0 +1,383 @@
+###############################################################################
+#
+# Script:       mock_panos.py
+#
+# Description:  A local mock of the PAN-OS XML API, covering the calls that
+#               add-addresses.py makes -- keygen, config get/set/edit/delete,
+#               and the dg-hierarchy and multi-vsys op commands. Gets and
+#               deletes accept "or" predicates on the last xpath step. The
+#               config is held in an ElementTree, so objects that are set can
+#               be read back. The server counts API calls and TCP connections, and can add a
+#               fixed latency to each call to mimic a remote management plane.
+#               Sets leave pending changes until commit() is called, which also
+#               bumps the config audit version. A fraction of calls (or only
+#               the calls of some config actions) can be failed on purpose,
+#               with an HTTP 503 or a PAN-OS error response, to measure how
+#               retries and failures are handled.
+#
+# Usage:        python benchmarks/mock_panos.py [--port 8443] [--latency 0.05] [--error-rate 0.01] [--error-status 503] [--firewall]
+#
+# Requirements: openssl (used to create a throwaway self-signed certificate)
+#
+###############################################################################
+###############################################################################
+
+import os
+import ssl
+import random
+import sys
+import socket
+import time
+import tempfile
+import threading
+import subprocess
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.etree import ElementTree as ET
+
+USERNAME, PASSWORD, API_KEY = 'admin', 'admin', 'MOCKAPIKEY'
+
+
+# Creates a throwaway self-signed certificate and key, returning their file paths
+def makeCert():
+    certDir = tempfile.mkdtemp(prefix='mock_panos_')
+    certFile, keyFile = os.path.join(certDir, 'cert.pem'), os.path.join(certDir, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1', '-subj', '/CN=localhost',
+                    '-keyout', keyFile, '-out', certFile], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return certFile, keyFile
+
+
+# Builds an empty config tree for a Panorama with the given {device group: parent} hierarchy, or for a firewall
+def buildConfig(deviceGroups=None, vsys=('vsys1',)):
+    config = ET.Element('config')
+    ET.SubElement(ET.SubElement(config, 'shared'), 'address')
+    device = ET.SubElement(ET.SubElement(config, 'devices'), 'entry', name='localhost.localdomain')
+    if deviceGroups is not None:
+        dgRoot = ET.SubElement(device, 'device-group')
+        for dg in deviceGroups:
+            ET.SubElement(ET.SubElement(dgRoot, 'entry', name=dg), 'address')
+    else:
+        vsysRoot = ET.SubElement(device, 'vsys')
+        for name in vsys:
+            ET.SubElement(ET.SubElement(vsysRoot, 'entry', name=name), 'address')
+    return config
+
+
+# Finds the element at a PAN-OS xpath, creating any missing nodes along the way when create is True
+def findXpath(config, xpath, create=False):
+    node = config
+    steps = xpath.strip('/').split('/')
+    if steps[0] != 'config':
+        return None
+    for step in steps[1:]:
+        child = node.find(step)
+        if child is None:
+            if not create:
+                return None
+            tag, _, predicate = step.partition('[')
+            child = ET.SubElement(node, tag)
+            if predicate.startswith("@name='"):
+                child.set('name', predicate[7:predicate.index("'", 7)])
+        node = child
+    return node
+
+
+# Merges the new element into the existing one the same way a PAN-OS set does -- entries merge by name, and members are added if missing
+def mergeElement(existing, new):
+    entries = {child.get('name'): child for child in existing.iterfind('entry')}
+    members = set(child.text for child in existing.iterfind('member'))
+    for child in new:
+        if child.tag == 'entry':
+            match = entries.get(child.get('name'))
+            if match is None:
+                entries[child.get('name')] = child
+        elif child.tag == 'member':
+            if child.text not in members:
+                members.add(child.text)
+                existing.append(child)
+            continue
+        else:
+            match = existing.find(child.tag)
+        if match is None:
+            existing.append(child)
+        elif len(child):
+            mergeElement(match, child)
+        else:
+            match.text = child.text
+
+
+# Returns the elements that match an "or" predicate of @name='x', text()='x', <child>='x', and translate(<child>,'A..Z','a..z')='x'
+# clauses, as used by targeted lookups and deletes
+def matchPredicate(elements, predicate):
+    wanted, folded = {}, {}
+    for clause in predicate.split(' or '):
+        key, _, value = clause.partition('=')
+        if key.startswith('translate('):
+            folded.setdefault(key[10:key.index(',')], set()).add(value.strip("'"))
+        else:
+            wanted.setdefault(key, set()).add(value.strip("'"))
+    names, texts = wanted.pop('@name', set()), wanted.pop('text()', set())
+    matches = []
+    for element in elements:
+        if (element.get('name') in names or element.text in texts or any(child.text in wanted[child.tag] for child in element if child.tag in wanted)
+                or any((child.text or '').lower() in folded[child.tag] for child in element if child.tag in folded)):
+            matches.append(element)
+    return matches
+
+
+# Splits the xpath into the parent xpath and the last step, ignoring any '/' inside a predicate (such as in an address value)
+def splitLastStep(xpath):
+    depth = 0
+    for i in range(len(xpath) - 1, -1, -1):
+        if xpath[i] == ']':
+            depth += 1
+        elif xpath[i] == '[':
+            depth -= 1
+        elif xpath[i] == '/' and depth == 0:
+            return xpath[:i], xpath[i + 1:]
+    return '', xpath
+
+
+class MockPanos:
+
+    def __init__(self, deviceGroups=None, vsys=('vsys1',), multiVsys=False, latency=0.0, errorRate=0.0, errorStatus=503, errorCode=13,
+                 errorActions=None, seed=0):
+        self.deviceGroups = deviceGroups  # {device group: parent device group or None}, or None for a firewall
+        self.multiVsys = multiVsys
+        self.latency = latency
+        self.errorRate, self.errorStatus = errorRate, errorStatus  # errorStatus 200 fails the call with a PAN-OS error response instead
+        self.errorCode = errorCode  # The PAN-OS error code of injected error responses (13 is operation failed, 22 is session timed out)
+        self.errorActions = errorActions  # Config actions whose calls can fail, such as ('set',), or None for every call
+        self.random = random.Random(seed)  # Seeded, so the same calls fail on every run
+        self.errors = 0
+        self.config = buildConfig(deviceGroups, vsys)
+        self.auditVersion, self.pendingChanges = 1, False
+        self.lock = threading.Lock()
+        self.calls, self.connections, self.bytesIn, self.bytesOut = 0, 0, 0, 0
+        self.server, self.thread = None, None
+
+    # Adds a device group to the hierarchy and the config
+    def addDeviceGroup(self, dg, parent=None):
+        self.deviceGroups[dg] = parent
+        dgEntry = ET.SubElement(self.config.find('./devices/entry/device-group'), 'entry', name=dg)
+        ET.SubElement(dgEntry, 'address')
+
+    # Adds n synthetic address objects (hosts named <prefix>-<i>) at the xpath, returning their names
+    def addAddresses(self, xpath, n, prefix='existing', network=172):
+        node = findXpath(self.config, xpath, create=True)
+        names = []
+        for i in range(n):
+            name = f'{prefix}-{i}'
+            entry = ET.SubElement(node, 'entry', name=name)
+            ET.SubElement(entry, 'ip-netmask').text = f'{network}.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}'
+            names.append(name)
+        return names
+
+    # Adds an address group at the xpath with the static members, or a dynamic group when members is None
+    def addGroup(self, xpath, name, members):
+        entry = ET.SubElement(findXpath(self.config, xpath, create=True), 'entry', name=name)
+        if members is None:
+            ET.SubElement(ET.SubElement(entry, 'dynamic'), 'filter').text = "'bench'"
+        else:
+            static = ET.SubElement(entry, 'static')
+            for member in members:
+                ET.SubElement(static, 'member').text = member
+
+    # Commits the candidate config, clearing the pending changes and bumping the config audit version
+    def commit(self):
+        with self.lock:
+            self.auditVersion += 1
+            self.pendingChanges = False
+
+    # Writes the config to a file the way a saved Panorama or firewall config looks, with the device group hierarchy
+    # in its readonly section, for dry runs of the script
+    def exportConfig(self, path):
+        with self.lock:
+            config = ET.fromstring(ET.tostring(self.config))
+        if self.deviceGroups is not None:
+            dgRoot = ET.SubElement(ET.SubElement(ET.SubElement(ET.SubElement(config, 'readonly'), 'devices'), 'entry', name='localhost.localdomain'), 'device-group')
+            for dg, parent in self.deviceGroups.items():
+                entry = ET.SubElement(dgRoot, 'entry', name=dg)
+                if parent:
+                    ET.SubElement(entry, 'parent-dg').text = parent
+        ET.ElementTree(config).write(path)
+
+    # Resets the call and connection counters
+    def resetCounters(self):
+        with self.lock:
+            self.calls, self.connections, self.bytesIn, self.bytesOut, self.errors = 0, 0, 0, 0, 0
+
+    # Returns True if this call should fail, counting it as an injected error
+    def injectError(self, params):
+        if self.errorActions is not None and params.get('action') not in self.errorActions:
+            return False
+        with self.lock:
+            if self.errorRate and self.random.random() < self.errorRate:
+                self.errors += 1
+                return True
+        return False
+
+    # Builds the <dg-hierarchy> op result from the {device group: parent} mapping
+    def dgHierarchy(self):
+        root = ET.Element('dg-hierarchy')
+        nodes = {}
+        for dg in self.deviceGroups:
+            nodes[dg] = ET.Element('dg', name=dg)
+        for dg, parent in self.deviceGroups.items():
+            (nodes[parent] if parent else root).append(nodes[dg])
+        return root
+
+    # Returns the parent of the xpath's last step, along with the elements the last step selects
+    # (predicates that ElementTree can't evaluate, such as an "or" of clauses, are matched by matchPredicate)
+    def select(self, xpath, create=False):
+        parentXpath, last = splitLastStep(xpath)
+        parent = findXpath(self.config, parentXpath, create=create)
+        if parent is None:
+            return None, []
+        tag, _, predicate = last.partition('[')
+        if predicate.endswith(']') and (' or ' in predicate or 'text()' in predicate or not predicate.startswith('@name=')):
+            return parent, matchPredicate(parent.iterfind(tag), predicate[:-1])
+        node = parent.find(last)
+        return parent, [] if node is None else [node]
+
+    # Handles a single API call, returning the XML response
+    def handle(self, params):
+        apiType, action = params.get('type'), params.get('action')
+        if apiType == 'keygen':
+            if params.get('user') == USERNAME and params.get('password') == PASSWORD:
+                return f'<response status="success"><result><key>{API_KEY}</key></result></response>'
+            return '<response status="error" code="403"><result><msg>Invalid Credential</msg></result></response>'
+        if params.get('key') != API_KEY:
+            return '<response status="error" code="403"><result><msg>Invalid credentials.</msg></result></response>'
+        if apiType == 'op':
+            cmd = params.get('cmd', '')
+            if '<dg-hierarchy>' in cmd and self.deviceGroups is not None:
+                return f'<response status="success"><result>{ET.tostring(self.dgHierarchy(), encoding="unicode")}</result></response>'
+            if '<pending-changes>' in cmd:
+                return f'<response status="success"><result>{"yes" if self.pendingChanges else "no"}</result></response>'
+            if '<audit>' in cmd:
+                versions = ''.join(f'<entry><version>{v}</version><admin>admin</admin></entry>' for v in range(1, self.auditVersion + 1))
+                return f'<response status="success"><result>{versions}</result></response>'
+            if '<multi-vsys>' in cmd:
+                return f'<response status="success"><result>{"on" if self.multiVsys else "off"}</result></response>'
+            return '<response status="error" code="17"><msg><line>Invalid syntax.</line></msg></response>'
+        if apiType == 'config' and action in ('get', 'show'):
+            with self.lock:
+                parent, matches = self.select(params.get('xpath', ''))
+                result = ''.join(ET.tostring(element, encoding='unicode') for element in matches)  # A predicate returns each matching element
+            return f'<response status="success" code="19"><result total-count="1" count="1">{result}</result></response>'
+        if apiType == 'config' and action == 'delete':
+            with self.lock:
+                parent, matches = self.select(params.get('xpath', ''))
+                for element in matches:
+                    parent.remove(element)
+                self.pendingChanges = self.pendingChanges or bool(matches)
+            return '<response status="success" code="20"><msg>command succeeded</msg></response>'
+        if apiType == 'config' and action == 'edit':
+            try:
+                new = ET.fromstring(params.get('element', ''))
+            except ET.ParseError:
+                return '<response status="error" code="12"><msg><line>Malformed element</line></msg></response>'
+            with self.lock:
+                parent, matches = self.select(params.get('xpath', ''), create=True)
+                if matches:
+                    parent[list(parent).index(matches[0])] = new
+                else:
+                    parent.append(new)
+                self.pendingChanges = True
+            return '<response status="success" code="20"><msg>command succeeded</msg></response>'
+        if apiType == 'config' and action == 'set':
+            try:
+                new = ET.fromstring(f"<root>{params.get('element', '')}</root>")
+            except ET.ParseError:
+                return '<response status="error" code="12"><msg><line>Malformed element</line></msg></response>'
+            with self.lock:
+                mergeElement(findXpath(self.config, params.get('xpath', ''), create=True), new)
+                self.pendingChanges = True
+            return '<response status="success" code="20"><msg>command succeeded</msg></response>'
+        return '<response status="error" code="12"><msg><line>Unsupported call</line></msg></response>'
+
+    # Starts the HTTPS server on a background thread, returning the 'host:port' address to use as the device address
+    def start(self, host='127.0.0.1', port=0):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Allows keep-alive connections, so connection reuse can be counted
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Avoids a delayed-ACK stall between the headers and the body
+                with mock.lock:
+                    mock.connections += 1
+
+            def respond(self, params):
+                if mock.latency:
+                    time.sleep(mock.latency)
+                params = {key: values[-1] for key, values in params.items()}
+                status = 200
+                if mock.injectError(params):
+                    status = mock.errorStatus
+                    body = f'<response status="error" code="{mock.errorCode}"><msg><line>Injected failure</line></msg></response>'.encode()
+                else:
+                    body = mock.handle(params).encode()
+                with mock.lock:
+                    mock.calls += 1
+                    mock.bytesOut += len(body)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/xml')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                with mock.lock:
+                    mock.bytesIn += len(self.path)
+                self.respond(parse_qs(url.query, keep_blank_values=True))
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()
+                with mock.lock:
+                    mock.bytesIn += len(self.path) + len(body)
+                params = parse_qs(url.query, keep_blank_values=True)
+                params.update(parse_qs(body, keep_blank_values=True))
+                self.respond(params)
+
+            def log_message(self, format, *args):
+                pass
+
+        certFile, keyFile = makeCert()
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certFile, keyFile)
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return f'{host}:{self.server.server_address[1]}'
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    args = sys.argv[1:]
+    port = int(args[args.index('--port') + 1]) if '--port' in args else 8443
+    latency = float(args[args.index('--latency') + 1]) if '--latency' in args else 0.0
+    errorRate = float(args[args.index('--error-rate') + 1]) if '--error-rate' in args else 0.0
+    errorStatus = int(args[args.index('--error-status') + 1]) if '--error-status' in args else 503
+    deviceGroups = None if '--firewall' in args else {'DG-Parent': None, 'DG-Child': 'DG-Parent'}
+    mock = MockPanos(deviceGroups=deviceGroups, latency=latency, errorRate=errorRate, errorStatus=errorStatus)
+    address = mock.start(port=port)
+    print(f'Mock PAN-OS API listening on https://{address} -- user {USERNAME}, password {PASSWORD}, press CTRL+C to stop')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+###############################################################################
+#
+# Script:       suite.py
+#
+# Description:  Runs the main stages of add-addresses.py on synthetic mixed
+#               ip/fqdn/range input at several sizes (1k, 10k, 100k and 1M
+#               objects by default) -- parsing, the duplicate checks against a
+#               device inventory of the same size, building the set call
+#               elements (GET and POST batches), and an end-to-end headless
+#               push of a CSV file to a mock firewall with --post. The mock
+#               can add latency to each call, and fail a fraction of calls to
+#               measure the cost of retries. Use this to measure performance
+#               work on the script before and after a change.
+#
+# Usage:        python benchmarks/suite.py [objects ...] [--latency seconds] [--error-rate fraction] [--error-status 503]
+#                                          [--max-push objects]
+#
+###############################################################################
+###############################################################################
+
+import os
+import sys
+import tempfile
+from common import loadScript, timeit, printTable, pushToMock
+from mock_panos import API_KEY
+from generators import addrEntries, writeCsv, inventoryEntries
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+# Returns the value of the command line option, or the default
+def argValue(name, default, convert=float):
+    return convert(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+
+# Parses the entries and builds the object lists, as the script does for a CSV file
+def parseStage(aa, entries):
+    aa.addrObj_ip, aa.addrObj_fqdn, aa.addrObj_range, aa.addrObj_wildcard = [], [], [], []
+    aa.addrObjBuilder(*aa.parse_addrList(entries, ['add-addresses.py']))
+
+
+# Runs the duplicate checks of the list, and against the names and addresses of the device inventory
+def dedupStage(aa, inventory):
+    aa.checkListDups()
+    aa.findPanDups(aa.allObjNames, [entry[0] for entry in inventory])
+    addrValues = {}
+    aa.indexAddrEntries(inventory, [], addrValues)
+    return aa.objValueDups(addrValues)
+
+
+# Builds every set call element for the object lists, returning the number of batches
+def buildStage(aa, post):
+    aa.options['post'] = post
+    apiCall_piece, limit = aa.getBatchLimit('192.0.2.1', API_KEY, "/config/devices/entry/vsys/entry[@name='vsys1']/address")
+    return sum(1 for _ in aa.elementBuilder(apiCall_piece, limit))
+
+
+def main():
+    latency = argValue('--latency', 0.02)
+    errorRate = argValue('--error-rate', 0.0)
+    errorStatus = argValue('--error-status', 503, int)
+    maxPush = argValue('--max-push', None, int)
+    sizes = [int(arg) for i, arg in enumerate(sys.argv[1:], 1) if arg.isdigit() and not sys.argv[i - 1].startswith('--')] or DEFAULT_SIZES
+    aa = loadScript()
+    workDir = tempfile.mkdtemp(prefix='bench_suite_')
+    rows, failures = [], []
+    for n in sizes:
+        entries = addrEntries(n)
+        parse_time, _ = timeit(parseStage, aa, entries)
+        dedup_time, _ = timeit(dedupStage, aa, inventoryEntries(n))
+        get_time, getBatches = timeit(buildStage, aa, False)
+        post_time, postBatches = timeit(buildStage, aa, True)
+        row = [n, f'{parse_time:.3f}', f'{dedup_time:.3f}', f'{get_time:.3f}', getBatches, f'{post_time:.3f}', postBatches]
+        if maxPush is None or n <= maxPush:
+            csvFile = writeCsv(os.path.join(workDir, f'feed-{n}.csv'), entries)
+            push_time, summary, mock = pushToMock(aa, csvFile, workDir, {'latency': latency, 'errorRate': errorRate, 'errorStatus': errorStatus},
+                                                  lambda mock: mock.addAddresses("/config/devices/entry/vsys/entry[@name='vsys1']/address", 1000),
+                                                  printFailure=False)  # The failures are listed after the table
+            row += [summary['status'], summary['created'], mock.calls, mock.errors, f'{push_time:.2f}']
+            if summary['status'] != 'ok':
+                failures.append(f"{n} objects: {summary['error']}")
+        else:
+            row += ['skipped', '', '', '', '']
+        rows.append(row)
+    failure = 'a PAN-OS error response' if errorStatus == 200 else f'HTTP {errorStatus}'
+    print(f'Mixed ip/fqdn/range objects, end-to-end push with --post, {latency}s latency per call, {errorRate:.1%} of calls failed with {failure}\n')
+    printTable(['objects', 'parse (s)', 'dedup (s)', 'GET build (s)', 'GET calls', 'POST build (s)', 'POST calls',
+                'push', 'created', 'API calls', 'injected errors', 'push (s)'], rows)
+    if failures:
+        print('\nFailed pushes:\n  ' + '\n  '.join(failures))
+
+
+if __name__ == '__main__':
+    main()
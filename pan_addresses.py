@@ -0,0 +1,812 @@
+###############################################################################
+#
+# Module:       pan_addresses.py
+#
+# Description:  The address object functions of add-addresses.py, as a library
+#               for services that import address objects from a long running
+#               process. Entries are parsed into compact AddrRecord tuples,
+#               built into AddrObject tuples, checked for duplicates, and
+#               turned into set call elements by plain functions that keep no
+#               state between calls. A PanClient holds the connection to one
+#               device, and importAddresses runs a whole import through it,
+#               without any of the prompts of the script. requests (and numpy,
+#               for the IP wildcard checks) are only imported when first used,
+#               so importing the module stays fast and light.
+#
+# Usage:        import pan_addresses
+#
+#               records, errors = pan_addresses.parseEntries(['web01:10.1.1.10', 'example.com'])
+#               with pan_addresses.PanClient('192.0.2.1', apiKey) as client:
+#                   result = pan_addresses.importAddresses(client, records, group='Web Servers')
+#
+# Requirements: requests, for PanClient (numpy is optional, and speeds up the checks of large IP wildcard lists)
+#
+# Python:       Version 3
+#
+###############################################################################
+###############################################################################
+
+import re
+import time
+import socket
+from operator import itemgetter
+from collections import namedtuple
+
+###############################################################################
+###############################################################################
+
+# A classified address entry -- kind is 'ip-netmask', 'fqdn', 'ip-range', or 'ip-wildcard', name is None when the entry wasn't
+# given one, and prefix is the mask length of an ip-netmask entry (None when no mask was given)
+AddrRecord = namedtuple('AddrRecord', ['kind', 'name', 'value', 'prefix'])
+
+# An address object as it's created on the device
+AddrObject = namedtuple('AddrObject', ['name', 'kind', 'value'])
+
+# The address types, in the order their objects are pushed
+ADDR_TYPES = ('ip-netmask', 'fqdn', 'ip-range', 'ip-wildcard')
+
+# The ways the address entries can be aggregated, and the answers accepted for objects whose address exists under another name
+AGGREGATE_MODES = ('cidr', 'range')
+VALUE_DUP_CHOICES = ('skip', 'reuse', 'create')
+
+# Patterns are compiled once at import, and the 4 address types share a single pattern so each entry is only matched once
+ipv4_pattern = r'(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)'
+addrName_re = re.compile(r'^(?:([A-Za-z\d])|(([A-Za-z\d])([\w \.-]){0,61}([\w\.-])))$')
+addrValue_re = re.compile(rf'^(?:(?P<ip>{ipv4_pattern})(?:/(?:(?P<prefix>3[0-2]|2[0-9]|1[0-9]|[1-9])|(?P<wildcard>{ipv4_pattern})))?|(?P<fqdn>([a-z0-9]+(-[a-z0-9]+)*\.)+[a-z]{{2,}})|(?P<range>{ipv4_pattern}-{ipv4_pattern}))$')
+
+# PAN-OS error codes for internal errors and session timeouts, which are worth retrying, and the backoff in seconds
+# before the first retry of a config call, which doubles with each retry up to the most it will wait
+TRANSIENT_CODES = ('2', '3', '4', '5', '11', '21', '22')
+RETRY_BACKOFF, RETRY_BACKOFF_MAX = 1.0, 30.0
+
+# numpy, once the IP wildcard checks have loaded it -- False until then, and None when it isn't installed, in which case
+# the checks fall back to pure Python, which is slower on large lists
+numpy = False
+
+
+# Returns numpy, importing it on first use, or None when it isn't installed
+def loadNumpy():
+    global numpy
+    if numpy is False:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        numpy = module
+    return numpy
+
+
+# Reads the csv file one row at a time, yielding the line number and columns of each row that isn't blank
+def csvRows(variables_file):
+    import csv
+    with open(variables_file, 'r', newline='', encoding='utf-8-sig') as file:
+        reader = csv.reader(file)
+        for row in reader:
+            while row and row[-1].strip() == '':
+                row.pop()  # Removes the empty columns at the end of the row
+            if row:
+                yield reader.line_num, row
+
+
+# Classifies the csv file one row at a time, yielding (entry, record) for each address object entry,
+# where the entry is only filled in (with the line number and row) when the row is invalid
+def csvRecords(variables_file):
+    for line_num, row in csvRows(variables_file):
+        if len(row) == 1:
+            record = classifyValue(None, row[0].strip())
+        elif len(row) == 2:
+            record = classifyValue(row[0] if row[0] != '' else None, row[1].strip())  # No name is given when the first column is empty
+        else:
+            record = None
+        yield (None if record else f"line {line_num}: {':'.join(row).lstrip(':')}"), record
+
+
+# Classifies a 'name:address' or 'address' entry in a single pass, returning an AddrRecord, or None if the entry is invalid
+def classifyAddr(addr):
+    name, sep, value = addr.partition(':')
+    if sep:
+        return classifyValue(name, value.lstrip())
+    return classifyValue(None, addr)
+
+
+# Classifies an address, along with its name if one was given, returning an AddrRecord, or None if either is invalid
+def classifyValue(name, value):
+    if name is not None and not addrName_re.match(name):
+        return None
+    addr_r = addrValue_re.match(value)
+    if addr_r is None:
+        return None
+    if addr_r.group('ip'):
+        if addr_r.group('wildcard'):
+            return AddrRecord('ip-wildcard', name, value, None)  # An IP with a wildcard mask, rather than a mask length
+        prefix = addr_r.group('prefix')
+        return AddrRecord('ip-netmask', name, value, int(prefix) if prefix else None)
+    elif addr_r.group('fqdn'):
+        return AddrRecord('fqdn', name, value, None)
+    else:
+        return AddrRecord('ip-range', name, value, None)
+
+
+# Separates the classified (entry, record) pairs into the records and the invalid entries. IP wildcards whose mask the
+# device would reject are reported as invalid entries too
+def splitRecords(classified):
+    records, errors, _, _ = checkRecords(classified)
+    return records, errors
+
+
+# splitRecords, also returning the IP wildcard records with address bits set under the mask, and the (record, other record)
+# pairs that overlap, which the device accepts but are worth reporting
+def checkRecords(classified):
+    records, errors, wildcards = [], [], []
+    for entry, record in classified:
+        if record is None:
+            errors.append(entry)
+        else:
+            records.append(record)
+            if record.kind == 'ip-wildcard':
+                wildcards.append(record)
+    badMasks, hostBits, overlaps = checkWildcards(wildcards)
+    if badMasks:
+        badSet = set(badMasks)
+        records = [record for record in records if record not in badSet]
+        errors += [f'{recordEntry(record)} (the wildcard mask must start with a 0 bit)' for record in badMasks]
+    return records, errors, hostBits, overlaps
+
+
+# Classifies the 'name:address' or 'address' entries, returning the AddrRecords and the entries that are invalid
+def parseEntries(entries):
+    return splitRecords((entry, classifyAddr(entry)) for entry in entries)
+
+
+# Classifies the rows of the csv file, returning the AddrRecords and the rows that are invalid (with their line numbers)
+def readCsv(path):
+    return splitRecords(csvRecords(path))
+
+
+# Returns the record in the 'name:address' or 'address' format it was entered in
+def recordEntry(record):
+    return record.value if record.name is None else f'{record.name}:{record.value}'
+
+
+# Returns the addresses and wildcard masks of the ip-wildcard records as integers -- as arrays with numpy, which converts
+# every octet in one pass, otherwise as lists
+def wildcardInts(records):
+    numpy = loadNumpy()
+    if numpy is not None:
+        octets = numpy.fromstring('.'.join(record.value for record in records).replace('/', '.'), dtype=numpy.int64, sep='.').reshape(-1, 8)
+        weights = numpy.array([1 << 24, 1 << 16, 1 << 8, 1], dtype=numpy.int64)
+        return octets[:, :4] @ weights, octets[:, 4:] @ weights
+    addresses, masks = [], []
+    for record in records:
+        address, _, mask = record.value.partition('/')
+        addresses.append(ipToInt(address))
+        masks.append(ipToInt(mask))
+    return addresses, masks
+
+
+# Checks the ip-wildcard records together, returning the records whose wildcard mask doesn't start with a 0 bit (which the
+# device rejects), the records with address bits set under the wildcard bits (which the device ignores), and a (record,
+# other record) pair for each record that matches some of the same addresses as another. Two wildcards overlap when their
+# addresses agree on every bit that neither mask ignores, so the records are grouped by mask, and each pair of groups is
+# compared once on those bits with array operations (or dictionaries without numpy), pairing records both ways. The work
+# grows with the square of the number of distinct masks, which is small for ACLs, but a list of hundreds of non-contiguous
+# masks takes seconds
+def checkWildcards(records):
+    if not records:
+        return [], [], []
+    addresses, masks = wildcardInts(records)
+    numpy = loadNumpy()
+    overlaps = {}
+    if numpy is not None:
+        badMasks = numpy.flatnonzero(masks >> 31).tolist()
+        hostBits = numpy.flatnonzero(addresses & masks).tolist()
+        networks = addresses & ~masks & 0xFFFFFFFF
+        uniqueMasks, maskGroups = numpy.unique(masks, return_inverse=True)
+        groups = [numpy.flatnonzero(maskGroups == group) for group in range(len(uniqueMasks))]
+        for a in range(len(groups)):
+            keys = networks[groups[a]]  # Every bit the group's own mask doesn't ignore is already its network
+            uniqueKeys, first = numpy.unique(keys, return_index=True)
+            last = len(keys) - 1 - numpy.unique(keys[::-1], return_index=True)[1]
+            found = numpy.searchsorted(uniqueKeys, keys)
+            partners = groups[a][numpy.where(first[found] == numpy.arange(len(keys)), last[found], first[found])]  # The first of a duplicate is paired with the last
+            hits = partners != groups[a]
+            for i, j in zip(groups[a][hits].tolist(), partners[hits].tolist()):
+                overlaps.setdefault(i, j)
+            for b in range(a + 1, len(groups)):
+                care = ~(int(uniqueMasks[a]) | int(uniqueMasks[b])) & 0xFFFFFFFF
+                keysA, keysB = networks[groups[a]] & care, networks[groups[b]] & care
+                for group, keys, other, otherKeys in ((groups[a], keysA, groups[b], keysB), (groups[b], keysB, groups[a], keysA)):
+                    uniqueKeys, first = numpy.unique(otherKeys, return_index=True)
+                    found = numpy.minimum(numpy.searchsorted(uniqueKeys, keys), len(uniqueKeys) - 1)
+                    hits = uniqueKeys[found] == keys
+                    for i, j in zip(group[hits].tolist(), other[first[found[hits]]].tolist()):
+                        overlaps.setdefault(i, j)
+    else:
+        badMasks = [i for i, mask in enumerate(masks) if mask >> 31]
+        hostBits = [i for i, (address, mask) in enumerate(zip(addresses, masks)) if address & mask]
+        networks = [address & ~mask & 0xFFFFFFFF for address, mask in zip(addresses, masks)]
+        groups = {}
+        for i, mask in enumerate(masks):
+            groups.setdefault(mask, []).append(i)
+        sortedMasks = sorted(groups)  # In the same order as numpy.unique, so both report the same pairs
+        for a, maskA in enumerate(sortedMasks):
+            first, last = {}, {}
+            for j in groups[maskA]:
+                first.setdefault(networks[j], j)
+                last[networks[j]] = j
+            for i in groups[maskA]:
+                j = first[networks[i]]
+                if j == i:
+                    j = last[networks[i]]  # The first of a duplicate is paired with the last
+                if j != i:
+                    overlaps.setdefault(i, j)
+            for maskB in sortedMasks[a + 1:]:
+                care = ~(maskA | maskB) & 0xFFFFFFFF
+                for group, other in ((groups[maskA], groups[maskB]), (groups[maskB], groups[maskA])):
+                    first = {}
+                    for j in other:
+                        first.setdefault(networks[j] & care, j)
+                    for i in group:
+                        j = first.get(networks[i] & care)
+                        if j is not None:
+                            overlaps.setdefault(i, j)
+    return [records[i] for i in badMasks], [records[i] for i in hostBits], [(records[i], records[j]) for i, j in sorted(overlaps.items())]
+
+
+# Returns the name of the object for the record, which is made from the address when no name was given
+def addrObjName(record):
+    if record.name is not None:
+        return record.name
+    elif record.kind == 'fqdn':
+        return record.value  # If no name is given for the fqdn object, then the name will be the same as the address
+    elif record.kind == 'ip-range':
+        return f'range_{record.value}'  # If no name is given for the range object, then the name will be the same as the address, with a 'range_' prefix
+    elif record.kind == 'ip-wildcard':
+        return f'W-{record.value.replace("/", "-")}'  # Create the name of the wildcard object with the 'W-' prefix, address, and -<wildcard mask> suffix
+    elif record.prefix is None or record.prefix == 32:
+        return f'H-{record.value.partition("/")[0]}'  # If the ip object has no mask or /32 mask, then make name the same as the address, with a 'H-' prefix
+    return f'N-{record.value.partition("/")[0]}-{record.prefix}'  # Create the name of the ip object with the 'N-' prefix, address, and -<mask> suffix
+
+
+# Returns the AddrObjects for the records, in push order (by address type, then in the order they were given)
+def buildObjects(records):
+    objects = {addrType: [] for addrType in ADDR_TYPES}
+    for record in records:
+        objects[record.kind].append(AddrObject(addrObjName(record), record.kind, record.value))
+    return [obj for addrType in ADDR_TYPES for obj in objects[addrType]]
+
+
+# Returns {name: count} for each name that more than one of the objects uses
+def findListDups(objects):
+    return findNameDups(obj.name for obj in objects)
+
+
+# Returns {name: count} for each name that's in the names more than once
+def findNameDups(names):
+    nameCounts = {}
+    for name in names:
+        nameCounts[name] = nameCounts.get(name, 0) + 1
+    return {name: count for name, count in nameCounts.items() if count > 1}
+
+
+# Returns the IPv4 address as an integer. inet_pton only takes plain dotted decimal, so an octet with a leading zero (which
+# the address pattern allows) is read the slow way, as a decimal number
+def ipToInt(ip):
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big')
+    except OSError:
+        a, b, c, d = ip.split('.')
+        return int(a) << 24 | int(b) << 16 | int(c) << 8 | int(d)
+
+
+# Returns the integer as an IPv4 address
+def intToIp(n):
+    return f'{n >> 24}.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}'
+
+
+# Returns the first and last address that the ip-netmask or ip-range record covers, as integers. The device matches the whole
+# network of an ip-netmask, even when the address has host bits set
+def addrInterval(record):
+    if record.kind == 'ip-range':
+        first, _, last = record.value.partition('-')
+        return ipToInt(first), ipToInt(last)
+    hostBits = 32 - (record.prefix or 32)
+    first = ipToInt(record.value.partition('/')[0]) >> hostBits << hostBits
+    return first, first + (1 << hostBits) - 1
+
+
+# Returns the (first, last) address of the fewest CIDR blocks that cover the interval exactly
+def cidrBlocks(first, last):
+    blocks = []
+    while first <= last:
+        size = 1 << min((first & -first).bit_length() - 1 if first else 32, (last - first + 1).bit_length() - 1)
+        blocks.append((first, first + size - 1))
+        first += size
+    return blocks
+
+
+# Returns the record for a block of addresses -- a host for a single address, otherwise a CIDR block, or a range
+def blockRecord(first, last, mode):
+    if first == last:
+        return AddrRecord('ip-netmask', None, intToIp(first), None)
+    if mode == 'range':
+        return AddrRecord('ip-range', None, f'{intToIp(first)}-{intToIp(last)}', None)
+    prefix = 33 - (last - first + 1).bit_length()
+    return AddrRecord('ip-netmask', None, f'{intToIp(first)}/{prefix}', prefix)
+
+
+# Returns the entries that each of the contiguous blocks covers. The entries are sorted by their first address, so the first
+# block of each entry is found in a single sweep
+def blockCoverage(blocks, covered, records):
+    if len(blocks) == 1:
+        return [[records[i].value for first, last, i in covered]]
+    entries = [[] for block in blocks]
+    block, blockLast = 0, blocks[0][1]
+    for first, last, i in covered:
+        while blockLast < first:
+            block += 1
+            blockLast = blocks[block][1]
+        if last <= blockLast:
+            entries[block].append(records[i].value)  # Most entries are inside a single block
+            continue
+        overlap = block
+        while overlap < len(blocks) and blocks[overlap][0] <= last:
+            entries[overlap].append(records[i].value)
+            overlap += 1
+    return entries
+
+
+# Merges the unnamed ip-netmask and ip-range records that overlap or are adjacent into the fewest objects for the mode, by
+# sorting their intervals and merging them in one pass. A span of merged intervals only replaces its entries when it takes
+# fewer objects than they do, and named entries are never merged, as their names may be used elsewhere. Returns the
+# ip-netmask and ip-range records, and each new record with the entries it covers
+def aggregateAddrRecords(addrObj_ip_raw, addrObj_range_raw, mode):
+    records = addrObj_ip_raw + addrObj_range_raw
+    kept, intervals = [], []
+    for i, record in enumerate(records):
+        if record.name is None:
+            if record.prefix is None and record.kind == 'ip-netmask':
+                first = last = ipToInt(record.value)  # Most entries are hosts, which are their own interval
+            else:
+                first, last = addrInterval(record)
+            if first <= last:
+                intervals.append((first, last, i))
+                continue
+        kept.append(i)  # Named entries are kept, and so are backwards ranges, which are left for the device to reject as before
+    intervals.sort(key=itemgetter(0))  # Sorting on the first address alone compares ints rather than tuples
+    intervals.append((1 << 33, 1 << 33, None))  # Past the last address, so the loop ends the last span
+    aggregated, coverage = [], []
+    spanStart, spanFirst, spanLast = 0, intervals[0][0], intervals[0][1]
+    for n, (first, last, i) in enumerate(intervals):
+        if first <= spanLast + 1:
+            if last > spanLast:
+                spanLast = last
+            continue
+        if n - spanStart == 1:
+            kept.append(intervals[spanStart][2])
+        else:
+            covered = intervals[spanStart:n]
+            blocks = cidrBlocks(spanFirst, spanLast) if mode == 'cidr' else [(spanFirst, spanLast)]
+            if len(blocks) < len(covered):
+                newRecords = [blockRecord(blockFirst, blockLast, mode) for blockFirst, blockLast in blocks]
+                aggregated.extend(newRecords)
+                coverage.extend(zip(newRecords, blockCoverage(blocks, covered, records)))
+            else:
+                kept.extend(interval[2] for interval in covered)
+        spanStart, spanFirst, spanLast = n, first, last
+    kept.sort()  # The entries that weren't merged keep the order they were given in
+    addrRecords = {'ip-netmask': [], 'ip-range': []}
+    for record in [records[i] for i in kept] + aggregated:
+        addrRecords[record.kind].append(record)
+    return addrRecords['ip-netmask'], addrRecords['ip-range'], coverage
+
+
+# Merges the unnamed ip-netmask and ip-range records that overlap or are adjacent into the fewest objects for the mode (cidr or
+# range), returning the records, and each new record with the entries it covers. The other records are passed through unchanged
+def aggregateRecords(records, mode):
+    if mode not in AGGREGATE_MODES:
+        raise ValueError(f"the aggregate mode must be one of {', '.join(AGGREGATE_MODES)}")
+    ipRecords = [record for record in records if record.kind == 'ip-netmask']
+    rangeRecords = [record for record in records if record.kind == 'ip-range']
+    ipRecords, rangeRecords, coverage = aggregateAddrRecords(ipRecords, rangeRecords, mode)
+    return ipRecords + rangeRecords + [record for record in records if record.kind in ('fqdn', 'ip-wildcard')], coverage
+
+
+# Normalizes an address value so that equivalent addresses compare equal, regardless of how they were entered
+def normalizeAddr(addrType, value):
+    value = value.strip()
+    if addrType == 'ip-netmask':
+        return (addrType, value[:-3] if value.endswith('/32') else value)  # A /32 mask is the same as a bare host address
+    elif addrType == 'fqdn':
+        return (addrType, value.lower().rstrip('.'))
+    elif addrType == 'ip-wildcard':
+        address, _, mask = value.partition('/')
+        mask = ipToInt(mask)
+        return (addrType, intToIp(ipToInt(address) & ~mask & 0xFFFFFFFF), intToIp(mask))  # The device ignores the address bits under the wildcard
+    else:
+        start, _, end = value.partition('-')
+        return (addrType, start.strip(), end.strip())
+
+
+# Adds each (name, type, value) address entry to the name list, and its normalized value to the value index
+def indexAddrEntries(entries, addrObjs, addrValues):
+    for name, addrType, value in entries:
+        addrObjs.append(name)
+        if value:
+            addrValues.setdefault(normalizeAddr(addrType, value), name)  # Keep the first name found for each value
+
+
+# Returns the compact (name, type, value) tuple of an address <entry> element
+def addrEntryTuple(elem):
+    for child in elem:
+        if child.tag in ('ip-netmask', 'fqdn', 'ip-range', 'ip-wildcard'):
+            return (elem.get('name'), child.tag, child.text)
+    return (elem.get('name'), None, None)
+
+
+# Parses the address entries out of the XML response chunks as they arrive, returning compact (name, type, value) tuples, and
+# the seconds spent parsing rather than waiting for the next chunk. Each <entry> element is cleared as soon as it's been read,
+# so the full document is never held in memory. Raises ValueError with the device's message if the API call failed
+def readAddrEntries(chunks):
+    from xml.etree import ElementTree as ET
+    parser = ET.XMLPullParser(events=('end',))
+    entries = []
+    parseSeconds = 0.0
+    for chunk in chunks:
+        start = time.perf_counter()
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if elem.tag == 'entry':
+                entries.append(addrEntryTuple(elem))
+                elem.clear()
+            elif elem.tag == 'response' and elem.get('status') == 'error':
+                raise ValueError(' '.join(text.strip() for text in elem.itertext() if text.strip()))
+        parseSeconds += time.perf_counter() - start
+    parser.close()
+    return entries, parseSeconds
+
+
+# Returns the names from the user provided list that already exist on the PAN device, in list order
+def findPanDups(objNames, addrObjs):
+    addrObjs_set = set(addrObjs)  # Hash the device inventory once, so each name lookup is O(1) ##
+    return [obj for obj in objNames if obj in addrObjs_set]
+
+
+# Returns (object, existing name) for each object whose address already exists under another name in the value index
+def findValueDups(objects, addrValues):
+    valueDups = []
+    for obj in objects:
+        existingName = addrValues.get(normalizeAddr(obj.kind, obj.value))
+        if existingName is not None and existingName != obj.name:
+            valueDups.append((obj, existingName))
+    return valueDups
+
+
+# Joins the predicates with 'or' into as few batches as will fit in the API call URL length limit
+def batchPredicates(predicates, budget):
+    batches, batch, batch_len = [], [], 0
+    for predicate in predicates:
+        predicate_len = len(predicate) + predicate.count(' ') * 2 + 8  # Spaces are sent as '%20', and 8 is ' or ' once encoded
+        if batch and batch_len + predicate_len > budget:
+            batches.append(' or '.join(batch))
+            batch, batch_len = [], 0
+        batch.append(predicate)
+        batch_len += predicate_len
+    if batch:
+        batches.append(' or '.join(batch))
+    return batches
+
+
+# Builds the set call elements for the objects, yielding each batch as soon as the next element wouldn't fit in the budget
+def buildElements(objects, budget):
+    elements, elements_len = [], 0
+    for name, addrType, value in objects:
+        element = f"<entry name='{name}'><{addrType}>{value}</{addrType}></entry>"
+        if elements and elements_len + len(element) > budget:
+            yield ''.join(elements)
+            elements, elements_len = [], 0
+        elements.append(element)
+        elements_len += len(element)
+    if elements:
+        yield ''.join(elements)
+
+
+# Builds the set call elements that add the names to the address group, yielding each batch as soon as the next member
+# wouldn't fit in the budget
+def buildMembers(groupName, names, budget):
+    group_open, group_close = f"<entry name='{groupName}'><static>", '</static></entry>'
+    members, members_len = [], 0
+    budget -= len(group_open) + len(group_close)
+    for name in names:
+        member = f'<member>{name}</member>'
+        if members and members_len + len(member) > budget:
+            yield f"{group_open}{''.join(members)}{group_close}"
+            members, members_len = [], 0
+        members.append(member)
+        members_len += len(member)
+    if members:
+        yield f"{group_open}{''.join(members)}{group_close}"
+
+
+# Returns the address group <entry> elements as {name: static members}, where dynamic groups have None
+def addrGroupMembers(entries):
+    groups = {}
+    for entry in entries:
+        if entry.find('dynamic') is not None:
+            groups[entry.get('name')] = None
+        else:
+            groups[entry.get('name')] = [member.text for member in entry.iterfind('./static/member')]
+    return groups
+
+
+# Returns the names of the address objects in the group, including the ones in nested groups at any depth
+# (the members of dynamic groups depend on tags, so they can't be expanded)
+def expandGroup(groupName, groups):
+    names, seen, stack = set(), set(), [groupName]
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue  # A group nested more than once (or in a loop) is only expanded once
+        seen.add(name)
+        for member in groups.get(name) or ():
+            if member in groups:
+                stack.append(member)
+            else:
+                names.add(member)
+    return names
+
+
+# Returns the xpath of the Panorama device group (or 'Shared'), or else the firewall vsys (or 'shared'), that objects are added to
+def scopeXpath(deviceGroup=None, vsys='vsys1'):
+    if deviceGroup is not None:
+        if deviceGroup == 'Shared':
+            return '/config/shared'
+        return f"/config/devices/entry/device-group/entry[@name='{deviceGroup}']"
+    if vsys == 'shared':
+        return '/config/shared'
+    return f"/config/devices/entry/vsys/entry[@name='{vsys}']"
+
+
+# Returns a requests session with a pool of poolSize connections, which retries failed connections and 5xx responses with
+# backoff, up to retries times
+def makeSession(retries, poolSize):
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests.packages.urllib3.util.retry import Retry
+        from requests.packages.urllib3.exceptions import InsecureRequestWarning
+        requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+    except ImportError:
+        raise ValueError('requests support not available, please install module')
+    retry = Retry(total=retries, connect=retries, read=retries, backoff_factor=.5, status_forcelist=(500, 502, 503, 504), allowed_methods=None)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=poolSize, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Sends a config API call with send(), which returns the response, and checks the response, returning the error message if it
+# failed, or None. Garbled responses and PAN-OS internal errors or session timeouts are retried up to retries times, with a
+# backoff that doubles each time, up to RETRY_BACKOFF_MAX. Failed connections and 5xx responses aren't, as the session has
+# already retried them. The API key is masked in the message
+def retryConfigCall(send, retries, key):
+    import requests
+    from xml.etree import ElementTree as ET
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(min(RETRY_BACKOFF * 2 ** (attempt - 1), RETRY_BACKOFF_MAX))
+        try:
+            r = send()
+        except requests.exceptions.RequestException as e:
+            message = str(e).replace(key, '*****')  # Request errors include the URL, which has the key in it
+            break
+        try:
+            tree = ET.fromstring(r.text)
+        except ET.ParseError as e:
+            message = f'the response could not be read ({e})'
+            continue
+        if tree.get('status') == 'success':
+            return None
+        message = ' '.join(text.strip() for text in tree.itertext() if text.strip()) or 'no error message was returned'
+        if tree.get('code') not in TRANSIENT_CODES:
+            break
+    return message
+
+
+# Sends the (batch number, batch) pairs as they're produced with send(batch number, batch), which returns the error message
+# of a failed call or None, with at most inFlight calls outstanding at once. On the first failure, no more batches are
+# produced or sent, and (batch number, batch, error message) is returned, otherwise None
+def sendBatches(send, batches, inFlight):
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    failures, pending = [], {}
+    with ThreadPoolExecutor(max_workers=inFlight) as executor:
+        for batchNum, batch in batches:
+            if len(pending) >= inFlight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.result() is not None:
+                        failures.append((*pending[future], future.result()))
+                    del pending[future]
+                if failures:
+                    break
+            pending[executor.submit(send, batchNum, batch)] = (batchNum, batch)
+        for future in pending:
+            if future.result() is not None:
+                failures.append((*pending[future], future.result()))
+    return min(failures) if failures else None
+
+
+# A connection to one firewall or Panorama, which keeps its own keep-alive session and settings, so any number of clients
+# can be used in the same process. The session (and requests) is only set up on the first API call
+class PanClient:
+    __slots__ = ('host', 'key', 'timeout', 'retries', 'post', 'batchSize', 'inFlight', 'session')
+
+    def __init__(self, host, key, timeout=30.0, retries=3, post=True, batchSize=0, inFlight=4):
+        self.host, self.key = host, key
+        self.timeout, self.retries, self.post, self.batchSize, self.inFlight = timeout, retries, post, batchSize, inFlight
+        self.session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Closes the session's connections to the device
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    # Returns the session, creating it with a connection pool and retry with backoff on first use
+    def getSession(self):
+        if self.session is None:
+            self.session = makeSession(self.retries, self.inFlight)
+        return self.session
+
+    # Sends an API call with the parameters, in the POST body with post=True, or in the URL otherwise (with stream=True,
+    # the response body is read as it's consumed, rather than all at once)
+    def request(self, params, stream=False):
+        params = {**params, 'key': self.key}
+        if self.post:
+            return self.getSession().post(f'https://{self.host}/api/', data=params, verify=False, timeout=self.timeout, stream=stream)
+        url = f"https://{self.host}/api/?{'&'.join(f'{param}={value}' for param, value in params.items())}"
+        return self.getSession().get(url, verify=False, timeout=self.timeout, stream=stream)
+
+    # Sends an API call and returns the parsed response, raising ValueError with the device's message if it failed
+    def call(self, params):
+        from xml.etree import ElementTree as ET
+        tree = ET.fromstring(self.request(params).text)
+        if tree.get('status') == 'error':
+            raise ValueError(' '.join(text.strip() for text in tree.itertext() if text.strip()) or 'no error message was returned')
+        return tree
+
+    # Returns the Panorama device groups (empty for a firewall)
+    def deviceGroups(self):
+        tree = self.call({'type': 'config', 'action': 'get', 'xpath': '/config/devices/entry/device-group'})
+        return [entry.get('name') for entry in tree.findall('./result/device-group/entry')]
+
+    # Returns the parents of the device group, nearest first
+    def parentDeviceGroups(self, deviceGroup):
+        tree = self.call({'type': 'op', 'cmd': '<show><dg-hierarchy></dg-hierarchy></show>'})
+        parents = []
+        while True:
+            dg = tree.find(f".//*/[@name='{deviceGroup}']...")
+            if dg is None or dg.get('name') is None:
+                return parents
+            deviceGroup = dg.get('name')
+            parents.append(deviceGroup)
+
+    # Returns the scope xpaths whose address objects are visible to the device group (with its parents, and shared), or vsys
+    def visibleScopes(self, deviceGroup=None, vsys='vsys1'):
+        if deviceGroup is None:
+            return [scopeXpath(vsys=vsys)]
+        if deviceGroup == 'Shared':
+            return ['/config/shared']
+        return [scopeXpath(dg) for dg in [deviceGroup] + self.parentDeviceGroups(deviceGroup)] + ['/config/shared']
+
+    # Retrieves the address entries found at the xpath as compact (name, type, value) tuples, parsing the response as it streams in
+    def addressEntries(self, xpath):
+        with self.request({'type': 'config', 'action': 'get', 'xpath': xpath}, stream=True) as r:
+            return readAddrEntries(r.iter_content(chunk_size=65536))[0]
+
+    # Retrieves the address names visible to the device group or vsys, along with an index of their normalized values (the
+    # scopes can be given when they're already known, to save looking up the parent device groups again)
+    def inventory(self, deviceGroup=None, vsys='vsys1', scopes=None):
+        from concurrent.futures import ThreadPoolExecutor
+        scopes = scopes or self.visibleScopes(deviceGroup, vsys)
+        addrObjs, addrValues = [], {}
+        with ThreadPoolExecutor(max_workers=min(len(scopes), self.inFlight)) as executor:
+            for entries in executor.map(lambda scope: self.addressEntries(f'{scope}/address'), scopes):
+                indexAddrEntries(entries, addrObjs, addrValues)
+        return addrObjs, addrValues
+
+    # Retrieves the address groups found at the xpath as {name: static members}, where dynamic groups have None
+    def addressGroups(self, xpath):
+        return addrGroupMembers(self.call({'type': 'config', 'action': 'get', 'xpath': xpath}).iterfind('./result/address-group/entry'))
+
+    # Retrieves the address groups of each scope, in the order given (the target scope first, then the scopes it can see)
+    def scopeGroups(self, scopes):
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(len(scopes), self.inFlight)) as executor:
+            return list(executor.map(lambda scope: self.addressGroups(f'{scope}/address-group'), scopes))
+
+    # Returns the size budget of the element of each set call to the xpath -- the URL length left for GET calls, or the
+    # size of the element itself with post=True
+    def elementBudget(self, xpath):
+        if self.post:
+            return self.batchSize or 512000
+        return (self.batchSize or 5000) - len(f'https://{self.host}/api/?type=config&action=set&xpath={xpath}&element=&key={self.key}')
+
+    # Sends a config API call with the action (set, edit, or delete), returning the error message if it failed, or None
+    def configCall(self, action, xpath, element=None):
+        params = {'type': 'config', 'action': action, 'xpath': xpath}
+        if element is not None:
+            params['element'] = element
+        return retryConfigCall(lambda: self.request(params), self.retries, self.key)
+
+    # Sends a set call for each element as it's produced, with at most inFlight calls outstanding at once. On the first failure,
+    # no more elements are sent, and (batch number, element, error message) is returned, otherwise None
+    def push(self, xpath, elements):
+        return sendBatches(lambda batchNum, element: self.configCall('set', xpath, element), enumerate(elements, 1), self.inFlight)
+
+
+# Imports the address records to the Panorama device group, or firewall vsys, through the client -- the objects whose name
+# already exists are left out, the ones whose address exists under another name are handled by valueDups (skip, reuse, or
+# create), and with a group, the names that aren't already in it (directly, or through a nested group from any scope it can
+# see) are added to it. Nothing is kept between calls, and nothing is prompted for. Returns a summary of the import, where
+# 'error' has the device's message for the first set call that failed (or None), and raises ValueError when the import
+# can't be started
+def importAddresses(client, records, deviceGroup=None, vsys='vsys1', group=None, valueDups='skip', aggregate=None):
+    if valueDups not in VALUE_DUP_CHOICES:
+        raise ValueError(f"valueDups must be one of {', '.join(VALUE_DUP_CHOICES)}")
+    coverage = []
+    if aggregate:
+        records, coverage = aggregateRecords(records, aggregate)
+    objects = buildObjects(records)
+    listDups = findListDups(objects)
+    if listDups:
+        raise ValueError(f"names are used more than once in the list: {', '.join(listDups)}")
+    addrXpath = f'{scopeXpath(deviceGroup, vsys)}/address'
+    scopes = client.visibleScopes(deviceGroup, vsys)
+    groups, targetGroups = {}, {}
+    if group:
+        scopeGroups = client.scopeGroups(scopes)
+        targetGroups = scopeGroups[0]
+        for scopeGroup in scopeGroups:
+            for name, members in scopeGroup.items():
+                groups.setdefault(name, members)  # The target scope comes first, so its groups take precedence
+        if group in targetGroups and targetGroups[group] is None:
+            raise ValueError(f'the {group} address group is a dynamic group, so addresses cannot be added to it as static members')
+    addrObjs, addrValues = client.inventory(scopes=scopes)
+    memberNames = [obj.name for obj in objects]  # Objects whose name already exists still go in the group, as the existing object
+    nameDups = findPanDups(memberNames, addrObjs)
+    if nameDups:
+        nameDupSet = set(nameDups)
+        objects = [obj for obj in objects if obj.name not in nameDupSet]
+    valueDupList = findValueDups(objects, addrValues)
+    if valueDupList and valueDups != 'create':
+        existingNames = {obj.name: existingName for obj, existingName in valueDupList}
+        objects = [obj for obj in objects if obj.name not in existingNames]
+        if valueDups == 'skip':
+            memberNames = [name for name in memberNames if name not in existingNames]
+        else:
+            memberNames = list(dict.fromkeys(existingNames.get(name, name) for name in memberNames))  # The existing objects are group members instead
+    result = {'created': 0, 'name dups': nameDups, 'value dups': [(obj.name, obj.value, existingName) for obj, existingName in valueDupList],
+              'aggregated': len(coverage), 'group added': 0, 'group present': 0, 'error': None}
+    failure = client.push(addrXpath, buildElements(objects, client.elementBudget(addrXpath)))
+    if failure is not None:
+        result['error'] = f'batch {failure[0]} failed: {failure[2]}'
+        return result
+    result['created'] = len(objects)
+    if group:
+        present = expandGroup(group, groups) if group in targetGroups else set()  # A same-named group in a parent scope is another group
+        missing = [name for name in memberNames if name not in present]
+        result['group present'] = len(memberNames) - len(missing)
+        failure = client.push(f'{addrXpath}-group', buildMembers(group, missing, client.elementBudget(f'{addrXpath}-group')))
+        if failure is not None:
+            result['error'] = f'group batch {failure[0]} failed: {failure[2]}'
+            return result
+        result['group added'] = len(missing)
+    return result